@@ -16,8 +16,14 @@ UT EID 1: tmj2233
 UT EID 2:
 """
 
+import json
+import math
 import random
+import struct
 import sys
+import time
+from collections import Counter
+from collections.abc import Mapping
 
 # You may delete this import if you choose not to use this.
 # from collections import defaultdict
@@ -47,8 +53,104 @@ BOLD_COLOR = "\033[1m"
 # The total number of letters allowed
 NUM_LETTERS = 5
 
+# The word lengths the engine supports. Every function working on words takes their length from
+# the words themselves, so the same code plays 4 to 8 letter dictionaries; the limit comes from
+# green detection reading at most three chunks of CHUNK_LETTERS letters.
+MIN_LETTERS = 4
+MAX_LETTERS = 8
+
 INVALID_INPUT = "Bad input detected. Please try again."
 
+# Feedback pattern codes are base 3 integers with one digit per letter, the first letter being
+# the most significant digit. The digit of a color is its index here, which is also its
+# WordFamily difficulty, so comparing codes compares patterns the way lists of colors compare.
+PATTERN_COLORS = (CORRECT_COLOR, WRONG_SPOT_COLOR, NOT_IN_WORD_COLOR)
+
+# Keyboard colors ordered by how much they tell the player. A key only ever moves up this
+# order, so updating a key is taking the maximum of its rank and the new one.
+KEY_COLORS = (NO_COLOR, NOT_IN_WORD_COLOR, WRONG_SPOT_COLOR, CORRECT_COLOR)
+KEY_RANKS = {color: rank for rank, color in enumerate(KEY_COLORS)}
+
+# Packed words hold one letter per 5 bits (a = 0, ..., z = 25), the first letter being the
+# most significant one.
+LETTER_BITS = 5
+LETTER_MASK = (1 << LETTER_BITS) - 1
+
+# Letter counts hold the number of copies of letter x in bits LETTER_COUNT_BITS * x and up. The
+# top bit of each field is left free as a guard, see wordle_hardmode.
+LETTER_COUNT_BITS = 5
+
+# The canonical encoding of a word is a tuple (packed, mask, has_duplicates, counts): the word
+# packed by pack_word, its letter mask with bit x set when letter x occurs, whether a letter
+# occurs more than once, and its letter counts. encode_words() computes it once for the whole
+# dictionary, so the hot loops work on integers and strings are only needed for display.
+ENCODED_WORDS = {}
+
+# Green detection compares packed words three letters at a time: ZERO_FIELDS[v] has bit j set
+# when the j-th lowest letter field of v is zero.
+CHUNK_LETTERS = 3
+CHUNK_BITS = CHUNK_LETTERS * LETTER_BITS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+ZERO_FIELDS = [
+    sum(1 << j for j in range(CHUNK_LETTERS) if not (v >> (LETTER_BITS * j)) & LETTER_MASK)
+    for v in range(1 << CHUNK_BITS)
+]
+
+# Pattern codes by num_letters, indexed by green_fields << num_letters | present_fields, built on
+# first use by pattern_code_table().
+_PATTERN_CODE_TABLES = {}
+
+# get_feedback_codes() picks between two engines. The string engine compares letters directly
+# and needs no set up, so it wins on late game pools and for guesses with repeated letters. The
+# packed engine works on ENCODED_WORDS and wins on large pools once its per-guess tables are
+# paid for. PACKED_MIN_POOL is the smallest pool given to the packed engine: None measures it
+# per word length with calibrate_packed_min_pool() on first use, an int overrides it.
+PACKED_MIN_POOL = None
+CALIBRATION_SIZES = (8, 16, 32, 64, 128, 256)
+_PACKED_MIN_POOLS = {}
+
+# Every colored letter the game prints, built once so rendering is a lookup instead of
+# formatting an escape sequence per letter. KEY_GLYPHS[rank][i] is letter i in KEY_COLORS[rank],
+# and GLYPHS maps each color to the same row.
+KEY_GLYPHS = tuple(
+    tuple(f"{color}{chr(97 + i)}{NO_COLOR}" for i in range(26)) for color in KEY_COLORS
+)
+GLYPHS = dict(zip(KEY_COLORS, KEY_GLYPHS))
+
+# Single character codes of the KEY_COLORS ranks for machine consumers.
+KEY_CODES = ".BYG"
+
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+STATUSES = (PLAYING, WON, LOST)
+
+# Output modes of main(). The structured ones are chosen with a "json" or "binary" command line
+# argument and write one record per input line instead of the colored text.
+ANSI_OUTPUT = "ansi"
+JSON_OUTPUT = "json"
+BINARY_OUTPUT = "binary"
+STRUCTURED_OUTPUTS = (JSON_OUTPUT, BINARY_OUTPUT)
+
+# A "speculate" command line argument makes main() precompute the feedback of likely guesses
+# while the player types, see wordle_speculate.
+SPECULATE_ARG = "speculate"
+
+# A binary record is this header followed by the guess and the secret word in ascii: kind,
+# turn, status, pattern code, remaining secret words, keyboard as 26 two bit ranks, guess
+# length and secret word length.
+RECORD_HEADER = struct.Struct("<BBBHI7sBB")
+RECORD_TURN = 0
+RECORD_INVALID = 1
+
+# The keyboard layout, the letter indices (0 for a) of each row and the row of each letter index.
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+KEYBOARD_ROW_LETTERS = tuple(tuple(ord(letter) - 97 for letter in row) for row in KEYBOARD_ROWS)
+KEYBOARD_ROW_OF = bytes(
+    next(i for i, row in enumerate(KEYBOARD_ROWS) if letter in row)
+    for letter in "abcdefghijklmnopqrstuvwxyz"
+)
+
 
 class Keyboard:
     """
@@ -56,21 +158,54 @@ class Keyboard:
     has a color state that indicates feedback based on user guesses. The keyboard
     displays feedback colors for letters guessed in the word.
 
+    The state is a 26 byte array holding the KEY_COLORS rank of each letter, which update_code()
+    can update straight from a pattern code and a packed guess. Rendered rows are cached, and
+    updates only throw away the rows holding a letter whose color changed, so printing the
+    keyboard every turn recolors a row or two at most.
+
+    The layout is shared by every keyboard, so an instance only holds its rank array, its row
+    cache and a bit mask of the rows changed since changed_rows() was last called.
+
+    Class Variables:
+        rows: A tuple of strings, each representing a row of letters on the keyboard.
+
     Instance Variables:
-        rows: A list of strings, each representing a row of letters on the keyboard.
-        colors: A dictionary mapping each letter to its current feedback color.
+        ranks: A bytearray with the KEY_COLORS rank of each letter from a to z.
+        colors: A dictionary-like view mapping each letter to its current feedback color.
     """
 
+    __slots__ = ("ranks", "_row_cache", "_changed_rows")
+
+    rows = KEYBOARD_ROWS
+    # Leading spaces of each keyboard row
+    ROW_INDENTS = ("", " ", "   ")
+    _ROW_LETTERS = KEYBOARD_ROW_LETTERS
+    _ROW_OF = KEYBOARD_ROW_OF
+    _ALL_ROWS = (1 << len(KEYBOARD_ROWS)) - 1
+
     def __init__(self):
         """
-        Initializes the Keyboard object by setting up the rows of keys and initializing
-        each key with a default 'NO_COLOR' state.
+        Initializes the Keyboard object by initializing each key with a default 'NO_COLOR'
+        state.
 
         pre: The `NO_COLOR` constant is defined and represents the default color for each letter.
-        post: `self.colors` is a dictionary with each letter set to `NO_COLOR`.
+        post: `self.colors` maps each letter to `NO_COLOR`.
         """
-        self.rows = ["qwertyuiop", "asdfghjkl", "zxcvbnm"]
-        self.colors = {letter: NO_COLOR for letter in "qwertyuiopasdfghjklzxcvbnm"}
+        self.ranks = bytearray(26)
+        self._row_cache = [None] * len(self.rows)
+        self._changed_rows = self._ALL_ROWS
+
+    @property
+    def colors(self):
+        """A KeyboardColors view of the ranks, built on demand so sessions do not hold one."""
+        return KeyboardColors(self)
+
+    def _raise_rank(self, letter_index, rank):
+        if rank > self.ranks[letter_index]:
+            self.ranks[letter_index] = rank
+            row = self._ROW_OF[letter_index]
+            self._row_cache[row] = None
+            self._changed_rows |= 1 << row
 
     def update(self, feedback_colors, guessed_word):
         """
@@ -88,27 +223,88 @@ class Keyboard:
         pre: `feedback_colors` has the same length as `guessed_word`, and each item in
              `feedback_colors` is a valid color constant.
         post: The `colors` dictionary is updated based on feedback, with each letter's color
-              reflecting the most accurate feedback from the guesses so far.
+              reflecting the most accurate feedback from the guesses so far. The cached
+              rendering of every row with a changed letter is invalidated.
         """
-        # feedback_colors in the list with the colors
+        # Colors only ever move up KEY_COLORS, e.g. correct letters are never overridden
         for i, letter in enumerate(guessed_word):
-            color = feedback_colors[i]
-            # If we have a letter colored "correct", update our keyboard to reflect that
+            self._raise_rank(ord(letter) - 97, KEY_RANKS[feedback_colors[i]])
+
+    def update_code(self, code, packed_guess, num_letters=NUM_LETTERS):
+        """
+        Does the same as update() from a pattern code and a packed guess (see pack_word).
+
+        pre: code is the pattern code of packed_guess, both for words of num_letters letters.
+        post: The keyboard is the same as after update() with the equivalent arguments.
+        """
+        for _ in range(num_letters):
+            code, digit = divmod(code, 3)
+            # Digits go correct, wrong spot, not in word while ranks go the other way
+            self._raise_rank(packed_guess & LETTER_MASK, 3 - digit)
+            packed_guess >>= LETTER_BITS
+
+    def invalidate(self, letter=None):
+        """
+        Throws away the cached rendering of the row holding letter, or of every row if letter
+        is None.
+        """
+        rows = range(len(self.rows)) if letter is None else (self._ROW_OF[ord(letter) - 97],)
+        for i in rows:
+            self._row_cache[i] = None
+            self._changed_rows |= 1 << i
 
-            if color == CORRECT_COLOR:
-                self.colors[letter] = CORRECT_COLOR
-            elif color == WRONG_SPOT_COLOR and self.colors[letter] != CORRECT_COLOR:
-            # Letters already colored correct should not be overrode by another guess
-                self.colors[letter] = WRONG_SPOT_COLOR
-            elif color == NOT_IN_WORD_COLOR and self.colors[letter] != CORRECT_COLOR and self.colors[letter ] != WRONG_SPOT_COLOR:
-                self.colors[letter] = NOT_IN_WORD_COLOR
+    def render_row(self, i):
+        """
+        Returns row i of the keyboard with its leading spaces and colored letters.
+
+        pre: 0 <= i < len(self.rows).
+        post: The rendering is cached until a letter of the row changes color.
+        """
+        row_str = self._row_cache[i]
+        if row_str is None:
+            # Look up each letter in the glyph table of its current color
+            ranks = self.ranks
+            colored_row = [KEY_GLYPHS[ranks[j]][j] for j in self._ROW_LETTERS[i]]
+            row_str = self.ROW_INDENTS[i] + " ".join(colored_row)
+            self._row_cache[i] = row_str
+        return row_str
+
+    def pack(self):
+        """
+        Returns the keyboard as an int holding the rank of each letter in two bits, a first.
+
+        post: The result is less than 2 ** 52, so it fits in 7 bytes.
+        """
+        packed = 0
+        for i, rank in enumerate(self.ranks):
+            packed |= rank << (2 * i)
+        return packed
+
+    def codes(self):
+        """
+        Returns the keyboard colors as a 26 character string of KEY_CODES from a to z.
+        """
+        return "".join([KEY_CODES[rank] for rank in self.ranks])
+
+    def changed_rows(self):
+        """
+        Returns the rows whose rendering changed since the previous call, for clients that
+        redraw the keyboard incrementally. The first call returns every row.
+
+        post: Returns a dictionary mapping row indices to their rendered strings.
+        """
+        changed = {
+            i: self.render_row(i) for i in range(len(self.rows)) if self._changed_rows >> i & 1
+        }
+        self._changed_rows = 0
+        return changed
 
     def __str__(self):
         """
         Returns a string representation of the keyboard, showing each letter in its
         corresponding color. Each row of the keyboard is formatted for readability,
-        with spacing adjusted for alignment. Color each individual letter using color_word()
-        based on the colors in the dictionary.
+        with spacing adjusted for alignment. Each letter is the KEY_GLYPHS entry for its
+        color, the same string color_word() would build.
 
         The first row has no leading spaces.
         The second keyboard row has 1 leading space.
@@ -120,43 +316,34 @@ class Keyboard:
          a s d f g h j k l
            z x c v b n m
 
-        pre: `color_word` function is defined, accepting a color and a letter, and
-             returning the letter wrapped in ANSI color codes.
         post: Returns a formatted string with each letter colored according to feedback
               and arranged to match a typical keyboard layout.
         """
-        keyboard_str = []
-
-        # Ooh! Okay, so for this function, you just want to piece the output together
-        # We're outputting three rows of spaces + colored letters
-
-        # Iterate through one row of the keyboard at a time:
-        for i, row in enumerate(self.rows):
-            # Add spaces based on the row we're on:
-            if i == 1:
-                spaces = " "
-            elif i == 2:
-                spaces = "   "
-            else:
-                spaces = ""
+        # .join() turns a list into a string !!
+        return "\n".join(self.render_row(i) for i in range(len(self.rows)))
 
-            # Begin with the right number of spaces
-            row_str = spaces
 
-            # Color the letters in the row
-            colored_row = []
+class KeyboardColors(Mapping):
+    """
+    The colors of a Keyboard as a mapping from letters to color constants, backed by the
+    keyboard's rank array. Assigning a color sets the letter's rank directly, even downwards.
+    """
 
-            for letter in row:
-                # self.colors[letter] checks the color of the letter
-                colored_letter = color_word(self.colors[letter], letter)
-                colored_row.append(colored_letter)
-                
-            row_str = " ".join(colored_row)
+    def __init__(self, keyboard):
+        self._keyboard = keyboard
 
-            keyboard_str.append(row_str)
+    def __getitem__(self, letter):
+        return KEY_COLORS[self._keyboard.ranks[ord(letter) - 97]]
 
-        # .join() turns a list into a string !!
-        return "\n".join(keyboard_str)
+    def __setitem__(self, letter, color):
+        self._keyboard.ranks[ord(letter) - 97] = KEY_RANKS[color]
+        self._keyboard.invalidate(letter)
+
+    def __iter__(self):
+        return iter("qwertyuiopasdfghjklzxcvbnm")
+
+    def __len__(self):
+        return 26
 
 
 class WordFamily:
@@ -176,7 +363,6 @@ class WordFamily:
 
     COLOR_DIFFICULTY = {CORRECT_COLOR: 0, WRONG_SPOT_COLOR: 1, NOT_IN_WORD_COLOR: 2}
 
-    # TODO: Modify this method. You may delete this comment when you are done.
     def __init__(self, feedback_colors, words):
         """
         Initializes the WordFamily instance with a feedback color list and a list of corresponding
@@ -194,9 +380,9 @@ class WordFamily:
         self.feedback_colors = feedback_colors
         self.words = words
         self.difficulty = 0
-        # TODO: implement the difficulty calculation here.
+        for color in feedback_colors:
+            self.difficulty += self.COLOR_DIFFICULTY[color]
 
-    # TODO: Modify this method. You may delete this comment when you are done.
     def __lt__(self, other):
         """
         Compares this WordFamily object with another by prioritizing a larger
@@ -217,14 +403,22 @@ class WordFamily:
         post: Returns a boolean result of the comparison, raises NotImplementedError
               if `other` is not a WordFamily instance.
         """
-        return False
+        if not isinstance(other, WordFamily):
+            raise NotImplementedError("< operator only valid for WordFamily comparisons.")
+
+        # Bigger families are "smaller" so that sorting puts the hardest family first
+        if len(self.words) != len(other.words):
+            return len(self.words) > len(other.words)
+        if self.difficulty != other.difficulty:
+            return self.difficulty > other.difficulty
+        return list(self.feedback_colors) < list(other.feedback_colors)
 
     # DO NOT change this method.
     # You should use this for debugging!
     def __str__(self):
         return (
             f"({len(self.words)}, {self.difficulty}, "
-            f"{color_word(self.feedback_colors, ['■'] * 5)})"
+            f"{color_word(self.feedback_colors, ['■'] * len(self.feedback_colors))})"
         )
 
     # DO NOT change this method.
@@ -288,6 +482,31 @@ def color_word(colors, word):
     return "".join(colored_word)
 
 
+def render_feedback(feedback_colors, guessed_word):
+    """
+    Colors a guess like color_word(), using the precomputed glyph table.
+
+    pre: guessed_word is a lowercase word and feedback_colors holds one KEY_COLORS color
+         per letter.
+    post: Returns the same string as color_word(feedback_colors, guessed_word).
+    """
+    return "".join(
+        [GLYPHS[color][ord(letter) - 97] for color, letter in zip(feedback_colors, guessed_word)]
+    )
+
+
+def render_turn(prompt, feedback, keyboard):
+    """
+    Returns everything printed after a valid guess: the feedback lined up under the guess,
+    the keyboard and a blank line. Writing it at once takes one write instead of four prints.
+
+    pre: prompt is the prompt the guess was typed after, feedback is the colored guess and
+         keyboard is a Keyboard.
+    post: Returns a string ending in two newlines.
+    """
+    return f"{' ' * (len(prompt) - 1)} {feedback}\n{keyboard}\n\n"
+
+
 # DO NOT change this function
 def get_attempt_label(attempt_number):
     """
@@ -303,22 +522,34 @@ def get_attempt_label(attempt_number):
 
     return f"{attempt_number}{suffix}"
 
-# DO NOT change this function
 def prepare_game():
     """
     Prepares the game by setting the number of attempts and loading the list of valid words. This
     list of valid words will be used as the initial pool of secret words as well. The function
     accepts an optional command-line argument for attempts and a "debug" mode flag.
 
+    One "json" or "binary" argument, anywhere on the command line, selects a structured output
+    mode for programs playing the game.
+
     pre: The file valid_guesses.txt exists and contains valid guessable words, one per line. The
         file test_guesses.txt exists and contains secret words, one per line.
-    post: Returns a tuple (attempts, valid_words) or raises a ValueError on invalid user attempts:
+    post: Returns a tuple (attempts, valid_words, output_mode) or raises a ValueError on invalid
+        user attempts:
         The number of attempts the user gets before the game automatically ends.
         valid_words: A list of valid guess words and is the initial pool of secret words.
+        output_mode: ANSI_OUTPUT, JSON_OUTPUT or BINARY_OUTPUT.
     """
 
     valid_words_file_name = "valid_guesses.txt"
 
+    output_mode = ANSI_OUTPUT
+    modes = [arg for arg in sys.argv[1:] if arg in STRUCTURED_OUTPUTS]
+    if len(modes) > 1:
+        raise ValueError()
+    if modes:
+        output_mode = modes[0]
+        sys.argv.remove(output_mode)
+
     # Must have 1 or 2 arguments
     if len(sys.argv) > 3:
         raise ValueError()
@@ -341,9 +572,9 @@ def prepare_game():
     with open(valid_words_file_name, "r", encoding="ascii") as valid_words:
         valid_words = [word.rstrip() for word in valid_words.readlines()]
 
-    return attempts, valid_words
+    encode_words(valid_words)
+    return attempts, valid_words, output_mode
 
-# TODO: Modify this function. You may delete this comment when you are done.
 def fast_sort(lst):
     """
     Returns a new list with the same elements as lst sorted in ascending order. You MUST implement
@@ -356,8 +587,13 @@ def fast_sort(lst):
     post: Returns a new sorted list of the items in lst.
 
     """
-    # Instead of using a midpt use a pivot
-    pivot = lst[0]
+    # base case
+    if len(lst) <= 1:
+        return lst[:]
+
+    # Instead of using a midpt use a pivot. The middle element keeps already sorted
+    # input (like most of the word list) from recursing once per element.
+    pivot = lst[len(lst) // 2]
     middle = []
     left = []
     right = []
@@ -365,10 +601,6 @@ def fast_sort(lst):
     # Basically, you want to pick a midpoint and then sort every number into 
     # two lists: > midpoint and < midpoint 
 
-    # base case
-    if len(lst) <= 1:
-        return lst
-
     for num in lst:
         if num < pivot:
             left.append(num)
@@ -382,7 +614,6 @@ def fast_sort(lst):
     # merge sort: time always O(NlogN), space oct
     # quick sort: time usually O(NlogN), worst O(N^2)
 
-# TODO: Modify this function. You may delete this comment when you are done.
 def get_feedback_colors(secret_word, guessed_word):
     """
     Processes the guess and generates the colored feedback based on the potential secret word. This
@@ -391,20 +622,31 @@ def get_feedback_colors(secret_word, guessed_word):
 
     This should be extremely similar to what you have from assignment 3: Wordle.
 
-    pre: secret_word must be a string of exactly 5 lowercase alphabetic characters.
-         guessed_word must be a string of exactly 5 lowercase alphabetic characters.
+    pre: secret_word must be a string of lowercase alphabetic characters.
+         guessed_word must be a lowercase string of the same length as secret_word.
     post: the return value is a list where:
           - Correctly guessed letters are marked with CORRECT_COLOR.
           - Correct letters in the wrong position are marked with WRONG_SPOT_COLOR.
           - Letters not in secret_word are marked with NOT_IN_WORD_COLOR. The list will be of
-            length 5 with the ANSI coloring in each index as the returned value.
+            the length of the words with the ANSI coloring in each index as the returned value.
     """
+    guess_mask, guess_has_duplicates = letter_mask(guessed_word)
+    if not guess_has_duplicates:
+        # Each guess letter can only be matched once, so no bookkeeping is needed
+        secret_mask = letter_mask(secret_word)[0]
+        return [
+            CORRECT_COLOR if letter == secret_letter
+            else WRONG_SPOT_COLOR if secret_mask >> (ord(letter) - 97) & 1
+            else NOT_IN_WORD_COLOR
+            for letter, secret_letter in zip(guessed_word, secret_word)
+        ]
+
     num_letters = len(guessed_word)
     feedback = [None] * num_letters
     used_secret = [False] * num_letters
     used_guess = [False] * num_letters
 
-    # Modify this! This is just starter code.
+    # Mark the exact matches first so they cannot be claimed as yellows
     for i in range(num_letters):
         if guessed_word[i] == secret_word[i]:
             feedback[i] = CORRECT_COLOR
@@ -429,16 +671,94 @@ def get_feedback_colors(secret_word, guessed_word):
     return feedback
 
 
-# TODO: Modify this function. You may delete this comment when you are done.
-def get_feedback(remaining_secret_words, guessed_word):
+def encode_word(word):
+    """
+    Returns the canonical encoding of a word, from ENCODED_WORDS when it is there.
+
+    pre: word is a string of lowercase letters.
+    post: Returns a tuple (packed, mask, has_duplicates, counts), see ENCODED_WORDS.
+    """
+    entry = ENCODED_WORDS.get(word)
+    if entry is None:
+        packed = 0
+        mask = 0
+        counts = 0
+        for letter in word:
+            x = ord(letter) - 97
+            packed = (packed << LETTER_BITS) | x
+            mask |= 1 << x
+            counts += 1 << (LETTER_COUNT_BITS * x)
+        entry = (packed, mask, mask.bit_count() < len(word), counts)
+    return entry
+
+
+def encode_words(words):
+    """
+    Adds the canonical encoding of every word to ENCODED_WORDS.
+
+    pre: words is an iterable of lowercase words.
+    post: Returns a dictionary mapping each word of words to its encoding.
+    """
+    encoded = {}
+    for word in words:
+        entry = ENCODED_WORDS.get(word)
+        if entry is None:
+            entry = ENCODED_WORDS[word] = encode_word(word)
+        encoded[word] = entry
+    return encoded
+
+
+def letter_mask(word):
     """
-    Processes the guess and generates the colored feedback based on the hardest word family. Use
-    get_feedback_colors to group the words based on their feedback, and then create word families
-    based on these groups. The hardest word family is then chosen by sorting the families, where
+    Returns a tuple (mask, has_duplicates) for a word.
+
+    pre: word is a string of lowercase letters.
+    post: Bit x of mask is set when letter x occurs in word. has_duplicates tells whether a
+          letter occurs more than once.
+    """
+    entry = encode_word(word)
+    return entry[1], entry[2]
+
+
+def pattern_code_table(num_letters):
+    """
+    Returns the pattern codes of every combination of green and present letters.
+
+    post: Returns a list where index green << num_letters | present holds the pattern code
+          whose letter j from the end is green if bit j of green is set, yellow if bit j of
+          present is set and gray otherwise.
+    """
+    table = _PATTERN_CODE_TABLES.get(num_letters)
+    if table is None:
+        size = 1 << num_letters
+        table = [0] * (size * size)
+        for green in range(size):
+            for present in range(size):
+                code = 0
+                for j in range(num_letters):
+                    digit = 0 if green >> j & 1 else 1 if present >> j & 1 else 2
+                    code += digit * 3 ** j
+                table[green << num_letters | present] = code
+        _PATTERN_CODE_TABLES[num_letters] = table
+    return table
+
+
+def get_feedback(remaining_secret_words, guessed_word, adversary=None, deadline=None):
+    """
+    Processes the guess and generates the colored feedback based on the hardest word family. The
+    words are grouped by their feedback with get_feedback_codes, and then word families are
+    created from these groups. The hardest word family is then chosen by sorting the families, where
     the 0th index is now the hardest word family.
 
-    pre: remaining_secret_words is a list of strings.
-         guessed_word must be a string of exactly 5 lowercase alphabetic characters.
+    If adversary is given, it picks the family instead: it is called with the same two arguments
+    and deadline, and must return the same kind of tuple (for example a
+    wordle_lookahead.LookaheadAdversary). deadline is None or the time.perf_counter() value by
+    which an adversary must answer with the best family it has found so far. The greedy rule
+    always answers right away and ignores it.
+
+    pre: remaining_secret_words is a list of strings, or a pool with a partition_by_pattern()
+         method like wordle_store.WordView, which is then what the new pool is.
+         guessed_word must be a lowercase string of the same length as the secret words.
     post: Returns a tuple (feedback_colors, new_remaining_secret_words) where:
           - feedback_colors: a list of feedback colors (CORRECT_COLOR, WRONG_SPOT_COLOR, or
             NOT_IN_WORD_COLOR) that correspond to the remaining secret words
@@ -448,18 +768,428 @@ def get_feedback(remaining_secret_words, guessed_word):
             2. Difficulty of the feedback
             3. Lexicographical ordering of the feedback (ASCII value comparisons)
     """
-    # Modify this! This is just starter code.
-    feedback_colors = get_feedback_colors(remaining_secret_words[0], guessed_word)
+    if adversary is not None:
+        return adversary(remaining_secret_words, guessed_word, deadline)
+
+    # Group the secret words by the pattern code of the feedback they would give, which works on
+    # the packed words. Only the families are turned back into colors.
+    # Pools like wordle_store.WordView group themselves and keep the groups as views.
+    partition = getattr(remaining_secret_words, "partition_by_pattern", None)
+    if partition is not None:
+        groups = partition(guessed_word)
+    else:
+        groups = partition_by_pattern(remaining_secret_words, guessed_word)
+    num_letters = len(guessed_word)
+    families = [
+        WordFamily(pattern_code_to_colors(code, num_letters), words)
+        for code, words in groups.items()
+    ]
+    hardest_family = fast_sort(families)[0]
 
-    return feedback_colors, remaining_secret_words
+    return hardest_family.feedback_colors, hardest_family.words
+
+
+def pack_word(word):
+    """
+    Packs a lowercase word into an integer with LETTER_BITS bits per letter.
+
+    pre: word is a string of lowercase letters.
+    post: Returns the packed word, the first letter in the most significant bits.
+    """
+    packed = 0
+    for letter in word:
+        packed = (packed << LETTER_BITS) | (ord(letter) - 97)
+    return packed
+
+
+def unpack_word(packed, num_letters=NUM_LETTERS):
+    """
+    Turns a packed word back into a string.
+
+    pre: packed was made by pack_word from a word of num_letters letters.
+    """
+    letters = [None] * num_letters
+    for i in range(num_letters - 1, -1, -1):
+        letters[i] = chr(97 + (packed & LETTER_MASK))
+        packed >>= LETTER_BITS
+    return "".join(letters)
+
+
+def colors_to_pattern_code(feedback_colors):
+    """
+    Converts a list of feedback colors into its pattern code.
+
+    pre: feedback_colors is a sequence of colors from PATTERN_COLORS.
+    post: Returns an integer between 0 and 3 ** len(feedback_colors) - 1.
+    """
+    code = 0
+    for color in feedback_colors:
+        code = code * 3 + PATTERN_COLORS.index(color)
+    return code
+
+
+def pattern_code_to_colors(code, num_letters=NUM_LETTERS):
+    """
+    Converts a pattern code back into the tuple of feedback colors it stands for.
+
+    pre: 0 <= code < 3 ** num_letters.
+    post: Returns a tuple of num_letters colors from PATTERN_COLORS.
+    """
+    colors = [None] * num_letters
+    for i in range(num_letters - 1, -1, -1):
+        code, digit = divmod(code, 3)
+        colors[i] = PATTERN_COLORS[digit]
+    return tuple(colors)
+
+
+def pattern_code_difficulty(code):
+    """
+    Returns the WordFamily difficulty of the pattern a code stands for (the sum of its digits).
+    """
+    difficulty = 0
+    while code:
+        code, digit = divmod(code, 3)
+        difficulty += digit
+    return difficulty
+
+
+def get_feedback_codes(secret_words, guessed_word):
+    """
+    Computes the pattern code of guessed_word against every secret word at once. This gives the
+    same feedback as get_feedback_colors, but works on integers and does the per-guess set up only
+    once for the whole batch.
+
+    Pools of at least packed_min_pool() words whose encodings are loaded in ENCODED_WORDS go to
+    the packed engine when the guess has no repeated letters, every other pool to the string
+    engine. Both give the same codes.
+
+    pre: secret_words is a list of strings with the same length as guessed_word.
+    post: Returns a list of pattern codes, one per secret word in the same order.
+    """
+    encoded = ENCODED_WORDS
+    if (
+        len(secret_words) >= packed_min_pool(len(guessed_word))
+        and secret_words[0] in encoded
+        and not encode_word(guessed_word)[2]
+    ):
+        return get_packed_feedback_codes(
+            [encoded.get(secret_word) or encode_word(secret_word) for secret_word in secret_words],
+            guessed_word,
+        )
+    return _get_string_feedback_codes(secret_words, guessed_word)
+
+
+def _get_string_feedback_codes(secret_words, guessed_word):
+    """
+    Computes the pattern codes of guessed_word by comparing the letters of each secret word.
+
+    pre: secret_words is a list of strings with the same length as guessed_word.
+    post: Returns a list of pattern codes, one per secret word in the same order.
+    """
+    num_letters = len(guessed_word)
+    powers = [3 ** (num_letters - 1 - i) for i in range(num_letters)]
+    all_wrong = 2 * sum(powers)
+    greens = [2 * power for power in powers]
+    positions = range(num_letters)
+    guess_letters = set(guessed_word)
+    codes = [0] * len(secret_words)
+
+    for index, secret_word in enumerate(secret_words):
+        code = all_wrong
+        unmatched = {}
+        yellow_positions = []
+        for i in positions:
+            letter = secret_word[i]
+            if letter == guessed_word[i]:
+                code -= greens[i]
+            else:
+                yellow_positions.append(i)
+                if letter in guess_letters:
+                    unmatched[letter] = unmatched.get(letter, 0) + 1
+        if unmatched:
+            # Earlier guess letters take the wrong spot color first, like get_feedback_colors
+            for i in yellow_positions:
+                letter = guessed_word[i]
+                if unmatched.get(letter):
+                    unmatched[letter] -= 1
+                    code -= powers[i]
+        codes[index] = code
+    return codes
+
+
+def packed_min_pool(num_letters):
+    """
+    Returns the smallest pool get_feedback_codes() gives to the packed engine.
+
+    post: Returns PACKED_MIN_POOL if it is set, otherwise the calibrated size for num_letters,
+          calibrating it on first use.
+    """
+    if PACKED_MIN_POOL is not None:
+        return PACKED_MIN_POOL
+    size = _PACKED_MIN_POOLS.get(num_letters)
+    if size is None:
+        size = _PACKED_MIN_POOLS[num_letters] = calibrate_packed_min_pool(num_letters)
+    return size
+
+
+def calibrate_packed_min_pool(num_letters, repeats=3):
+    """
+    Times the string and packed engines on random pools of CALIBRATION_SIZES words and returns
+    the smallest size at which the packed engine is faster. Takes a few milliseconds besides
+    building pattern_code_table(num_letters) on first use.
+
+    pre: MIN_LETTERS <= num_letters <= MAX_LETTERS.
+    post: Returns a size from CALIBRATION_SIZES, or twice the largest one if the string engine
+          was faster at every size.
+    """
+    rng = random.Random(0)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    guessed_word = letters[:num_letters]
+    pool = [
+        "".join(rng.choices(letters, k=num_letters)) for _ in range(CALIBRATION_SIZES[-1])
+    ]
+    encoded = [encode_word(word) for word in pool]
+
+    def best_time(engine, words):
+        best = math.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            engine(words, guessed_word)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    for size in CALIBRATION_SIZES:
+        if best_time(get_packed_feedback_codes, encoded[:size]) <= best_time(
+            _get_string_feedback_codes, pool[:size]
+        ):
+            return size
+    return 2 * CALIBRATION_SIZES[-1]
+
+
+def get_packed_feedback_codes(encoded_secret_words, guessed_word):
+    """
+    Computes the pattern codes of a guess from encoded secret words.
+
+    A letter of a guess without repeated letters that is not green is yellow exactly when the
+    secret word has it. Greens are the zero letter fields of the packed words XORed, and the
+    guess letters the secret word has map to their fields through present_fields, so each code
+    is a few integer operations and table lookups. Guesses with repeated letters count the
+    letters of the secret word left over after greens, read from the packed word.
+
+    pre: encoded_secret_words is an iterable of sequences starting with the packed word and
+         letter mask of a word of the same length as guessed_word.
+    post: Returns a list of pattern codes, one per secret word in the same order.
+    """
+    num_letters = len(guessed_word)
+    guess_packed, guess_mask, has_duplicates, _ = encode_word(guessed_word)
+    if has_duplicates:
+        return _get_repeated_packed_feedback_codes(encoded_secret_words, guessed_word)
+    letter_bits = [1 << (ord(letter) - 97) for letter in reversed(guessed_word)]
+    present_fields = {}
+    for fields in range(1 << num_letters):
+        present_fields[sum(bit for j, bit in enumerate(letter_bits) if fields >> j & 1)] = fields
+    table = pattern_code_table(num_letters)
+    zero_fields = ZERO_FIELDS
+    all_fields = (1 << num_letters) - 1
+    # Words of up to 2 * CHUNK_LETTERS letters need two chunk lookups, longer ones three
+    high_shift = 2 * CHUNK_BITS if num_letters > 2 * CHUNK_LETTERS else 3 * CHUNK_BITS
+
+    codes = []
+    for entry in encoded_secret_words:
+        diff = entry[0] ^ guess_packed
+        green = (
+            zero_fields[diff & CHUNK_MASK]
+            | zero_fields[diff >> CHUNK_BITS & CHUNK_MASK] << CHUNK_LETTERS
+            | zero_fields[diff >> high_shift & CHUNK_MASK] << 2 * CHUNK_LETTERS
+        ) & all_fields
+        codes.append(table[green << num_letters | present_fields[entry[1] & guess_mask]])
+    return codes
+
+
+def _get_repeated_packed_feedback_codes(encoded_secret_words, guessed_word):
+    """
+    Computes the pattern codes of a guess with repeated letters from encoded secret words.
+
+    Each letter of the secret word that is not matched by a green is available once for a
+    yellow, and the guess letters claim them from the first letter on, as get_feedback_colors
+    does.
+
+    pre: encoded_secret_words is as for get_packed_feedback_codes.
+    post: Returns a list of pattern codes, one per secret word in the same order.
+    """
+    num_letters = len(guessed_word)
+    guess_packed = encode_word(guessed_word)[0]
+    # Field j holds the letter at position num_letters - 1 - j, so the first letter is last
+    guess_letters = [ord(letter) - 97 for letter in reversed(guessed_word)]
+    shifts = [LETTER_BITS * j for j in range(num_letters)]
+    first_to_last = range(num_letters - 1, -1, -1)
+    table = pattern_code_table(num_letters)
+
+    codes = []
+    for entry in encoded_secret_words:
+        packed = entry[0]
+        diff = packed ^ guess_packed
+        green = 0
+        available = [0] * 26
+        for j, shift in enumerate(shifts):
+            if diff >> shift & LETTER_MASK:
+                available[packed >> shift & LETTER_MASK] += 1
+            else:
+                green |= 1 << j
+        present = 0
+        for j in first_to_last:
+            letter = guess_letters[j]
+            if not green >> j & 1 and available[letter]:
+                available[letter] -= 1
+                present |= 1 << j
+        codes.append(table[green << num_letters | present])
+    return codes
+
+
+def partition_by_pattern(secret_words, guessed_word):
+    """
+    Groups secret words into families by the pattern code guessed_word gives them.
+
+    pre: secret_words is a list of strings with the same length as guessed_word.
+    post: Returns a dictionary mapping pattern codes to lists of secret words, each list in the
+          order of secret_words.
+    """
+    families = {}
+    for secret_word, code in zip(secret_words, get_feedback_codes(secret_words, guessed_word)):
+        family = families.get(code)
+        if family is None:
+            families[code] = [secret_word]
+        else:
+            family.append(secret_word)
+    return families
+
+
+def family_rank_key(code, words):
+    """
+    Returns a key ordering families the way sorting WordFamily objects does: the smallest key is
+    the hardest family (largest, then most difficult, then lexicographically smallest pattern).
+    """
+    return -len(words), -pattern_code_difficulty(code), code
+
+
+def rank_guesses(remaining_secret_words, guesses):
+    """
+    Evaluates many candidate guesses against the remaining secret words.
+
+    pre: remaining_secret_words is a non-empty list of strings and guesses is a list of strings
+         of the same length.
+    post: Returns a list with one tuple (histogram, worst_family_size, entropy) per guess, in the
+          order of guesses, where:
+          - histogram: a Counter mapping each pattern code to its family size
+          - worst_family_size: the size of the largest family
+          - entropy: the Shannon entropy, in bits, of the family a secret word falls into
+    """
+    total = len(remaining_secret_words)
+    log_total = math.log2(total)
+    results = []
+    for guess in guesses:
+        histogram = Counter(get_feedback_codes(remaining_secret_words, guess))
+        entropy = log_total - sum(size * math.log2(size) for size in histogram.values()) / total
+        results.append((histogram, max(histogram.values()), entropy))
+    return results
+
+
+def encode_json_record(record):
+    """
+    Encodes a play_structured() record as one line of compact JSON.
+
+    post: Returns bytes ending in a newline.
+    """
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("ascii")
+
+
+def encode_binary_record(record):
+    """
+    Encodes a play_structured() record as a RECORD_HEADER frame.
+
+    post: Returns bytes. Words longer than 255 bytes are cut short.
+    """
+    guess = record["guess"].encode("ascii", errors="replace")[:255]
+    secret = record.get("secret", "").encode("ascii")
+    packed_keyboard = 0
+    for i, code in enumerate(record.get("keyboard", "")):
+        packed_keyboard |= KEY_CODES.index(code) << (2 * i)
+    header = RECORD_HEADER.pack(
+        RECORD_INVALID if "error" in record else RECORD_TURN,
+        record["turn"],
+        STATUSES.index(record["status"]),
+        record.get("pattern", 0),
+        record["remaining"],
+        packed_keyboard.to_bytes(7, "little"),
+        len(guess),
+        len(secret),
+    )
+    return header + guess + secret
+
+
+RECORD_ENCODERS = {JSON_OUTPUT: encode_json_record, BINARY_OUTPUT: encode_binary_record}
+
+
+def play_structured(attempts, valid_guesses, output_mode):
+    """
+    Plays the same game as main(), but reads guesses without prompting and writes one record
+    per input line to the binary standard output instead of colored text.
+
+    A record is a dictionary with the turn, the guess, the status and the number of remaining
+    secret words. Valid guesses add the pattern code, the feedback and keyboard as
+    KEY_CODES strings and, once the game is lost, the secret word. Invalid guesses add the
+    error message instead. The game also ends when the input runs out.
+
+    pre: attempts > 1, valid_guesses is the dictionary and output_mode is in
+         STRUCTURED_OUTPUTS.
+    """
+    encode = RECORD_ENCODERS[output_mode]
+    out = sys.stdout.buffer
+    keyboard = Keyboard()
+    secret_words = valid_guesses
+    attempt = 1
+    status = PLAYING
+    dictionary = encode_words(valid_guesses)
+
+    while status == PLAYING:
+        try:
+            guess = input()
+        except EOFError:
+            break
+        record = {"turn": attempt, "guess": guess}
+        encoded_guess = dictionary.get(guess)
+        if encoded_guess is None:
+            record.update(status=status, remaining=len(secret_words), error=INVALID_INPUT)
+        else:
+            feedback_colors, secret_words = get_feedback(secret_words, guess)
+            pattern_code = colors_to_pattern_code(feedback_colors)
+            keyboard.update_code(pattern_code, encoded_guess[0], len(guess))
+            if len(secret_words) == 1 and guess == secret_words[0]:
+                status = WON
+            elif attempt == attempts:
+                status = LOST
+            record.update(
+                status=status,
+                remaining=len(secret_words),
+                pattern=pattern_code,
+                colors="".join([KEY_CODES[KEY_RANKS[color]] for color in feedback_colors]),
+                keyboard=keyboard.codes(),
+            )
+            if status == LOST:
+                record["secret"] = random.Random(0).choice(fast_sort(secret_words))
+            attempt += 1
+        out.write(encode(record))
+        out.flush()
 
 
-# DO NOT modify this function.
 def main():
     """
     This function is the main loop for the game. It calls prepare_game() to set up the game,
     then it loops continuously until the game is over.
     """
+    speculate = SPECULATE_ARG in sys.argv
+    if speculate:
+        sys.argv.remove(SPECULATE_ARG)
 
     try:
         valid = prepare_game()
@@ -467,13 +1197,25 @@ def main():
         print(INVALID_INPUT)
         return
 
-    attempts, valid_guesses = valid
+    attempts, valid_guesses, output_mode = valid
     secret_words = valid_guesses
 
+    if output_mode != ANSI_OUTPUT:
+        play_structured(attempts, valid_guesses, output_mode)
+        return
+
     print_explanation(attempts)
 
     keyboard = Keyboard()
     attempt = 1
+    dictionary = encode_words(valid_guesses)
+    speculator = None
+    if speculate:
+        # Imported here because wordle_speculate builds on this module
+        from wordle_speculate import SpeculativeFeedback
+
+        speculator = SpeculativeFeedback(valid_guesses)
+        speculator.speculate(secret_words)
 
     while attempt <= attempts:
         attempt_number_string = get_attempt_label(attempt)
@@ -484,17 +1226,20 @@ def main():
         if not sys.stdin.isatty():
             print(guess)
 
-        if guess not in valid_guesses:
+        encoded_guess = dictionary.get(guess)
+        if encoded_guess is None:
             print(INVALID_INPUT)
             continue
 
-        feedback_colors, secret_words = get_feedback(secret_words, guess)
-        feedback = color_word(feedback_colors, guess)
-        print(" " * (len(prompt) - 1), feedback)
-
-        keyboard.update(feedback_colors, guess)
-        print(keyboard)
-        print()
+        if speculator is None:
+            feedback_colors, secret_words = get_feedback(secret_words, guess)
+        else:
+            feedback_colors, secret_words = speculator.feedback(secret_words, guess)
+        feedback = render_feedback(feedback_colors, guess)
+        keyboard.update_code(
+            colors_to_pattern_code(feedback_colors), encoded_guess[0], len(guess)
+        )
+        sys.stdout.write(render_turn(prompt, feedback, keyboard))
 
         if len(secret_words) == 1 and guess == secret_words[0]:
             print("Congratulations! ", end="")
@@ -502,6 +1247,8 @@ def main():
             break
 
         attempt += 1
+        if speculator is not None and attempt <= attempts:
+            speculator.speculate(secret_words)
 
     if attempt > attempts:
         random.seed(0)
@@ -1,7 +1,12 @@
 """Evil Wordle Test Suite"""
 
+import io
+import json
+import random
 import unittest
 import sys
+from types import SimpleNamespace
+from unittest.mock import patch
 from evil_wordle import (
     Keyboard,
     WordFamily,
@@ -13,7 +18,32 @@ from evil_wordle import (
     fast_sort,
     get_feedback_colors,
     get_feedback,
+    colors_to_pattern_code,
+    pattern_code_to_colors,
+    pattern_code_difficulty,
+    get_feedback_codes,
+    get_packed_feedback_codes,
+    rank_guesses,
+    pack_word,
+    unpack_word,
+    render_feedback,
+    render_turn,
+    letter_mask,
+    encode_word,
+    encode_words,
+    prepare_game,
+    play_structured,
+    encode_binary_record,
+    RECORD_HEADER,
+    JSON_OUTPUT,
+    BINARY_OUTPUT,
+    MIN_LETTERS,
+    MAX_LETTERS,
+    CALIBRATION_SIZES,
+    calibrate_packed_min_pool,
+    packed_min_pool,
 )
+from wordle_session import load_words
 
 
 class TestKeyboardUpdate(unittest.TestCase):
@@ -400,6 +430,32 @@ class TestKeyboardUpdate(unittest.TestCase):
         )
         self.check_keyboard_colors(keyboard, expected_colors)
 
+    def test_update_11(self):
+        """update_code(): pattern code and packed guess match update()"""
+        guesses = [("stark", "BBGYG"), ("track", "BGGYG"), ("basis", "BYYYY"), ("swiss", "YBYGG")]
+        digits = {"G": 0, "Y": 1, "B": 2}
+        colors = {"G": CORRECT_COLOR, "Y": WRONG_SPOT_COLOR, "B": NOT_IN_WORD_COLOR}
+        by_colors, by_code = Keyboard(), Keyboard()
+        for guess, pattern in guesses:
+            by_colors.update([colors[mark] for mark in pattern], guess)
+            code = 0
+            for mark in pattern:
+                code = code * 3 + digits[mark]
+            by_code.update_code(code, pack_word(guess))
+            self.assertEqual(by_code.ranks, by_colors.ranks)
+            self.assertEqual(str(by_code), str(by_colors))
+
+    def test_update_12(self):
+        """ranks: one byte per letter, in alphabetical order"""
+        keyboard = Keyboard()
+        keyboard.update([CORRECT_COLOR, WRONG_SPOT_COLOR] + [NOT_IN_WORD_COLOR] * 3, "bayou")
+        self.assertEqual(len(keyboard.ranks), 26)
+        self.assertEqual(keyboard.ranks[0], 2)
+        self.assertEqual(keyboard.ranks[1], 3)
+        self.assertEqual(keyboard.ranks[24], 1)
+        self.assertEqual(keyboard.ranks[25], 0)
+        self.assertEqual(unpack_word(pack_word("bayou")), "bayou")
+
 
 class TestKeyboardStr(unittest.TestCase):
     """Keyboard String Representation Tests"""
@@ -520,6 +576,41 @@ class TestKeyboardStr(unittest.TestCase):
             str(keyboard), expected_output, f"\n{keyboard} \n!=\n{expected_output}"
         )
 
+    def test_str_5(self):
+        """changed_rows(): only rows with recolored letters are rendered again"""
+        keyboard = Keyboard()
+        self.assertEqual(sorted(keyboard.changed_rows()), [0, 1, 2])
+        self.assertEqual(keyboard.changed_rows(), {})
+
+        keyboard.update([NOT_IN_WORD_COLOR] * 5, "zxcvb")
+        changed = keyboard.changed_rows()
+        self.assertEqual(list(changed), [2])
+        self.assertEqual(changed[2], str(keyboard).split("\n")[2])
+
+        # Colors that do not change leave the cache alone
+        keyboard.update([NOT_IN_WORD_COLOR] * 5, "zxcvb")
+        self.assertEqual(keyboard.changed_rows(), {})
+
+    def test_str_6(self):
+        """__str__(): colors assigned directly show up in the cached rendering"""
+        keyboard = Keyboard()
+        str(keyboard)
+        keyboard.colors["q"] = CORRECT_COLOR
+        self.assertTrue(str(keyboard).startswith(color_word(CORRECT_COLOR, "q")))
+        self.assertEqual(list(keyboard.changed_rows()), [0, 1, 2])
+
+    def test_str_7(self):
+        """render_feedback() and render_turn(): same text as color_word() and main()'s prints"""
+        colors = [CORRECT_COLOR, WRONG_SPOT_COLOR, NOT_IN_WORD_COLOR, NO_COLOR, CORRECT_COLOR]
+        self.assertEqual(render_feedback(colors, "zebra"), color_word(colors, "zebra"))
+        keyboard = Keyboard()
+        keyboard.update(colors, "zebra")
+        feedback = render_feedback(colors, "zebra")
+        self.assertEqual(
+            render_turn("Enter: ", feedback, keyboard),
+            "      " + " " + feedback + "\n" + str(keyboard) + "\n\n",
+        )
+
 
 class TestWordFamilyDifficulty(unittest.TestCase):
     """WordFamily Difficulty Calculation Tests"""
@@ -1335,6 +1426,214 @@ class TestGetFeedback(unittest.TestCase):
         self.assertEqual(words, ["dandy", "dawns"])
 
 
+class TestRankGuesses(unittest.TestCase):
+    """Tests for the pattern code helpers and rank_guesses"""
+
+    def test_rank_1(self):
+        """get_feedback_codes: agrees with get_feedback_colors, including repeated letters"""
+        words = ["abaca", "llama", "sassy", "esses", "apple", "paper", "spasm", "fable"]
+        for guessed_word in words:
+            codes = get_feedback_codes(words, guessed_word)
+            self.assertEqual(
+                [pattern_code_to_colors(code) for code in codes],
+                [tuple(get_feedback_colors(word, guessed_word)) for word in words],
+            )
+
+    def test_rank_2(self):
+        """colors_to_pattern_code: round trips and keeps difficulty"""
+        colors = (
+            CORRECT_COLOR, NOT_IN_WORD_COLOR, WRONG_SPOT_COLOR, CORRECT_COLOR, WRONG_SPOT_COLOR
+        )
+        code = colors_to_pattern_code(colors)
+        self.assertEqual(code, 0 * 81 + 2 * 27 + 1 * 9 + 0 * 3 + 1)
+        self.assertEqual(pattern_code_to_colors(code), colors)
+        self.assertEqual(pattern_code_difficulty(code), WordFamily(colors, []).difficulty)
+
+    def test_rank_3(self):
+        """rank_guesses: histogram, worst family size and entropy"""
+        remaining = ["bread", "break", "bream", "broad"]
+        [(histogram, worst, entropy)] = rank_guesses(remaining, ["broad"])
+        self.assertEqual(sorted(histogram.values()), [1, 1, 2])
+        self.assertEqual(worst, 2)
+        self.assertAlmostEqual(entropy, 1.5)
+
+    def test_rank_4(self):
+        """rank_guesses: one result per guess in order"""
+        remaining = ["bread", "stone", "chant"]
+        results = rank_guesses(remaining, ["bread", "zzzzz"])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][1], 1)
+        self.assertEqual(results[1][1], 3)
+        self.assertAlmostEqual(results[1][2], 0.0)
+
+    def test_rank_5(self):
+        """letter masks: guesses without repeated letters take the fast path with the same result"""
+        self.assertEqual(letter_mask("geese"), ((1 << 4) | (1 << 6) | (1 << 18), True))
+        self.assertFalse(letter_mask("bread")[1])
+        self.assertEqual(
+            get_feedback_colors("abbey", "bread"),
+            [WRONG_SPOT_COLOR, NOT_IN_WORD_COLOR, WRONG_SPOT_COLOR, WRONG_SPOT_COLOR,
+             NOT_IN_WORD_COLOR],
+        )
+        words = ["abbey", "geese", "crest", "bread", "sassy", "tiger", "eerie"]
+        before = [get_feedback_codes(words, guessed_word) for guessed_word in words]
+        encode_words(words)
+        for guessed_word, codes in zip(words, before):
+            self.assertEqual(get_feedback_codes(words, guessed_word), codes)
+            self.assertEqual(
+                [pattern_code_to_colors(code) for code in codes],
+                [tuple(get_feedback_colors(word, guessed_word)) for word in words],
+            )
+
+    def test_rank_6(self):
+        """encode_word: packed word, letter mask and counts; packed feedback for 7 letter words"""
+        packed, mask, has_duplicates, counts = encode_word("geese")
+        self.assertEqual(packed, pack_word("geese"))
+        self.assertEqual(mask, letter_mask("geese")[0])
+        self.assertTrue(has_duplicates)
+        self.assertEqual(counts, (3 << 5 * 4) | (1 << 5 * 6) | (1 << 5 * 18))
+        words = ["kitchen", "chicken", "thicken", "picnics", "mention", "nothing"]
+        encode_words(words)
+        for guessed_word in words:
+            codes = get_feedback_codes(words, guessed_word)
+            self.assertEqual(
+                [pattern_code_to_colors(code, 7) for code in codes],
+                [tuple(get_feedback_colors(word, guessed_word)) for word in words],
+            )
+
+
+class TestWordLengths(unittest.TestCase):
+    """Tests for words of every supported length"""
+
+    @staticmethod
+    def random_words(num_letters, count):
+        """Helper method returning words from a small alphabet, so letters repeat often"""
+        generator = random.Random(num_letters)
+        return ["".join(generator.choice("aeilnrst") for _ in range(num_letters))
+                for _ in range(count)]
+
+    def test_lengths_1(self):
+        """get_feedback_codes: agrees with get_feedback_colors for 4 to 8 letter words"""
+        for num_letters in range(MIN_LETTERS, MAX_LETTERS + 1):
+            words = self.random_words(num_letters, 40)
+            encoded = encode_words(words)
+            for guessed_word in words[:15]:
+                expected = [
+                    colors_to_pattern_code(get_feedback_colors(word, guessed_word))
+                    for word in words
+                ]
+                self.assertEqual(get_feedback_codes(words, guessed_word), expected)
+                self.assertEqual(
+                    get_packed_feedback_codes([encoded[word] for word in words], guessed_word),
+                    expected,
+                )
+                self.assertTrue(all(code < 3 ** num_letters for code in expected))
+
+    def test_lengths_2(self):
+        """get_feedback: families of 8 letter words print with one square per letter"""
+        words = ["stations", "relation", "notarial", "rationed", "entrails"]
+        colors, remaining = get_feedback(words, "senorita")
+        self.assertEqual(len(colors), 8)
+        self.assertTrue(remaining)
+        family = WordFamily(colors, remaining)
+        self.assertEqual(str(family).count("■"), 8)
+
+    def test_lengths_3(self):
+        """update_code: agrees with update() for 4 and 6 letter guesses"""
+        for secret_word, guessed_word in (("tale", "late"), ("rattle", "letter")):
+            colors = get_feedback_colors(secret_word, guessed_word)
+            by_colors, by_code = Keyboard(), Keyboard()
+            by_colors.update(colors, guessed_word)
+            by_code.update_code(
+                colors_to_pattern_code(colors), pack_word(guessed_word), len(guessed_word)
+            )
+            self.assertEqual(by_code.codes(), by_colors.codes())
+
+
+class TestFeedbackEngines(unittest.TestCase):
+    """Tests for the choice between the string and packed feedback engines"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+        encode_words(self.words)
+
+    def test_engines_1(self):
+        """get_feedback_codes: both engines give the same codes"""
+        for guessed_word in self.words[:10] + ["geese", "llama"]:
+            with patch("evil_wordle.PACKED_MIN_POOL", 0):
+                packed = get_feedback_codes(self.words, guessed_word)
+            with patch("evil_wordle.PACKED_MIN_POOL", len(self.words) + 1):
+                strings = get_feedback_codes(self.words, guessed_word)
+            self.assertEqual(packed, strings)
+
+    def test_engines_2(self):
+        """get_feedback_codes: small, unloaded and repeated letter pools skip the packed engine"""
+        unloaded = ["qxzvj", "jxqzv"]
+        with patch("evil_wordle.PACKED_MIN_POOL", 3), patch(
+            "evil_wordle.get_packed_feedback_codes", wraps=get_packed_feedback_codes
+        ) as packed:
+            get_feedback_codes(self.words[:2], "stone")
+            get_feedback_codes(unloaded * 2, "stone")
+            get_feedback_codes(self.words, "geese")
+            self.assertEqual(packed.call_count, 0)
+            get_feedback_codes(self.words, "stone")
+            self.assertEqual(packed.call_count, 1)
+
+    def test_engines_3(self):
+        """packed_min_pool: PACKED_MIN_POOL overrides the calibrated size"""
+        sizes = CALIBRATION_SIZES + (2 * CALIBRATION_SIZES[-1],)
+        self.assertIn(calibrate_packed_min_pool(5), sizes)
+        self.assertEqual(packed_min_pool(5), packed_min_pool(5))
+        with patch("evil_wordle.PACKED_MIN_POOL", 7):
+            self.assertEqual(packed_min_pool(5), 7)
+            self.assertEqual(packed_min_pool(6), 7)
+
+
+class TestStructuredOutput(unittest.TestCase):
+    """Tests for the json and binary output modes"""
+
+    WORDS = ["bread", "break", "bream", "broad", "stone", "chant"]
+
+    def play(self, output_mode, inputs, attempts=6):
+        out = SimpleNamespace(buffer=io.BytesIO())
+        with patch("builtins.input", side_effect=inputs + [EOFError]), patch("sys.stdout", out):
+            play_structured(attempts, self.WORDS, output_mode)
+        return out.buffer.getvalue()
+
+    def test_output_1(self):
+        """prepare_game(): a json or binary argument selects the output mode"""
+        with patch("sys.argv", ["evil_wordle.py", "3", "json", "debug"]):
+            attempts, _, output_mode = prepare_game()
+        self.assertEqual((attempts, output_mode), (3, JSON_OUTPUT))
+        with patch("sys.argv", ["evil_wordle.py", "json", "binary"]):
+            self.assertRaises(ValueError, prepare_game)
+
+    def test_output_2(self):
+        """play_structured(): one json line per input line until the game ends"""
+        lines = self.play(JSON_OUTPUT, ["zzzzz", "stone", "chant", "bread"], attempts=2)
+        records = [json.loads(line) for line in lines.splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertIn("error", records[0])
+        self.assertEqual(records[1]["colors"], "BBBBY")
+        self.assertEqual(records[1]["pattern"], 3 ** 5 - 2)
+        self.assertEqual(records[1]["remaining"], 3)
+        self.assertEqual(records[1]["keyboard"][ord("e") - 97], "Y")
+        self.assertEqual(records[2]["status"], "lost")
+        self.assertIn(records[2]["secret"], ["bread", "break", "bream"])
+
+    def test_output_3(self):
+        """play_structured(): binary frames carry the same fields"""
+        frames = self.play(BINARY_OUTPUT, ["stone"])
+        kind, turn, status, pattern, remaining, _, guess_length, secret_length = (
+            RECORD_HEADER.unpack_from(frames)
+        )
+        self.assertEqual((kind, turn, status, pattern, remaining), (0, 1, 0, 241, 3))
+        self.assertEqual(frames[RECORD_HEADER.size :], b"stone")
+        self.assertEqual((guess_length, secret_length), (5, 0))
+        record = {"turn": 1, "guess": "zzzzz", "status": "playing", "remaining": 6, "error": ""}
+        self.assertEqual(encode_binary_record(record)[0], 1)
+
+
 def main():
     """Main function to run tests based on command-line arguments."""
     test_cases = {
@@ -1345,6 +1644,10 @@ def main():
         "sort": TestFastSort,
         "colors": TestGetFeedbackColors,
         "feedback": TestGetFeedback,
+        "rank": TestRankGuesses,
+        "output": TestStructuredOutput,
+        "lengths": TestWordLengths,
+        "engines": TestFeedbackEngines,
     }
 
     usage_string = (
@@ -1355,7 +1658,8 @@ def main():
         "Valid options for [test_method_or_function]: "
         + ", ".join(test_cases.keys())
         + "\n"
-        "Test cases range from 1-4 for str, 1-6 for diff, and 1-10 for all other functions."
+        "Test cases range from 1-6 for rank, 1-3 for output, lengths and engines, 1-7 for str, "
+        "1-6 for diff, 1-12 for update, and 1-10 for all other functions."
     )
 
     if len(sys.argv) > 3:
@@ -0,0 +1,99 @@
+"""Game Tree Analyzer Test Suite"""
+
+import os
+import tempfile
+import unittest
+
+from evil_wordle import get_feedback
+from wordle_analyze import GameTreeAnalyzer, MemoStore, analyze
+from wordle_session import load_words
+
+
+def brute_force_turns(secret_words, guesses, depth):
+    """Helper function computing the turns a perfect player needs by plain recursion"""
+    if len(secret_words) == 1:
+        return 1
+    if depth == 0:
+        return float("inf")
+    best = float("inf")
+    for guess in guesses:
+        _, family = get_feedback(secret_words, guess)
+        if len(family) < len(secret_words):
+            best = min(best, 1 + brute_force_turns(family, guesses, depth - 1))
+    return best
+
+
+class TestGameTreeAnalyzer(unittest.TestCase):
+    """GameTreeAnalyzer Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+
+    def test_analyzer_1(self):
+        """solve: agrees with plain recursion on small pools"""
+        guesses = self.words[::3]
+        analyzer = GameTreeAnalyzer(self.words, guesses)
+        for pool in (self.words[:6], self.words[10:18], self.words[30:37]):
+            self.assertEqual(analyzer.solve(pool, 4), brute_force_turns(pool, guesses, 4), pool)
+
+    def test_analyzer_2(self):
+        """state_key: independent of order, different for different pools"""
+        analyzer = GameTreeAnalyzer(self.words)
+        self.assertEqual(
+            analyzer.state_key(["grain", "train"]), analyzer.state_key(["train", "grain"])
+        )
+        self.assertNotEqual(
+            analyzer.state_key(["grain", "train"]), analyzer.state_key(["grain", "grant"])
+        )
+
+    def test_analyzer_3(self):
+        """solve: returns None when more turns than allowed are needed"""
+        analyzer = GameTreeAnalyzer(self.words)
+        self.assertIsNone(analyzer.solve(self.words, 1))
+        self.assertIsNotNone(analyzer.solve(self.words, 6))
+
+    def test_analyzer_4(self):
+        """solve: partitioning by secret classes gives the turns of partitioning by words"""
+        guesses = self.words[:4]
+        analyzer = GameTreeAnalyzer(self.words, guesses)
+        self.assertIsNotNone(analyzer.classes)
+        words_analyzer = GameTreeAnalyzer(self.words, guesses)
+        words_analyzer.classes = None
+        self.assertEqual(
+            sorted(map(sorted, analyzer.children(self.words))),
+            sorted(map(sorted, words_analyzer.children(self.words))),
+        )
+        self.assertEqual(analyzer.solve(self.words, 6), words_analyzer.solve(self.words, 6))
+
+    def test_analyze_1(self):
+        """analyze: checkpoints are reused when a run is resumed"""
+        with tempfile.TemporaryDirectory() as directory:
+            db_file = os.path.join(directory, "memo.db")
+            first = analyze(self.words, self.words[:5], db_file, max_turns=6)
+            store = MemoStore(db_file)
+            self.assertEqual(store.load_roots(), first)
+            self.assertTrue(store.load_memo())
+            store.close()
+
+            seen = []
+            second = analyze(
+                self.words,
+                self.words[:8],
+                db_file,
+                max_turns=6,
+                progress=lambda done, total, guess, turns: seen.append(guess),
+            )
+            self.assertEqual(seen, self.words[5:8])
+            self.assertEqual({guess: second[guess] for guess in first}, first)
+
+    def test_analyze_2(self):
+        """analyze: a process pool gives the same results"""
+        guesses = self.words[:6]
+        self.assertEqual(
+            analyze(self.words, guesses, max_turns=6),
+            analyze(self.words, guesses, processes=2, max_turns=6),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
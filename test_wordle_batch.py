@@ -0,0 +1,86 @@
+"""Batch Replay Test Suite"""
+
+import glob
+import io
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import evil_wordle
+from wordle_batch import INCOMPLETE, read_transcript, replay, replay_files
+from wordle_session import GameContext
+
+TRANSCRIPTS = sorted(glob.glob("functional_tests/*.in"))
+EXPECTED_OUTPUTS = "functional_tests/expected_default_outputs"
+
+
+def run_main(inputs):
+    """Helper function to capture what main() prints for the given input lines"""
+    lines = iter(inputs)
+
+    def input_mock(prompt=""):
+        current_input = next(lines)
+        print(f"{prompt}{current_input}")
+        return current_input
+
+    # The transcript echo already shows each guess, like typing it in a terminal does.
+    terminal = MagicMock()
+    terminal.isatty.return_value = True
+    output_buffer = io.StringIO()
+    with patch("builtins.input", input_mock), patch("sys.stdout", new=output_buffer), patch(
+        "sys.stdin", new=terminal
+    ):
+        sys.argv = ["evil_wordle.py"]
+        evil_wordle.main()
+    return output_buffer.getvalue()
+
+
+class TestReplay(unittest.TestCase):
+    """replay Tests"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.context = GameContext.from_file("valid_guesses.txt")
+
+    def test_replay_1(self):
+        """replay: output matches main() and the expected output of every functional test"""
+        for file_name in TRANSCRIPTS:
+            inputs = read_transcript(file_name)
+            output, _ = replay(self.context, inputs)
+            self.assertEqual(output, run_main(inputs), file_name)
+
+            name = os.path.splitext(os.path.basename(file_name))[0]
+            expected_file = os.path.join(EXPECTED_OUTPUTS, f"{name}.ansi")
+            with open(expected_file, "r", encoding="utf-8") as expected:
+                self.assertEqual(output, expected.read(), expected_file)
+
+    def test_replay_2(self):
+        """replay: invalid guesses are reported and do not use an attempt"""
+        output, (status, turns, _) = replay(self.context, ["xxxxx", "adieu"])
+        self.assertIn(evil_wordle.INVALID_INPUT, output)
+        self.assertIn("Enter your 1st guess: adieu", output)
+        self.assertEqual(turns, 1)
+        self.assertEqual(status, INCOMPLETE)
+
+    def test_replay_3(self):
+        """replay: render=False only returns the outcome"""
+        inputs = read_transcript(TRANSCRIPTS[0])
+        output, outcome = replay(self.context, inputs, render=False)
+        self.assertIsNone(output)
+        self.assertEqual(outcome, replay(self.context, inputs)[1])
+
+
+class TestReplayFiles(unittest.TestCase):
+    """replay_files Tests"""
+
+    def test_replay_files_1(self):
+        """replay_files: a process pool gives the same results in the same order"""
+        serial = list(replay_files(TRANSCRIPTS, render=False))
+        parallel = list(replay_files(TRANSCRIPTS, render=False, processes=2))
+        self.assertEqual(serial, parallel)
+        self.assertEqual([result[0] for result in serial], TRANSCRIPTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
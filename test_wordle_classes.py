@@ -0,0 +1,56 @@
+"""Secret Classes Test Suite"""
+
+import unittest
+
+from evil_wordle import get_feedback, get_feedback_codes
+from wordle_classes import SecretClasses
+from wordle_session import load_words
+
+
+class TestSecretClasses(unittest.TestCase):
+    """SecretClasses Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+        self.guesses = ["stone", "chant", "eagle"]
+        self.classes = SecretClasses(self.words, self.guesses)
+
+    def test_classes_1(self):
+        """SecretClasses: words share a class exactly when every guess gives them one code"""
+        signature = dict(
+            zip(
+                self.words,
+                zip(*(get_feedback_codes(self.words, guess) for guess in self.guesses)),
+            )
+        )
+        self.assertLess(len(self.classes), len(self.words))
+        self.assertEqual(sum(self.classes.weights), len(self.words))
+        self.assertEqual(len(set(signature.values())), len(self.classes))
+        for word in self.words:
+            for other in self.words:
+                self.assertEqual(
+                    self.classes.class_of[word] == self.classes.class_of[other],
+                    signature[word] == signature[other],
+                )
+        self.assertEqual(self.classes.words(self.classes.all_classes()), self.words)
+
+    def test_classes_2(self):
+        """hardest_family: keeps the family get_feedback keeps, as class ids"""
+        pool = self.words
+        classes = self.classes.classes_of(pool)
+        for guessed_word in self.guesses + ["stone"]:
+            feedback_colors, pool = get_feedback(pool, guessed_word)
+            code, classes = self.classes.hardest_family(classes, guessed_word)
+            self.assertEqual(self.classes.words(classes), pool)
+            self.assertEqual(self.classes.weight(classes), len(pool))
+            self.assertEqual(get_feedback_codes(pool[:1], guessed_word)[0], code)
+
+    def test_classes_3(self):
+        """partition: rejects guesses the classes were not built for"""
+        with self.assertRaises(ValueError):
+            self.classes.partition(self.classes.all_classes(), "apple")
+        self.assertEqual(len(SecretClasses(["apple"], self.guesses)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
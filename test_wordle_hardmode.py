@@ -0,0 +1,79 @@
+"""Hard Mode Test Suite"""
+
+import unittest
+
+from evil_wordle import get_feedback_colors
+from wordle_hardmode import HardModeConstraints, HardModeValidator
+from wordle_server import GameServer
+from wordle_session import GameContext, GameSession, SessionManager, load_words
+
+
+class TestHardMode(unittest.TestCase):
+    """HardModeValidator and hard mode session Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+        self.validator = HardModeValidator(self.words)
+
+    def test_hard_1(self):
+        """allows and legal_guesses: agree with violation() after any one or two guesses"""
+        for secret_word in self.words[::9]:
+            for first in self.words[::5]:
+                for second in self.words[1::11]:
+                    history = [
+                        (guess, get_feedback_colors(secret_word, guess))
+                        for guess in (first, second)
+                    ]
+                    constraints = HardModeConstraints.from_history(history, 5)
+                    expected = [
+                        word for word in self.words if constraints.violation(word) is None
+                    ]
+                    allowed = [
+                        word for word in self.words if self.validator.allows(word, constraints)
+                    ]
+                    self.assertEqual(allowed, expected)
+                    self.assertEqual(self.validator.legal_guesses(constraints), expected)
+
+    def test_hard_2(self):
+        """update: repeated yellow letters require that many copies, gray letters are allowed"""
+        constraints = HardModeConstraints(5)
+        constraints.update("eagle", get_feedback_colors("geese", "eagle"))
+        self.assertEqual(constraints.min_counts, {"e": 2, "g": 1})
+        self.assertEqual(constraints.violation("angel"), "5th letter must be E")
+        self.assertIsNone(constraints.violation("geese"))
+        constraints.update("agile", get_feedback_colors("apple", "agile"))
+        self.assertEqual(constraints.greens, {0: "a", 3: "l", 4: "e"})
+        self.assertEqual(constraints.violation("apply"), "5th letter must be E")
+        self.assertEqual(constraints.violation("agile"), "Guess must contain E")
+
+    def test_hard_3(self):
+        """GameSession: hard mode rejects guesses ignoring hints, also after a restore"""
+        context = GameContext(self.words)
+        session = GameSession(context, hard_mode=True)
+        session.guess("stone")
+        legal = self.validator.legal_guesses(session.constraints)
+        illegal = [word for word in self.words if word not in legal]
+        self.assertTrue(illegal)
+        with self.assertRaises(ValueError):
+            session.guess(illegal[0])
+        self.assertEqual(session.attempt, 2)
+
+        restored = GameSession.restore(context, session.snapshot())
+        self.assertEqual(restored.constraints.min_counts, session.constraints.min_counts)
+        self.assertEqual(restored.constraints.greens, session.constraints.greens)
+        with self.assertRaises(ValueError):
+            restored.guess(illegal[0])
+        easy = GameSession.restore(context, GameSession(context).snapshot())
+        self.assertIsNone(easy.constraints)
+
+    def test_hard_4(self):
+        """GameServer: NEW with HARD starts a hard mode game"""
+        server = GameServer(SessionManager(GameContext(self.words)))
+        self.assertEqual(server.handle_line("NEW 4 HARD"), "OK 1 4")
+        self.assertEqual(server.handle_line("NEW hard"), "OK 2 6")
+        self.assertIsNotNone(server.manager.get(1).constraints)
+        self.assertIsNone(server.manager.get(server.manager.new(6)).constraints)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Hint Engine Test Suite"""
+
+import unittest
+
+from evil_wordle import rank_guesses
+from wordle_hints import HintEngine
+from wordle_session import load_words
+
+
+class TestHintEngine(unittest.TestCase):
+    """HintEngine Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+        self.engine = HintEngine(self.words, budget=10, max_candidates=len(self.words))
+
+    def test_hint_1(self):
+        """hint: finds the guess with the smallest largest family"""
+        guess, worst, entropy = self.engine.hint(self.words)
+        ranking = rank_guesses(self.words, self.words)
+        self.assertEqual(worst, min(result[1] for result in ranking))
+        self.assertEqual(ranking[self.words.index(guess)][1], worst)
+        self.assertAlmostEqual(ranking[self.words.index(guess)][2], entropy)
+
+    def test_hint_2(self):
+        """hint: one or two remaining words are hinted directly"""
+        self.assertEqual(self.engine.hint(["grain"])[0], "grain")
+        self.assertEqual(self.engine.hint(["grain", "train"])[0], "grain")
+
+    def test_hint_3(self):
+        """hint: prefers a remaining word that splits the pool into singletons"""
+        guess, worst, _ = self.engine.hint(["bread", "stone", "chant"])
+        self.assertEqual(worst, 1)
+        self.assertIn(guess, ["bread", "stone", "chant"])
+
+    def test_hint_4(self):
+        """hint: repeated pools are answered from the cache"""
+        first = self.engine.hint(self.words)
+        evaluated = self.engine.evaluated
+        self.assertEqual(self.engine.hint(list(self.words)), first)
+        self.assertEqual(self.engine.evaluated, evaluated)
+
+    def test_hint_5(self):
+        """candidates: respects max_candidates and lists remaining words first"""
+        engine = HintEngine(self.words, max_candidates=10)
+        candidates = engine.candidates(["grain", "train"])
+        self.assertEqual(len(candidates), 10)
+        self.assertEqual(candidates[:2], ["grain", "train"])
+        self.assertEqual(len(set(candidates)), 10)
+
+    def test_hint_6(self):
+        """hint: only suggests legal guesses when they are given"""
+        pool = ["grain", "train", "brain", "drain", "crane", "crate"]
+        legal_guesses = [word for word in self.words if word.endswith(("ain", "ane", "ate"))]
+        guess, _, _ = self.engine.hint(pool, legal_guesses)
+        self.assertIn(guess, legal_guesses)
+        self.assertTrue(set(self.engine.candidates(pool, legal_guesses)) <= set(legal_guesses))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Word Index Test Suite"""
+
+import unittest
+
+from evil_wordle import (
+    NOT_IN_WORD_COLOR,
+    colors_to_pattern_code,
+    get_feedback,
+    get_feedback_colors,
+)
+from wordle_index import WordIndex
+from wordle_session import load_words
+
+
+class TestWordIndex(unittest.TestCase):
+    """WordIndex Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+        self.index = WordIndex(self.words)
+
+    def test_index_1(self):
+        """matching: agrees with get_feedback_colors for every guess and secret word"""
+        for guessed_word in self.words:
+            for secret_word in self.words[::7]:
+                colors = get_feedback_colors(secret_word, guessed_word)
+                expected = [
+                    word for word in self.words
+                    if get_feedback_colors(word, guessed_word) == colors
+                ]
+                bits = self.index.matching(guessed_word, colors)
+                self.assertEqual(self.index.words_of(bits), expected)
+
+    def test_index_2(self):
+        """consistent: rebuilds the pool get_feedback leaves after a history"""
+        secret_words = self.words
+        history = []
+        for guessed_word in ["stone", "chant", "angle"]:
+            colors, secret_words = get_feedback(secret_words, guessed_word)
+            history.append((guessed_word, colors))
+            self.assertEqual(self.index.consistent(history), secret_words)
+
+    def test_index_3(self):
+        """consistent: pattern codes work like colors, repeated gray letters cap the count"""
+        index = WordIndex(["eerie", "geese", "there", "sheep"])
+        colors = get_feedback_colors("there", "geese")
+        history = [("geese", colors_to_pattern_code(colors))]
+        self.assertEqual(index.consistent(history), ["there"])
+        self.assertEqual(index.consistent([("zzzzz", [NOT_IN_WORD_COLOR] * 5)]), index.words)
+        self.assertEqual(index.consistent([]), index.words)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Load Generator Test Suite"""
+
+import asyncio
+import unittest
+
+from wordle_loadgen import LatencyHistogram, load_transcripts, run_load
+from wordle_server import GameServer
+from wordle_session import PLAYING, GameContext, GameSession, SessionManager
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """LatencyHistogram Tests"""
+
+    def test_histogram_1(self):
+        """percentile: picks the sample at the requested rank"""
+        histogram = LatencyHistogram()
+        for milliseconds in range(1, 101):
+            histogram.record(milliseconds / 1000)
+        self.assertAlmostEqual(histogram.percentile(0.5), 0.051)
+        self.assertAlmostEqual(histogram.percentile(0.99), 0.1)
+        self.assertEqual(histogram.percentile(0), 0.001)
+
+    def test_histogram_2(self):
+        """buckets: every sample is counted once"""
+        histogram = LatencyHistogram()
+        for seconds in (0.00005, 0.003, 0.003, 2.0):
+            histogram.record(seconds)
+        counts = dict(histogram.buckets())
+        self.assertEqual(sum(counts.values()), 4)
+        self.assertEqual(counts[0.1], 1)
+        self.assertEqual(counts[5], 2)
+        self.assertEqual(counts[None], 1)
+
+
+class TestRunLoad(unittest.TestCase):
+    """run_load Tests"""
+
+    def test_run_load_1(self):
+        """run_load: replays transcripts against an in-process server"""
+        transcripts = load_transcripts("functional_tests/*.in")
+        self.assertEqual(len(transcripts), 10)
+
+        async def run():
+            server = GameServer(SessionManager(GameContext.from_file("valid_guesses.txt")))
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+
+            def connect():
+                return asyncio.open_connection("127.0.0.1", port)
+
+            report = await run_load(connect, transcripts, len(transcripts), 4, 0)
+            listener.close()
+            await listener.wait_closed()
+            return report
+
+        report = asyncio.run(run())
+        self.assertEqual(report.errors, {})
+        self.assertEqual(report.sessions, len(transcripts))
+        # Every guess sent before its game ended is a turn, NEW and END are not
+        context = GameContext.from_file("valid_guesses.txt")
+        turns = rejected = 0
+        for guesses in transcripts:
+            session = GameSession(context)
+            for guess in guesses:
+                turns += 1
+                try:
+                    session.guess(guess)
+                except ValueError:
+                    rejected += 1
+                if session.status != PLAYING:
+                    break
+        self.assertEqual(report.turns, turns)
+        self.assertEqual(report.rejected, rejected)
+        self.assertEqual(len(report.latencies.samples), report.turns)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Lookahead Adversary Test Suite"""
+
+import time
+import unittest
+
+from evil_wordle import get_feedback, partition_by_pattern
+from wordle_lookahead import LookaheadAdversary, estimate_guesses
+from wordle_session import GameContext, GameSession, load_words
+
+
+def resist(words, guessed_word, depth):
+    """
+    Helper function computing by plain recursion how many guesses the family words, kept for
+    guessed_word, forces from a player guessing its words, estimating below depth
+    """
+    if words == [guessed_word]:
+        return 0
+    if len(words) == 1:
+        return 1
+    if depth == 0:
+        return estimate_guesses(len(words))
+    return min(
+        1 + max(
+            resist(family, guess, depth - 1)
+            for family in partition_by_pattern(words, guess).values()
+        )
+        for guess in words
+    )
+
+
+class TestLookaheadAdversary(unittest.TestCase):
+    """LookaheadAdversary Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+
+    def test_lookahead_1(self):
+        """depth 0: picks exactly what get_feedback picks"""
+        adversary = LookaheadAdversary(depth=0)
+        for guess in self.words:
+            self.assertEqual(
+                get_feedback(self.words, guess, adversary), get_feedback(self.words, guess)
+            )
+
+    def test_lookahead_2(self):
+        """lookahead: answers with a real family of the guess"""
+        adversary = LookaheadAdversary(depth=2)
+        for guess in ("angle", "chant", "stone"):
+            feedback, words = get_feedback(self.words, guess, adversary)
+            self.assertTrue(words)
+            for word in words:
+                self.assertEqual(get_feedback([word], guess)[0], feedback)
+
+    def test_lookahead_3(self):
+        """lookahead: never keeps a family that resists less than the greedy one"""
+        adversary = LookaheadAdversary(
+            depth=2, branching=50, max_families=50, node_budget=10**6, time_budget=10
+        )
+        for guess in self.words:
+            _, greedy_words = get_feedback(self.words, guess)
+            _, words = get_feedback(self.words, guess, adversary)
+            self.assertGreaterEqual(resist(words, guess, 2), resist(greedy_words, guess, 2))
+
+    def test_lookahead_4(self):
+        """lookahead: a turn on the full dictionary stays within its time budget"""
+        adversary = LookaheadAdversary(time_budget=0.05)
+        words = load_words("valid_guesses.txt")
+        start = time.perf_counter()
+        get_feedback(words, "crane", adversary)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_lookahead_5(self):
+        """GameContext: sessions use the context's adversary"""
+        adversary = LookaheadAdversary()
+        session = GameSession(GameContext(self.words, adversary=adversary))
+        session.guess("angle")
+        self.assertGreater(adversary.nodes, 0)
+
+    def test_lookahead_6(self):
+        """deadline: a passed deadline returns the greedy answer and is counted"""
+        adversary = LookaheadAdversary(depth=3)
+        for guess in ("angle", "chant"):
+            self.assertEqual(
+                get_feedback(self.words, guess, adversary, deadline=time.perf_counter() - 1),
+                get_feedback(self.words, guess),
+            )
+        self.assertEqual(adversary.decisions, 2)
+        self.assertEqual(adversary.deadline_hits, 2)
+        self.assertEqual(adversary.depths_reached[0], 2)
+
+    def test_lookahead_7(self):
+        """deadline: without pressure every level is finished"""
+        adversary = LookaheadAdversary(depth=2, node_budget=10**6, time_budget=10)
+        get_feedback(self.words, "angle", adversary, deadline=time.perf_counter() + 10)
+        self.assertEqual(adversary.deadline_hits, 0)
+        self.assertEqual(adversary.depths_reached[2], 1)
+
+    def test_lookahead_8(self):
+        """GameContext: lookahead answers are not cached, hard mode restore does not replay"""
+        adversary = LookaheadAdversary()
+        context = GameContext(self.words, adversary=adversary)
+        session = GameSession(context, hard_mode=True)
+        session.guess("angle")
+        session.guess(context.hard_mode_validator.legal_guesses(session.constraints)[0])
+        self.assertEqual(len(context.cache), 0)
+
+        decisions = adversary.decisions
+        restored = GameSession.restore(context, session.snapshot())
+        self.assertEqual(adversary.decisions, decisions)
+        self.assertEqual(restored.constraints.greens, session.constraints.greens)
+        self.assertEqual(restored.constraints.min_counts, session.constraints.min_counts)
+
+    def test_estimate_1(self):
+        """estimate_guesses: one word needs one guess, bigger families need more"""
+        self.assertEqual(estimate_guesses(1), 1)
+        self.assertLess(estimate_guesses(2), estimate_guesses(50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Multi-Board Test Suite"""
+
+import unittest
+from unittest.mock import patch
+
+import wordle_multiboard
+from evil_wordle import get_feedback
+from wordle_multiboard import MultiBoardGame, get_board_feedback, split_pools
+from wordle_session import LOST, PLAYING, WON, load_words
+
+
+class TestMultiBoard(unittest.TestCase):
+    """get_board_feedback and MultiBoardGame Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+
+    def test_multiboard_1(self):
+        """get_board_feedback: every board gets what get_feedback gives its pool"""
+        pools = split_pools(self.words, 4) + [self.words[::3]]
+        for guessed_word in ["stone", "chant", "eagle", "geese"]:
+            expected = [get_feedback(pool, guessed_word) for pool in pools]
+            results = get_board_feedback(pools, guessed_word)
+            self.assertEqual(
+                [(list(colors), words) for colors, words in results],
+                [(list(colors), words) for colors, words in expected],
+            )
+
+    def test_multiboard_2(self):
+        """get_board_feedback: the codes of a guess are computed in one call for all boards"""
+        pools = split_pools(self.words, 4)
+        with patch.object(
+            wordle_multiboard,
+            "get_feedback_codes",
+            wraps=wordle_multiboard.get_feedback_codes,
+        ) as codes:
+            get_board_feedback(pools, "stone")
+        self.assertEqual(codes.call_count, 1)
+        self.assertEqual(len(codes.call_args.args[0]), len(self.words))
+
+    def test_multiboard_3(self):
+        """MultiBoardGame: solved boards stop playing and solving every board wins"""
+        game = MultiBoardGame(["bread", "stone"], num_boards=2)
+        self.assertEqual(game.pools, [["bread"], ["stone"]])
+        feedback = game.guess("stone")
+        self.assertIsNotNone(feedback[0])
+        self.assertEqual(game.solved, [None, 1])
+        self.assertEqual(game.status, PLAYING)
+        feedback = game.guess("bread")
+        self.assertIsNone(feedback[1])
+        self.assertEqual(game.solved, [2, 1])
+        self.assertEqual(game.status, WON)
+        with self.assertRaises(ValueError):
+            game.guess("bread")
+
+    def test_multiboard_4(self):
+        """MultiBoardGame: invalid guesses are rejected, running out of attempts loses"""
+        game = MultiBoardGame(self.words, attempts=2)
+        with self.assertRaises(ValueError):
+            game.guess("zzzzz")
+        self.assertEqual(game.attempt, 1)
+        game.guess("stone")
+        game.guess("chant")
+        self.assertEqual(game.status, LOST)
+        secret_words = game.secret_words()
+        self.assertEqual(len(secret_words), 4)
+        for secret_word, pool in zip(secret_words, game.pools):
+            self.assertIn(secret_word, pool)
+        self.assertNotEqual(game.keyboard.codes(), "." * 26)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Sampling Adversary Test Suite"""
+
+import unittest
+
+from evil_wordle import get_feedback, partition_by_pattern
+from wordle_sampling import SamplingAdversary, benchmark, pattern_regex, sample_size
+from wordle_session import load_words
+from wordle_store import WordStore, WordView
+
+
+class TestSamplingAdversary(unittest.TestCase):
+    """pattern_regex and SamplingAdversary Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+
+    def test_sampling_1(self):
+        """pattern_regex: matches exactly the family of each pattern, repeated letters included"""
+        text = "\n".join(self.words)
+        for guessed_word in self.words + ["geese", "eerie", "llama"]:
+            for code, family in partition_by_pattern(self.words, guessed_word).items():
+                self.assertEqual(pattern_regex(guessed_word, code).findall(text), family)
+
+    def test_sampling_2(self):
+        """sample_size: grows with the confidence and shrinks with the margin"""
+        self.assertEqual(sample_size(0.95, 0.02), 2401)
+        self.assertGreater(sample_size(0.99, 0.02), sample_size(0.95, 0.02))
+        self.assertLess(sample_size(0.95, 0.05), sample_size(0.95, 0.02))
+        with self.assertRaises(ValueError):
+            SamplingAdversary(confidence=1)
+
+    def test_sampling_3(self):
+        """SamplingAdversary: small pools are answered exactly like get_feedback"""
+        adversary = SamplingAdversary()
+        for guessed_word in ["stone", "chant", "eagle"]:
+            self.assertEqual(
+                get_feedback(self.words, guessed_word, adversary),
+                get_feedback(self.words, guessed_word),
+            )
+        self.assertEqual(adversary.sampled, 0)
+
+    def test_sampling_4(self):
+        """SamplingAdversary: a sampled answer is a whole family and is repeatable"""
+        adversary = SamplingAdversary(confidence=0.8, margin=0.2, min_pool_factor=1)
+        store = WordStore(self.words)
+        for guessed_word in ["stone", "chant", "eagle", "geese"]:
+            colors, words = get_feedback(self.words, guessed_word, adversary)
+            families = partition_by_pattern(self.words, guessed_word)
+            self.assertIn(words, families.values())
+            for word in words:
+                self.assertEqual(get_feedback([word], guessed_word)[0], colors)
+            self.assertEqual(get_feedback(self.words, guessed_word, adversary), (colors, words))
+            view_colors, view = get_feedback(store, guessed_word, adversary)
+            self.assertIsInstance(view, WordView)
+            self.assertEqual((view_colors, view), (colors, words))
+        self.assertEqual(adversary.sampled, adversary.decisions)
+
+    def test_sampling_5(self):
+        """benchmark: a sample of the whole pool keeps the exact family"""
+        adversary = SamplingAdversary(confidence=0.8, margin=0.1, min_pool_factor=1)
+        adversary.samples = len(self.words)
+        result = benchmark(self.words, self.words[:5], adversary)
+        self.assertEqual(result["same_family"], 1)
+        self.assertEqual(result["size_ratio"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,317 @@
+"""Game Session and Server Test Suite"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from evil_wordle import CORRECT_COLOR, NO_COLOR
+from wordle_session import (
+    GameContext,
+    GameContexts,
+    GameSession,
+    SessionManager,
+    WON,
+    LOST,
+    PLAYING,
+)
+from wordle_server import GameServer
+
+
+def make_context():
+    """Returns a context over the small debug dictionary."""
+    return GameContext.from_file("test_guesses.txt")
+
+
+class TestGameSession(unittest.TestCase):
+    """GameSession Tests"""
+
+    def test_session_1(self):
+        """GameSession: invalid guesses raise ValueError and do not use an attempt"""
+        session = GameSession(make_context())
+        with self.assertRaises(ValueError):
+            session.guess("zzzzz")
+        self.assertEqual(session.attempt, 1)
+        self.assertEqual(session.history, ())
+
+    def test_session_2(self):
+        """GameSession: a guess updates history, keyboard and attempt"""
+        session = GameSession(make_context())
+        feedback = session.guess("angle")
+        self.assertEqual(len(feedback), 5)
+        self.assertEqual(session.history, ("angle",))
+        self.assertNotEqual(session.keyboard.colors["a"], NO_COLOR)
+        self.assertIn(session.status, (PLAYING, WON))
+
+    def test_session_3(self):
+        """GameSession: running out of attempts loses the game"""
+        session = GameSession(make_context(), attempts=2)
+        session.guess("angle")
+        if session.status == PLAYING:
+            session.guess("chant")
+        self.assertIn(session.status, (WON, LOST))
+        with self.assertRaises(ValueError):
+            session.guess("stone")
+
+    def test_session_4(self):
+        """GameSession: sessions with the same history share the cached result"""
+        context = make_context()
+        first, second = GameSession(context), GameSession(context)
+        first.guess("angle")
+        second.guess("angle")
+        self.assertIs(first.secret_words, second.secret_words)
+        self.assertEqual(context.cache.hits, 1)
+
+    def test_session_5(self):
+        """GameSession: attempts must be between 2 and 99"""
+        with self.assertRaises(ValueError):
+            GameSession(make_context(), attempts=1)
+
+    def test_session_6(self):
+        """GameSession: keyboard_codes lists 26 letters alphabetically"""
+        session = GameSession(make_context())
+        session.keyboard.colors["b"] = CORRECT_COLOR
+        self.assertEqual(session.keyboard_codes(), "." + "G" + "." * 24)
+
+
+class TestSessionSnapshot(unittest.TestCase):
+    """GameSession snapshot and restore Tests"""
+
+    def assert_same_state(self, session, restored):
+        """Helper method to compare every piece of state of two sessions"""
+        self.assertEqual(restored.attempts, session.attempts)
+        self.assertEqual(restored.attempt, session.attempt)
+        self.assertEqual(restored.status, session.status)
+        self.assertEqual(restored.history, session.history)
+        self.assertEqual(restored.keyboard.colors, session.keyboard.colors)
+        self.assertEqual(list(restored.secret_words), list(session.secret_words))
+
+    def test_snapshot_1(self):
+        """snapshot(): a new game round trips"""
+        context = make_context()
+        session = GameSession(context, attempts=9)
+        restored = GameSession.restore(context, session.snapshot())
+        self.assert_same_state(session, restored)
+
+    def test_snapshot_2(self):
+        """snapshot(): a game in progress round trips"""
+        context = make_context()
+        session = GameSession(context)
+        session.guess("angle")
+        session.guess("chant")
+        restored = GameSession.restore(context, session.snapshot())
+        self.assert_same_state(session, restored)
+
+    def test_snapshot_3(self):
+        """snapshot(): small and large pools use the delta list and the bitset"""
+        context = GameContext([f"{chr(97 + i // 26)}{chr(97 + i % 26)}xyz" for i in range(400)])
+        session = GameSession(context)
+        for pool in (context.valid_guesses[5:8], context.valid_guesses[::2]):
+            session.secret_words = pool
+            blob = session.snapshot()
+            self.assertLess(len(blob), 80)
+            restored = GameSession.restore(context, blob)
+            self.assertEqual(restored.secret_words, pool)
+
+    def test_snapshot_4(self):
+        """restore(): unknown versions raise ValueError"""
+        context = make_context()
+        blob = bytearray(GameSession(context).snapshot())
+        blob[0] = 99
+        with self.assertRaises(ValueError):
+            GameSession.restore(context, bytes(blob))
+
+
+class TestGameContexts(unittest.TestCase):
+    """GameContexts Tests"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.word_files = {}
+        for num_letters, words in ((4, ["late", "tale", "teal", "rate"]),
+                                   (6, ["letter", "rattle", "settle", "litter"])):
+            file_name = os.path.join(self.directory.name, f"words{num_letters}.txt")
+            with open(file_name, "w", encoding="ascii") as words_file:
+                words_file.write("\n".join(words) + "\n")
+            self.word_files[num_letters] = file_name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_contexts_1(self):
+        """get: dictionaries are loaded on first use and then shared"""
+        contexts = GameContexts(self.word_files)
+        self.assertEqual(contexts.lengths, [4, 6])
+        self.assertEqual(contexts.loaded(), [])
+        context = contexts.get(6)
+        self.assertEqual(context.num_letters, 6)
+        self.assertIs(contexts.get(6), context)
+        self.assertEqual(contexts.loaded(), [6])
+        with self.assertRaises(ValueError):
+            contexts.get(7)
+
+    def test_contexts_2(self):
+        """GameContext: words of mixed or unsupported lengths raise ValueError"""
+        with self.assertRaises(ValueError):
+            GameContext(["late", "rattle"])
+        with self.assertRaises(ValueError):
+            GameContext(["abc", "def"])
+
+    def test_contexts_3(self):
+        """GameServer: NEW with LETTERS plays and hints words of that length"""
+        manager = SessionManager(make_context(), GameContexts(self.word_files))
+        server = GameServer(manager)
+        self.assertEqual(server.handle_line("NEW 3 HARD LETTERS=4"), "OK 1 3")
+        self.assertEqual(manager.get(1).context.num_letters, 4)
+        self.assertIsNotNone(manager.get(1).constraints)
+        response = server.handle_line("GUESS 1 late").split()
+        self.assertEqual(len(response[2]), 4)
+        hint = server.handle_line("HINT 1").split()[2]
+        self.assertIn(hint, manager.get(1).context.valid_set)
+        self.assertEqual(server.handle_line("NEW"), "OK 2 6")
+        self.assertEqual(manager.get(2).context, manager.context)
+        self.assertTrue(server.handle_line("NEW LETTERS=7").startswith("ERR"))
+        self.assertTrue(server.handle_line("NEW LETTERS=x").startswith("ERR"))
+        self.assertEqual(manager.contexts.loaded(), [4, 5])
+
+
+class TestGameServer(unittest.TestCase):
+    """GameServer Protocol Tests"""
+
+    def setUp(self):
+        self.server = GameServer(SessionManager(make_context()))
+
+    def test_protocol_1(self):
+        """handle_line: NEW, GUESS, STATE and END"""
+        self.assertEqual(self.server.handle_line("NEW 3"), "OK 1 3")
+        response = self.server.handle_line("GUESS 1 angle").split()
+        self.assertEqual(response[:2], ["FEEDBACK", "1"])
+        self.assertEqual(len(response[2]), 5)
+        state = self.server.handle_line("STATE 1").split()
+        self.assertEqual(state[0], "STATE")
+        self.assertEqual(len(state[6]), 26)
+        self.assertEqual(self.server.handle_line("END 1"), "OK 1")
+        self.assertEqual(self.server.handle_line("STATE 1"), "ERR no such session")
+
+    def test_protocol_2(self):
+        """handle_line: malformed requests are answered with ERR"""
+        self.assertTrue(self.server.handle_line("").startswith("ERR"))
+        self.assertTrue(self.server.handle_line("FLY").startswith("ERR"))
+        self.assertTrue(self.server.handle_line("GUESS x angle").startswith("ERR"))
+        self.assertTrue(self.server.handle_line("NEW 1").startswith("ERR"))
+        self.server.handle_line("NEW")
+        self.assertTrue(self.server.handle_line("GUESS 1 zzzzz").startswith("ERR"))
+
+    def test_protocol_4(self):
+        """handle_line: HINT suggests a valid guess"""
+        self.server.handle_line("NEW")
+        response = self.server.handle_line("HINT 1").split()
+        self.assertEqual(response[:2], ["HINT", "1"])
+        self.assertIn(response[2], self.server.manager.context.valid_set)
+
+    def test_protocol_7(self):
+        """handle_line: HINT in a hard mode game suggests a guess hard mode accepts"""
+        self.server.handle_line("NEW HARD")
+        session = self.server.manager.get(1)
+        validator = session.context.hard_mode_validator
+        self.server.handle_line("GUESS 1 train")
+        hint = self.server.handle_line("HINT 1").split()[2]
+        self.assertTrue(validator.allows(hint, session.constraints))
+        self.assertTrue(self.server.handle_line(f"GUESS 1 {hint}").startswith("FEEDBACK"))
+
+    def test_protocol_3(self):
+        """GameServer: serves a game over a TCP connection"""
+
+        async def play():
+            listener = await self.server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            lines = []
+            for request in (b"NEW\n", b"GUESS 1 angle\n", b"QUIT\n"):
+                writer.write(request)
+                await writer.drain()
+                lines.append((await reader.readline()).decode().strip())
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return lines
+
+        lines = asyncio.run(play())
+        self.assertEqual(lines[0], "OK 1 6")
+        self.assertTrue(lines[1].startswith("FEEDBACK 1 "))
+        self.assertEqual(lines[2], "BYE")
+
+    def test_protocol_5(self):
+        """GameServer: a slow HINT does not hold up other connections"""
+
+        class SlowHints:
+            """Stands in for a HintEngine that takes a while"""
+
+            def hint(self, remaining_secret_words, legal_guesses=None):
+                time.sleep(0.3)
+                return remaining_secret_words[0], 1, 0.0
+
+        server = GameServer(SessionManager(make_context()), SlowHints())
+
+        async def play():
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            first = await asyncio.open_connection("127.0.0.1", port)
+            second = await asyncio.open_connection("127.0.0.1", port)
+            lines = []
+
+            async def request(connection, line):
+                reader, writer = connection
+                writer.write(line)
+                await writer.drain()
+                lines.append((await reader.readline()).decode().strip())
+
+            await request(first, b"NEW\n")
+            hint = asyncio.create_task(request(first, b"HINT 1\n"))
+            await asyncio.sleep(0.05)
+            await request(second, b"STATE 1\n")
+            await hint
+            for _, writer in (first, second):
+                writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return lines
+
+        lines = asyncio.run(play())
+        self.assertTrue(server.is_slow("hint 1"))
+        self.assertFalse(server.is_slow("GUESS 1 angle"))
+        self.assertEqual(lines[1].split()[0], "STATE")
+        self.assertEqual(lines[2].split()[0], "HINT")
+
+    def test_protocol_6(self):
+        """GameServer: non-ascii and failing requests get ERR and keep the connection open"""
+
+        def broken(args):
+            raise RuntimeError("boom")
+
+        self.server._do_broken = broken
+        self.assertEqual(self.server.handle_line("\ufffd\ufffd 1"), "ERR requests must be ascii")
+
+        async def play():
+            listener = await self.server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            lines = []
+            for request in (b"\xff\xfe 1\n", b"BROKEN\n", b"NEW\n"):
+                writer.write(request)
+                await writer.drain()
+                lines.append((await reader.readline()).decode().strip())
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return lines
+
+        lines = asyncio.run(play())
+        self.assertEqual(lines[0], "ERR requests must be ascii")
+        self.assertEqual(lines[1], "ERR internal error (RuntimeError)")
+        self.assertEqual(lines[2], "OK 1 6")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Adversary Simulation Test Suite"""
+
+import random
+import unittest
+from multiprocessing import get_context
+from unittest.mock import patch
+
+from wordle_session import GameContext
+from wordle_simulate import (
+    fixed_strategy,
+    greedy_strategy,
+    play_game,
+    random_strategy,
+    simulate,
+    worst_family_size,
+)
+
+
+class TestSimulate(unittest.TestCase):
+    """Simulation Tests"""
+
+    def setUp(self):
+        self.context = GameContext.from_file("test_guesses.txt")
+
+    def test_worst_family_size_1(self):
+        """worst_family_size: largest family of 'broad' against bread, break, bream"""
+        self.assertEqual(worst_family_size(["bread", "break", "bream"], "broad"), 2)
+
+    def test_play_game_1(self):
+        """play_game: every strategy wins the small dictionary"""
+        rng = random.Random(0)
+        for strategy in (greedy_strategy, random_strategy, fixed_strategy(["chant"])):
+            length = play_game(self.context, "angle", strategy, rng)
+            self.assertIsNotNone(length)
+            self.assertGreaterEqual(length, 2)
+
+    def test_simulate_1(self):
+        """simulate: one result per start, the same with a process pool"""
+        starts = self.context.valid_guesses[:8]
+        serial = simulate(starts, "test_guesses.txt", "random", seed=3)
+        parallel = simulate(starts, "test_guesses.txt", "random", processes=2, seed=3)
+        self.assertEqual(sorted(serial), sorted(starts))
+        self.assertEqual(serial, parallel)
+
+    def test_simulate_2(self):
+        """simulate: workers load the dictionary themselves, so spawned processes work too"""
+        starts = self.context.valid_guesses[:4]
+        expected = simulate(starts, "test_guesses.txt", "greedy")
+        with patch("wordle_simulate.Pool", get_context("spawn").Pool):
+            spawned = simulate(starts, "test_guesses.txt", "greedy", processes=2)
+        self.assertEqual(spawned, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Speculative Feedback Test Suite"""
+
+import subprocess
+import sys
+import unittest
+
+from evil_wordle import get_feedback
+from wordle_session import load_words
+from wordle_speculate import SpeculativeFeedback
+
+
+class TestSpeculativeFeedback(unittest.TestCase):
+    """SpeculativeFeedback Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+
+    def test_speculate_1(self):
+        """feedback: precomputed openers are cache hits with get_feedback's answer"""
+        speculator = SpeculativeFeedback(self.words, openers=("stone", "zzzzz"), max_guesses=5)
+        self.assertEqual(speculator.openers, ["stone"])
+        speculator.speculate(self.words)
+        speculator.wait()
+        self.assertEqual(len(speculator.cache), 5)
+        self.assertEqual(
+            speculator.feedback(self.words, "stone"), get_feedback(self.words, "stone")
+        )
+        self.assertEqual((speculator.hits, speculator.misses), (1, 0))
+
+    def test_speculate_2(self):
+        """feedback: guesses of an earlier turn are not reused for the next pool"""
+        speculator = SpeculativeFeedback(self.words, openers=("stone",), max_guesses=3)
+        speculator.speculate(self.words)
+        _, secret_words = speculator.feedback(self.words, "stone")
+        speculator.speculate(secret_words)
+        speculator.wait()
+        for guess in self.words[:10]:
+            self.assertEqual(
+                speculator.feedback(secret_words, guess), get_feedback(secret_words, guess)
+            )
+        self.assertEqual(speculator.hits + speculator.misses, 11)
+        speculator.close()
+
+        # A pool that was not speculated on is never answered from the cache
+        misses = speculator.misses
+        speculator.feedback(self.words, secret_words[0])
+        self.assertEqual(speculator.misses, misses + 1)
+
+    def test_speculate_3(self):
+        """main: the speculate argument does not change the output"""
+        with open("functional_tests/sages.in", "rb") as transcript:
+            output = subprocess.run(
+                [sys.executable, "evil_wordle.py", "speculate"],
+                stdin=transcript,
+                capture_output=True,
+                check=True,
+            ).stdout
+        with open("functional_tests/expected_default_outputs/sages.ansi", "rb") as expected:
+            self.assertEqual(output, expected.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
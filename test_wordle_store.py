@@ -0,0 +1,59 @@
+"""Word Store Test Suite"""
+
+import unittest
+
+from evil_wordle import get_feedback
+from wordle_session import load_words
+from wordle_store import WordStore, WordView
+
+
+class TestWordStore(unittest.TestCase):
+    """WordStore and WordView Tests"""
+
+    def setUp(self):
+        self.words = load_words("test_guesses.txt")
+        self.store = WordStore(self.words)
+
+    def test_store_1(self):
+        """WordStore: behaves like the list it was built from"""
+        self.assertEqual(len(self.store), len(self.words))
+        self.assertEqual(list(self.store), self.words)
+        self.assertEqual(self.store[3], self.words[3])
+        self.assertEqual(self.store[-1], self.words[-1])
+        with self.assertRaises(IndexError):
+            self.store[len(self.words)]
+        with self.assertRaises(IndexError):
+            self.store[-len(self.words) - 1]
+        self.assertEqual(self.store[5:9], self.words[5:9])
+        self.assertIn("stone", self.store)
+        self.assertNotIn("zzzzz", self.store)
+        self.assertNotIn("Stone", self.store)
+        self.assertNotIn("st0ne", self.store)
+        self.assertNotIn("ab-de", self.store)
+        self.assertIsNone(self.store.position("ab1de"))
+        self.assertEqual(self.store.position("stone"), self.words.index("stone"))
+        self.assertEqual(bytes(self.store.word_bytes(2, 4)), "".join(self.words[2:4]).encode())
+
+    def test_store_2(self):
+        """WordView: take and slicing share the store"""
+        view = self.store.take([4, 1, 7])
+        self.assertEqual(view, [self.words[4], self.words[1], self.words[7]])
+        self.assertIs(view[1:].store, self.store)
+        self.assertEqual(view[1:], [self.words[1], self.words[7]])
+        self.assertEqual(view.take([2, 0]), [self.words[7], self.words[4]])
+        self.assertNotEqual(view, "abc")
+
+    def test_store_3(self):
+        """get_feedback: a store or view pool gives the same answer as a list, as a view"""
+        list_pool = self.words
+        view_pool = self.store
+        for guessed_word in ["stone", "chant", "eagle", "apple"]:
+            list_colors, list_pool = get_feedback(list_pool, guessed_word)
+            view_colors, view_pool = get_feedback(view_pool, guessed_word)
+            self.assertIsInstance(view_pool, WordView)
+            self.assertEqual(view_colors, list_colors)
+            self.assertEqual(view_pool, list_pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
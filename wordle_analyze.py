@@ -0,0 +1,341 @@
+"""
+An offline analyzer for the exact worst case of evil wordle.
+
+The adversary of get_feedback is deterministic, so the whole game is decided by the player's
+guesses: each guess turns the remaining secret words into the hardest family for that guess. The
+worst-case number of turns of the game is the fewest guesses a perfect player needs to be sure
+to win, found here by searching that game tree:
+
+    turns(S) = 1                                        if S holds a single word
+    turns(S) = 1 + min over guesses g of turns(hardest family of S for g)
+
+Guesses that leave S unchanged can never help and are skipped, as are guesses reaching a state
+that another guess already reached. States are identified by a hash of their sorted dictionary
+indices, and the memo table stores for each state either its exact number of turns or a lower
+bound proven by a failed bounded search. The table and the result of every finished root guess
+are kept in an SQLite database so that a multi-hour run can be stopped and resumed. Root guesses
+are spread over a process pool.
+
+With a fixed list of guesses, the dictionary is first grouped into SecretClasses: words no guess
+can tell apart always stay together, so the states below the dictionary are partitioned by one
+pattern code per class instead of one per word.
+
+Usage:
+    python3 wordle_analyze.py [--words FILE] [--guesses all|secrets] [--db FILE]
+                              [--processes P] [--max-turns N]
+"""
+
+import argparse
+import hashlib
+import sqlite3
+import time
+from array import array
+from multiprocessing import Pool
+
+from evil_wordle import family_rank_key, partition_by_pattern
+from wordle_classes import SecretClasses
+from wordle_session import load_words
+
+DEFAULT_MAX_TURNS = 12
+# Classes only pay for mapping pools to class ids once they merge 15% of the dictionary
+MAX_CLASS_RATIO = 0.85
+
+_analyzer = None
+
+
+def hardest_family(secret_words, guessed_word):
+    """
+    Returns the (pattern code, words) pair get_feedback keeps for guessed_word.
+
+    pre: secret_words is a non-empty list of strings.
+    """
+    families = partition_by_pattern(secret_words, guessed_word)
+    return min(families.items(), key=lambda item: family_rank_key(*item))
+
+
+class GameTreeAnalyzer:
+    """
+    Computes the exact number of turns a perfect player needs against get_feedback.
+
+    Instance Variables:
+        valid_guesses: The dictionary, which is also the initial secret word pool.
+        guesses: The words the player may guess.
+        secrets_only: Whether the player may only guess words that could still be the secret.
+        memo: A dictionary mapping state keys to tuples (lower bound, exact turns or None).
+        new_entries: The memo keys added or improved since the last call to take_new_entries().
+        nodes: The number of states expanded.
+        classes: The SecretClasses of valid_guesses under a given list of guesses, or None when
+            there are none or they would barely shrink the dictionary.
+    """
+
+    def __init__(self, valid_guesses, guesses=None, memo=None, secrets_only=False):
+        """
+        pre: valid_guesses is a non-empty list of distinct words. guesses defaults to
+             valid_guesses.
+        """
+        self.valid_guesses = valid_guesses
+        self.guesses = guesses if guesses is not None else valid_guesses
+        self.secrets_only = secrets_only
+        self.memo = memo if memo is not None else {}
+        self.new_entries = set()
+        self.nodes = 0
+        self._index = {word: i for i, word in enumerate(valid_guesses)}
+        # With secrets_only the guesses change with every state, so no classes hold for all
+        self.classes = None
+        if guesses is not None and not secrets_only:
+            classes = SecretClasses(valid_guesses, self.guesses)
+            if len(classes) <= MAX_CLASS_RATIO * len(valid_guesses):
+                self.classes = classes
+
+    def state_key(self, secret_words):
+        """
+        Returns a canonical 16 byte hash of a pool of secret words, independent of its order.
+        """
+        indices = array("I", sorted(self._index[word] for word in secret_words))
+        return hashlib.blake2b(indices.tobytes(), digest_size=16).digest()
+
+    def children(self, secret_words):
+        """
+        Returns the distinct states the player can move to from secret_words, smallest first.
+
+        post: Returns a list of word lists, none of them equal to secret_words.
+        """
+        classes = self._pool_classes(secret_words)
+        if classes is not None:
+            return self._class_children(classes)
+
+        seen = set()
+        children = []
+        for guess in secret_words if self.secrets_only else self.guesses:
+            _, family = hardest_family(secret_words, guess)
+            if len(family) == len(secret_words):
+                continue
+            key = self.state_key(family)
+            if key not in seen:
+                seen.add(key)
+                children.append(family)
+        children.sort(key=len)
+        return children
+
+    def _pool_classes(self, secret_words):
+        """Returns the class ids of secret_words if it is a union of classes, None otherwise."""
+        if self.classes is None:
+            return None
+        classes = self.classes.classes_of(secret_words)
+        if self.classes.weight(classes) != len(secret_words):
+            return None
+        return classes
+
+    def _class_children(self, classes):
+        """children() for a pool given as class ids, only turning new states into words."""
+        seen = set()
+        children = []
+        for guess in self.guesses:
+            _, family = self.classes.hardest_family(classes, guess)
+            if len(family) == len(classes):
+                continue
+            family = tuple(family)
+            if family not in seen:
+                seen.add(family)
+                children.append(self.classes.words(family))
+        children.sort(key=len)
+        return children
+
+    def _remember(self, key, lower, exact):
+        self.memo[key] = (lower, exact)
+        self.new_entries.add(key)
+
+    def turns(self, secret_words, limit):
+        """
+        Returns the number of turns needed from secret_words if it is at most limit, or a lower
+        bound greater than limit otherwise.
+
+        pre: secret_words is a non-empty list of words and limit >= 1.
+        """
+        if len(secret_words) == 1:
+            return 1
+        key = self.state_key(secret_words)
+        lower, exact = self.memo.get(key, (2, None))
+        if exact is not None:
+            return exact
+        if lower > limit:
+            return lower
+
+        self.nodes += 1
+        best = limit + 1
+        for child in self.children(secret_words):
+            # Only a child solvable in best - 2 turns can improve on best
+            child_turns = self.turns(child, best - 2) if best > 2 else 2
+            if 1 + child_turns < best:
+                best = 1 + child_turns
+                if best == lower:
+                    break
+
+        if best <= limit:
+            self._remember(key, best, best)
+            return best
+        self._remember(key, limit + 1, None)
+        return limit + 1
+
+    def solve(self, secret_words, max_turns):
+        """
+        Finds the exact number of turns with iterative deepening.
+
+        post: Returns the number of turns, or None if it is more than max_turns.
+        """
+        for limit in range(1, max_turns + 1):
+            result = self.turns(secret_words, limit)
+            if result <= limit:
+                return result
+        return None
+
+    def take_new_entries(self):
+        """Returns the memo entries changed since the last call as a dictionary."""
+        entries = {key: self.memo[key] for key in self.new_entries}
+        self.new_entries = set()
+        return entries
+
+
+class MemoStore:
+    """
+    The SQLite database holding the memo table and the finished root guesses of a run.
+    """
+
+    def __init__(self, file_name):
+        self.connection = sqlite3.connect(file_name)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS memo (
+                state BLOB PRIMARY KEY, lower INTEGER NOT NULL, exact INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS roots (guess TEXT PRIMARY KEY, turns INTEGER);
+            """
+        )
+
+    def load_memo(self):
+        """Returns the stored memo table as a dictionary."""
+        rows = self.connection.execute("SELECT state, lower, exact FROM memo")
+        return {state: (lower, exact) for state, lower, exact in rows}
+
+    def load_roots(self):
+        """Returns a dictionary mapping finished root guesses to their turns (None if too many)."""
+        return dict(self.connection.execute("SELECT guess, turns FROM roots"))
+
+    def checkpoint(self, guess, turns, entries):
+        """Stores the result of one root guess and the memo entries it produced."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO memo (state, lower, exact) VALUES (?, ?, ?) "
+                "ON CONFLICT(state) DO UPDATE SET "
+                "lower = MAX(lower, excluded.lower), exact = COALESCE(exact, excluded.exact)",
+                [(state, lower, exact) for state, (lower, exact) in entries.items()],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO roots (guess, turns) VALUES (?, ?)", (guess, turns)
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+def _init_worker(valid_guesses, guesses, memo, secrets_only):
+    global _analyzer
+    _analyzer = GameTreeAnalyzer(valid_guesses, guesses, memo, secrets_only)
+
+
+def _solve_root(job):
+    guess, max_turns = job
+    _, family = hardest_family(_analyzer.valid_guesses, guess)
+    if len(family) == len(_analyzer.valid_guesses):
+        turns = None
+    elif len(family) == 1 and family[0] == guess:
+        turns = 1
+    else:
+        child_turns = _analyzer.solve(family, max_turns - 1)
+        turns = None if child_turns is None else child_turns + 1
+    return guess, turns, _analyzer.take_new_entries()
+
+
+def analyze(valid_guesses, guesses=None, db_file=None, processes=1,
+            max_turns=DEFAULT_MAX_TURNS, progress=None, secrets_only=False):
+    """
+    Computes the worst-case number of turns of the game for every root guess.
+
+    pre: valid_guesses is a non-empty list of distinct words. A db_file is only reused with the
+         same dictionary, guesses and secrets_only setting.
+    post: Returns a dictionary mapping each root guess to the turns a perfect player needs after
+          opening with it (None if more than max_turns). With db_file, results and memo entries
+          are checkpointed after every root guess and earlier results are reused. progress, if
+          given, is called with (done, total, guess, turns) after every root guess.
+    """
+    guesses = guesses if guesses is not None else valid_guesses
+    store = MemoStore(db_file) if db_file is not None else None
+    memo = store.load_memo() if store is not None else {}
+    results = store.load_roots() if store is not None else {}
+    jobs = [(guess, max_turns) for guess in guesses if guess not in results]
+
+    def record(outcome):
+        guess, turns, entries = outcome
+        results[guess] = turns
+        if store is not None:
+            store.checkpoint(guess, turns, entries)
+        if progress is not None:
+            progress(len(results), len(guesses), guess, turns)
+
+    try:
+        if processes == 1:
+            _init_worker(valid_guesses, guesses, memo, secrets_only)
+            for job in jobs:
+                record(_solve_root(job))
+        else:
+            init_args = (valid_guesses, guesses, memo, secrets_only)
+            with Pool(processes, _init_worker, init_args) as pool:
+                for outcome in pool.imap_unordered(_solve_root, jobs):
+                    record(outcome)
+    finally:
+        if store is not None:
+            store.close()
+    return results
+
+
+def main():
+    """Parses the command line, runs the analysis and prints the result."""
+    parser = argparse.ArgumentParser(description="Exact worst case of evil wordle")
+    parser.add_argument("--words", default="valid_guesses.txt")
+    parser.add_argument("--guesses", choices=("all", "secrets"), default="all",
+                        help="'secrets' only guesses words that could still be the secret")
+    parser.add_argument("--db", default=None, help="SQLite file for the memo and checkpoints")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    args = parser.parse_args()
+
+    valid_guesses = load_words(args.words)
+    start = time.perf_counter()
+
+    def progress(done, total, guess, turns):
+        elapsed = time.perf_counter() - start
+        shown = turns if turns is not None else f">{args.max_turns}"
+        print(f"[{done}/{total} {elapsed:.0f}s] {guess}: {shown}", flush=True)
+
+    results = analyze(
+        valid_guesses,
+        None,
+        args.db,
+        args.processes,
+        args.max_turns,
+        progress,
+        args.guesses == "secrets",
+    )
+
+    solved = {guess: turns for guess, turns in results.items() if turns is not None}
+    if not solved:
+        print(f"No opening wins within {args.max_turns} turns.")
+        return
+    best = min(solved.values())
+    openers = sorted(guess for guess, turns in solved.items() if turns == best)
+    print(f"Worst case with perfect play: {best} turns")
+    print("Best openers: " + " ".join(openers[:20]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Headless batch replay of evil wordle transcripts.
+
+A transcript is a text file with one input line per line, the same files main() reads from
+standard input in the functional tests. replay() produces exactly the output main() prints for a
+transcript, but loads the dictionary and the feedback cache once for every transcript of the
+batch instead of once per game. Batches can be spread over a process pool, in which case every
+worker loads its own copy once.
+
+Usage:
+    python3 wordle_batch.py [--words FILE] [--attempts N] [--processes P]
+                            [--outcomes | --output-dir DIR] TRANSCRIPT...
+"""
+
+import argparse
+import contextlib
+import io
+import os
+from multiprocessing import Pool
+
+from evil_wordle import (
+    CORRECT_COLOR,
+    INVALID_INPUT,
+    NO_COLOR,
+    get_attempt_label,
+    print_explanation,
+    render_feedback,
+    render_turn,
+)
+from wordle_session import DEFAULT_ATTEMPTS, LOST, PLAYING, WON, GameContext, GameSession
+
+INCOMPLETE = "incomplete"
+
+_explanations = {}
+_worker_context = None
+
+
+def explanation(attempts):
+    """
+    Returns the text print_explanation(attempts) prints, computed once per attempts value.
+    """
+    text = _explanations.get(attempts)
+    if text is None:
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            print_explanation(attempts)
+        text = _explanations[attempts] = buffer.getvalue()
+    return text
+
+
+def replay(context, inputs, attempts=DEFAULT_ATTEMPTS, render=True):
+    """
+    Plays one game from a list of input lines.
+
+    The output is what main() prints when the same lines are typed in, including the echoed
+    guesses. If the inputs run out before the game is over, main() would stop with an EOFError;
+    replay() stops there too and reports the game as INCOMPLETE.
+
+    pre: context is a GameContext and inputs is a list of strings.
+    post: Returns a tuple (output, outcome) where output is the printed text, or None when
+          render is False, and outcome is a tuple (status, guesses used, secret word or None).
+    """
+    session = GameSession(context, attempts)
+    parts = [explanation(attempts)] if render else None
+    lines = iter(inputs)
+
+    while session.status == PLAYING:
+        guess = next(lines, None)
+        if guess is None:
+            break
+        if render:
+            prompt = f"Enter your {get_attempt_label(session.attempt)} guess: "
+            parts.append(f"{prompt}{guess}\n")
+        try:
+            feedback_colors = session.guess(guess)
+        except ValueError:
+            if render:
+                parts.append(INVALID_INPUT + "\n")
+            continue
+        if render:
+            feedback = render_feedback(feedback_colors, guess)
+            parts.append(render_turn(prompt, feedback, session.keyboard))
+            if session.status == WON:
+                parts.append(
+                    f"Congratulations! You guessed the word '{feedback}' correctly.\n"
+                )
+
+    secret_word = None
+    status = session.status
+    if status == WON:
+        secret_word = session.history[-1]
+    elif status == LOST:
+        secret_word = session.secret_word()
+        if render:
+            formatted_secret_word = "".join(
+                [CORRECT_COLOR + c + NO_COLOR for c in secret_word]
+            )
+            parts.append(
+                "Sorry, you've run out of attempts. The correct word was "
+                f"'{formatted_secret_word}'.\n"
+            )
+    else:
+        status = INCOMPLETE
+
+    output = "".join(parts) if render else None
+    return output, (status, len(session.history), secret_word)
+
+
+def read_transcript(file_name):
+    """Returns the input lines of a transcript file."""
+    with open(file_name, "r", encoding="ascii") as transcript:
+        return transcript.read().splitlines()
+
+
+def _init_worker(words_file):
+    global _worker_context
+    _worker_context = GameContext.from_file(words_file)
+
+
+def _replay_file(job):
+    file_name, attempts, render = job
+    output, outcome = replay(_worker_context, read_transcript(file_name), attempts, render)
+    return file_name, output, outcome
+
+
+def replay_files(file_names, words_file="valid_guesses.txt", attempts=DEFAULT_ATTEMPTS,
+                 render=True, processes=1):
+    """
+    Replays every transcript file, in this process or over a process pool.
+
+    pre: file_names is a list of transcript paths and processes is a positive integer.
+    post: Yields (file name, output, outcome) tuples in the order of file_names, see replay().
+    """
+    jobs = [(file_name, attempts, render) for file_name in file_names]
+    if processes == 1:
+        _init_worker(words_file)
+        yield from map(_replay_file, jobs)
+        return
+    with Pool(processes, initializer=_init_worker, initargs=(words_file,)) as pool:
+        yield from pool.imap(_replay_file, jobs, chunksize=max(1, len(jobs) // (processes * 8)))
+
+
+def main():
+    """Parses the command line and replays the given transcripts."""
+    parser = argparse.ArgumentParser(description="Replay evil wordle transcripts in batch")
+    parser.add_argument("transcripts", nargs="+")
+    parser.add_argument("--words", default="valid_guesses.txt")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS)
+    parser.add_argument("--processes", type=int, default=1)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--outcomes", action="store_true", help="only print final outcomes")
+    mode.add_argument("--output-dir", default=None, help="write NAME.ansi files here")
+    args = parser.parse_args()
+
+    results = replay_files(
+        args.transcripts, args.words, args.attempts, not args.outcomes, args.processes
+    )
+    for file_name, output, (status, turns, secret_word) in results:
+        if args.outcomes:
+            print(f"{file_name}\t{status}\t{turns}\t{secret_word or '-'}")
+        elif args.output_dir is not None:
+            name = os.path.splitext(os.path.basename(file_name))[0]
+            with open(
+                os.path.join(args.output_dir, f"{name}.ansi"), "w", encoding="UTF-8"
+            ) as outfile:
+                outfile.write(output)
+        else:
+            print(output, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Equivalence classes of secret words for a fixed set of guesses.
+
+Two secret words are equivalent for a set of guesses when every guess of the set gives both the
+same feedback. The adversary can then never separate them: every family of every guess holds
+both or neither, so a pool reached by playing those guesses is always a union of classes. A
+player limited to a small guess set (a hard mode position, a candidate list, an analytics run
+over a few openers) leaves large classes, e.g. every _ills word stays together as long as no
+guess tests b, f, g, h, ...
+
+SecretClasses groups the secret words once by refining one class per guess, recomputing codes
+only for the words of classes that are still larger than one word. Afterwards a pool is a list
+of class ids, and partitioning it by a guess of the set computes one pattern code per class and
+weighs each family by the number of words its classes hold. The hardest family is the one
+get_feedback() would keep, and is only turned back into words when needed.
+"""
+
+from evil_wordle import encode_words, get_packed_feedback_codes, pattern_code_difficulty
+
+
+class SecretClasses:
+    """
+    The equivalence classes of a list of secret words under a set of guesses.
+
+    Classes are numbered in the order of their first word, and the words of each class are in
+    secret_words order.
+
+    Instance Variables:
+        secret_words: The words that were grouped.
+        guesses: A frozenset of the guesses the classes are defined by.
+        members: A list with the positions in secret_words of the words of each class.
+        representatives: A list with the first word of each class.
+        weights: A list with the number of words of each class.
+        class_of: A dictionary mapping each secret word to its class id.
+    """
+
+    def __init__(self, secret_words, guesses):
+        """
+        pre: secret_words is a non-empty list of distinct words and guesses an iterable of
+             words of the same length.
+        post: Two words share a class exactly when every guess gives them the same feedback.
+        """
+        self.secret_words = secret_words
+        self.guesses = frozenset(guesses)
+        encoded = encode_words(secret_words)
+        members = [list(range(len(secret_words)))]
+        splittable = [0] if len(secret_words) > 1 else []
+
+        for guess in self.guesses:
+            if not splittable:
+                break
+            positions = [position for c in splittable for position in members[c]]
+            codes = get_packed_feedback_codes(
+                [encoded[secret_words[position]] for position in positions], guess
+            )
+            code_of = dict(zip(positions, codes))
+            still_splittable = []
+            for c in splittable:
+                groups = {}
+                for position in members[c]:
+                    groups.setdefault(code_of[position], []).append(position)
+                first, *others = groups.values()
+                members[c] = first
+                if len(first) > 1:
+                    still_splittable.append(c)
+                for group in others:
+                    if len(group) > 1:
+                        still_splittable.append(len(members))
+                    members.append(group)
+            splittable = still_splittable
+
+        members.sort(key=lambda positions: positions[0])
+        self.members = members
+        self.representatives = [secret_words[positions[0]] for positions in members]
+        self.weights = [len(positions) for positions in members]
+        self._encoded = [encoded[word] for word in self.representatives]
+        self.class_of = {
+            secret_words[position]: c
+            for c, positions in enumerate(members)
+            for position in positions
+        }
+
+    def __len__(self):
+        return len(self.members)
+
+    def all_classes(self):
+        """Returns the class ids of the whole list of secret words."""
+        return list(range(len(self.members)))
+
+    def classes_of(self, words):
+        """
+        Returns the sorted class ids of a pool of secret words.
+
+        pre: words is a union of classes, as every pool reached by playing guesses of the set is.
+        """
+        return sorted({self.class_of[word] for word in words})
+
+    def weight(self, classes):
+        """Returns the number of words the classes hold."""
+        weights = self.weights
+        return sum(weights[c] for c in classes)
+
+    def words(self, classes):
+        """Returns the words of the classes, in secret_words order."""
+        secret_words = self.secret_words
+        return [
+            secret_words[position]
+            for position in sorted(position for c in classes for position in self.members[c])
+        ]
+
+    def partition(self, classes, guessed_word):
+        """
+        Groups classes by the pattern code guessed_word gives their words.
+
+        Raises:
+            A ValueError if guessed_word is not one of the guesses of the classes, which could
+            give different codes to the words of one class.
+
+        post: Returns a dictionary mapping pattern codes to lists of class ids, each in the
+              order of classes.
+        """
+        if guessed_word not in self.guesses:
+            raise ValueError(f"{guessed_word!r} is not a guess of these classes")
+        encoded = self._encoded
+        codes = get_packed_feedback_codes([encoded[c] for c in classes], guessed_word)
+        families = {}
+        for c, code in zip(classes, codes):
+            families.setdefault(code, []).append(c)
+        return families
+
+    def hardest_family(self, classes, guessed_word):
+        """
+        Returns the (pattern code, class ids) pair of the family get_feedback keeps for the
+        words of classes, ranking families by the number of words they hold.
+
+        Raises:
+            A ValueError if guessed_word is not one of the guesses of the classes.
+        """
+        weights = self.weights
+        return min(
+            self.partition(classes, guessed_word).items(),
+            key=lambda item: (
+                -sum(weights[c] for c in item[1]),
+                -pattern_code_difficulty(item[0]),
+                item[0],
+            ),
+        )
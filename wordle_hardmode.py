@@ -0,0 +1,169 @@
+"""
+Hard mode for evil wordle: every guess must use the hints revealed so far.
+
+A hint is revealed by feedback: a green letter must stay in its spot in every later guess, and a
+letter shown green or yellow n times in one guess must appear at least n times in every later
+guess. Gray letters may be guessed again, as in the original game.
+
+HardModeConstraints sums the hints of a history into two packed integers, and HardModeValidator
+precomputes the same two integers for every word of the dictionary, so checking a guess is a
+couple of integer operations whatever the length of the history:
+
+- positions: the word packed by pack_word, masked to the green spots, must equal the greens.
+- letter counts: the counts of the word's canonical encoding with a guard bit added to every
+  field. Subtracting the required counts clears a guard exactly when the word has too few copies
+  of that letter, and fields never borrow from each other.
+
+Listing every legal guess of a state is a single bitset intersection over a WordIndex.
+"""
+
+from collections import Counter
+
+from evil_wordle import (
+    CORRECT_COLOR,
+    LETTER_BITS,
+    LETTER_COUNT_BITS,
+    LETTER_MASK,
+    NOT_IN_WORD_COLOR,
+    encode_words,
+    get_attempt_label,
+)
+from wordle_index import WordIndex
+
+COUNT_GUARD = 1 << (LETTER_COUNT_BITS - 1)
+COUNT_GUARDS = sum(COUNT_GUARD << (LETTER_COUNT_BITS * x) for x in range(26))
+
+
+def pack_letter_counts(counts):
+    """
+    Packs a mapping of letter indices (0 for a) to counts into LETTER_COUNT_BITS bit fields.
+
+    pre: Every count is less than COUNT_GUARD.
+    """
+    packed = 0
+    for x, count in counts.items():
+        packed |= count << (LETTER_COUNT_BITS * x)
+    return packed
+
+
+class HardModeConstraints:
+    """
+    The hints a hard mode guess has to respect.
+
+    Instance Variables:
+        num_letters: The length of the words.
+        greens: A dictionary mapping positions to the letter required there.
+        min_counts: A dictionary mapping letters to the number of copies required.
+        position_mask: The pack_word bits of the positions in greens.
+        position_value: The pack_word bits of the letters in greens.
+        packed_counts: min_counts packed by pack_letter_counts, keyed by letter index.
+    """
+
+    def __init__(self, num_letters):
+        """
+        pre: num_letters is the length of the words of the game.
+        post: The constraints allow every guess.
+        """
+        self.num_letters = num_letters
+        self.greens = {}
+        self.min_counts = {}
+        self.position_mask = 0
+        self.position_value = 0
+        self.packed_counts = 0
+
+    @classmethod
+    def from_history(cls, history, num_letters):
+        """
+        Returns the constraints of a sequence of (guess, feedback_colors) pairs.
+        """
+        constraints = cls(num_letters)
+        for guessed_word, feedback_colors in history:
+            constraints.update(guessed_word, feedback_colors)
+        return constraints
+
+    def update(self, guessed_word, feedback_colors):
+        """
+        Adds the hints revealed by the feedback of one guess.
+
+        pre: feedback_colors was given by get_feedback for guessed_word.
+        """
+        revealed = Counter()
+        for i, (letter, color) in enumerate(zip(guessed_word, feedback_colors)):
+            if color == NOT_IN_WORD_COLOR:
+                continue
+            revealed[letter] += 1
+            if color == CORRECT_COLOR and i not in self.greens:
+                self.greens[i] = letter
+                shift = LETTER_BITS * (self.num_letters - 1 - i)
+                self.position_mask |= LETTER_MASK << shift
+                self.position_value |= (ord(letter) - 97) << shift
+
+        for letter, count in revealed.items():
+            if count > self.min_counts.get(letter, 0):
+                self.min_counts[letter] = count
+        self.packed_counts = pack_letter_counts(
+            {ord(letter) - 97: count for letter, count in self.min_counts.items()}
+        )
+
+    def violation(self, guessed_word):
+        """
+        Returns the message explaining why guessed_word breaks the constraints, or None.
+        """
+        for i in sorted(self.greens):
+            if guessed_word[i] != self.greens[i]:
+                label = get_attempt_label(i + 1)
+                return f"{label} letter must be {self.greens[i].upper()}"
+        for letter in sorted(self.min_counts):
+            if guessed_word.count(letter) < self.min_counts[letter]:
+                return f"Guess must contain {letter.upper()}"
+        return None
+
+
+class HardModeValidator:
+    """
+    Checks hard mode guesses against a dictionary in constant time.
+
+    Instance Variables:
+        words: The dictionary.
+        index: A dictionary mapping each word to its position in words.
+        packed_words: The pack_word value of each word.
+        packed_counts: The letter count fields of each word with every guard bit set.
+        word_index: The WordIndex of words, for listing legal guesses.
+    """
+
+    def __init__(self, words):
+        """
+        pre: words is a non-empty list of distinct lowercase words of equal length.
+        """
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        encoded = encode_words(words)
+        self.packed_words = [encoded[word][0] for word in words]
+        self.packed_counts = [encoded[word][3] | COUNT_GUARDS for word in words]
+        self.word_index = WordIndex(words)
+
+    def allows(self, guessed_word, constraints):
+        """
+        Returns whether a dictionary word respects the constraints.
+
+        pre: guessed_word is in words.
+        """
+        i = self.index[guessed_word]
+        return (
+            self.packed_words[i] & constraints.position_mask == constraints.position_value
+            and (self.packed_counts[i] - constraints.packed_counts) & COUNT_GUARDS == COUNT_GUARDS
+        )
+
+    def legal_bits(self, constraints):
+        """Returns the WordIndex bitset of the words that respect the constraints."""
+        word_index = self.word_index
+        bits = word_index.all_words
+        for i, letter in constraints.greens.items():
+            bits &= word_index.at[i][ord(letter) - 97]
+        for letter, count in constraints.min_counts.items():
+            bits &= word_index.at_least[ord(letter) - 97][count]
+        return bits
+
+    def legal_guesses(self, constraints):
+        """Returns the words that respect the constraints, in dictionary order."""
+        return self.word_index.words_of(self.legal_bits(constraints))
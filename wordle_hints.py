@@ -0,0 +1,142 @@
+"""
+Hints for players of evil wordle.
+
+The adversary of get_feedback always answers with the largest family, so the best guess for the
+player is the one whose largest family is the smallest. Scoring every valid guess against every
+remaining secret word takes minutes early in the game, so HintEngine:
+
+- orders candidate guesses by a cheap letter frequency score over the remaining secret words and
+  only scores the most promising ones,
+- scores candidates with get_feedback_codes and stops when its latency budget runs out,
+- caches the answer for each remaining secret word pool it has seen.
+
+Ties on the largest family are broken by the higher entropy, then by preferring guesses that
+could still be the secret word.
+"""
+
+import math
+import time
+from collections import Counter
+
+from evil_wordle import get_feedback_codes
+from wordle_session import FeedbackCache
+
+DEFAULT_BUDGET = 0.25
+DEFAULT_CANDIDATES = 200
+
+
+class HintEngine:
+    """
+    Suggests guesses that minimize the adversary's resulting family size.
+
+    Instance Variables:
+        valid_guesses: The list of words that may be suggested.
+        budget: The number of seconds hint() may spend scoring candidates.
+        max_candidates: The number of candidates scored at most per hint.
+        cache: A FeedbackCache mapping remaining secret word pools to hints.
+        evaluated: The total number of candidates scored so far.
+    """
+
+    def __init__(self, valid_guesses, budget=DEFAULT_BUDGET,
+                 max_candidates=DEFAULT_CANDIDATES, cache_size=10_000):
+        """
+        pre: valid_guesses is a non-empty list of words of equal length.
+        """
+        self.valid_guesses = valid_guesses
+        self.budget = budget
+        self.max_candidates = max_candidates
+        self.cache = FeedbackCache(cache_size)
+        self.evaluated = 0
+        self._letter_sets = [frozenset(word) for word in valid_guesses]
+
+    def candidates(self, remaining_secret_words, legal_guesses=None):
+        """
+        Returns the guesses worth scoring for a pool, most promising first.
+
+        A guess scores the number of remaining secret words sharing each of its distinct letters,
+        plus the number sharing each letter in the same position. Remaining secret words come
+        first when the pool is small enough to score all of them, since one of them might win.
+
+        pre: remaining_secret_words is a non-empty list of words. legal_guesses is None or a
+             list of valid guesses.
+        post: Returns a list of at most max_candidates distinct words, all of them in
+              legal_guesses unless it is None.
+        """
+        if legal_guesses is None:
+            guesses, letter_sets = self.valid_guesses, self._letter_sets
+        else:
+            guesses, letter_sets = legal_guesses, [frozenset(word) for word in legal_guesses]
+        letter_counts = Counter()
+        position_counts = Counter()
+        for word in remaining_secret_words:
+            letter_counts.update(set(word))
+            position_counts.update(enumerate(word))
+
+        def score(index):
+            word = guesses[index]
+            return sum(letter_counts[letter] for letter in letter_sets[index]) + sum(
+                position_counts[position] for position in enumerate(word)
+            )
+
+        ranked = sorted(range(len(guesses)), key=score, reverse=True)
+        chosen = []
+        if len(remaining_secret_words) <= self.max_candidates // 2:
+            chosen.extend(dict.fromkeys(remaining_secret_words))
+            if legal_guesses is not None:
+                legal = set(legal_guesses)
+                chosen = [word for word in chosen if word in legal]
+        seen = set(chosen)
+        for index in ranked:
+            if len(chosen) >= self.max_candidates:
+                break
+            word = guesses[index]
+            if word not in seen:
+                seen.add(word)
+                chosen.append(word)
+        return chosen
+
+    def hint(self, remaining_secret_words, legal_guesses=None):
+        """
+        Returns the best guess found within the latency budget.
+
+        A hard mode game passes the guesses its constraints allow as legal_guesses, so the hint
+        is always a guess the game accepts. The remaining secret words respect the constraints,
+        so they stay candidates.
+
+        pre: remaining_secret_words is a non-empty list of words. legal_guesses is None or a
+             list of valid guesses holding every remaining secret word.
+        post: Returns a tuple (guess, worst_family_size, entropy).
+        """
+        if len(remaining_secret_words) <= 2:
+            return remaining_secret_words[0], 1, float(len(remaining_secret_words) - 1)
+
+        key = (
+            tuple(remaining_secret_words),
+            None if legal_guesses is None else tuple(legal_guesses),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        deadline = time.perf_counter() + self.budget
+        total = len(remaining_secret_words)
+        log_total = math.log2(total)
+        possible = set(remaining_secret_words)
+
+        best = None
+        best_key = None
+        for guess in self.candidates(remaining_secret_words, legal_guesses):
+            sizes = Counter(get_feedback_codes(remaining_secret_words, guess)).values()
+            self.evaluated += 1
+            worst = max(sizes)
+            entropy = log_total - sum(size * math.log2(size) for size in sizes) / total
+            candidate_key = (worst, -entropy, guess not in possible)
+            if best_key is None or candidate_key < best_key:
+                best, best_key = (guess, worst, entropy), candidate_key
+                if worst == 1 and guess in possible:
+                    break
+            if time.perf_counter() > deadline:
+                break
+
+        self.cache.put(key, best)
+        return best
@@ -0,0 +1,134 @@
+"""
+An inverted index of the dictionary for rebuilding secret word pools from a guess history.
+
+The adversary only ever keeps the secret words that give the same feedback as the one it
+answered, so the remaining secret words after a history are exactly the dictionary words
+consistent with every (guess, feedback) pair of it. Each pair translates into constraints on
+the secret word:
+
+    green X at i            the word has X at i
+    yellow or gray X at i   the word does not have X at i
+    n green or yellow X     the word has at least n copies of X
+    ... and a gray X        the word has exactly n copies of X
+
+WordIndex keeps one bitset over the dictionary per constraint (bit j stands for word j), so the
+pool of any history is a handful of big int ANDs instead of a get_feedback pass per guess.
+
+Usage:
+    index = WordIndex(valid_guesses)
+    secret_words = index.consistent([(guess, feedback_colors), ...])
+"""
+
+from collections import Counter
+
+from evil_wordle import CORRECT_COLOR, WRONG_SPOT_COLOR, pattern_code_to_colors
+
+# BYTE_BITS[b] lists the set bits of the byte b, lowest first.
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def _bitset(indices, size):
+    """Returns the int with bits indices set, built in one pass over a byte buffer."""
+    buffer = bytearray((size + 7) // 8)
+    for index in indices:
+        buffer[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class WordIndex:
+    """
+    Bitsets of the dictionary words by letter position and letter count.
+
+    Instance Variables:
+        words: The dictionary, in bit order.
+        num_letters: The length of every word.
+        all_words: The bitset of every word.
+        at: at[i][x] is the bitset of the words with letter x (0 for a) at position i.
+        at_least: at_least[x][k] is the bitset of the words with at least k copies of letter x.
+    """
+
+    def __init__(self, words):
+        """
+        pre: words is a non-empty list of distinct lowercase words of equal length.
+        """
+        self.words = words
+        self.num_letters = len(words[0])
+        size = len(words)
+        self.all_words = (1 << size) - 1
+
+        at_indices = [[[] for _ in range(26)] for _ in range(self.num_letters)]
+        count_indices = [[[] for _ in range(self.num_letters + 1)] for _ in range(26)]
+        for j, word in enumerate(words):
+            for i, letter in enumerate(word):
+                at_indices[i][ord(letter) - 97].append(j)
+            for letter, count in Counter(word).items():
+                for k in range(1, count + 1):
+                    count_indices[ord(letter) - 97][k].append(j)
+
+        self.at = [[_bitset(indices, size) for indices in row] for row in at_indices]
+        self.at_least = [
+            [self.all_words] + [_bitset(indices, size) for indices in row[1:]]
+            for row in count_indices
+        ]
+
+    def matching(self, guessed_word, feedback):
+        """
+        Returns the bitset of the words for which guessed_word gets this feedback.
+
+        pre: feedback is a list of colors or a pattern code given by get_feedback_colors()
+             for guessed_word and some secret word.
+        """
+        if isinstance(feedback, int):
+            feedback = pattern_code_to_colors(feedback, len(guessed_word))
+        bits = self.all_words
+        found = Counter()
+        capped = set()
+        for i, (letter, color) in enumerate(zip(guessed_word, feedback)):
+            x = ord(letter) - 97
+            if color == CORRECT_COLOR:
+                bits &= self.at[i][x]
+                found[x] += 1
+            else:
+                bits &= ~self.at[i][x]
+                if color == WRONG_SPOT_COLOR:
+                    found[x] += 1
+                else:
+                    capped.add(x)
+
+        for x, count in found.items():
+            bits &= self.at_least[x][count]
+        for x in capped:
+            count = found[x]
+            if count < self.num_letters:
+                bits &= ~self.at_least[x][count + 1]
+        return bits
+
+    def consistent_bits(self, history):
+        """
+        Returns the bitset of the words consistent with every (guess, feedback) pair of history.
+        """
+        bits = self.all_words
+        for guessed_word, feedback in history:
+            bits &= self.matching(guessed_word, feedback)
+            if not bits:
+                break
+        return bits
+
+    def words_of(self, bits):
+        """Returns the words of a bitset in dictionary order."""
+        words = self.words
+        result = []
+        for byte_index, byte in enumerate(bits.to_bytes((len(words) + 7) // 8, "little")):
+            if byte:
+                base = byte_index << 3
+                result.extend([words[base + bit] for bit in BYTE_BITS[byte]])
+        return result
+
+    def consistent(self, history):
+        """
+        Returns the dictionary words consistent with a feedback history, in dictionary order.
+
+        post: With the dictionary as the starting pool, this is the list get_feedback() leaves
+              after answering the guesses of history with its feedback.
+        """
+        return self.words_of(self.consistent_bits(history))
@@ -0,0 +1,257 @@
+"""
+A load generator for wordle_server.py.
+
+Spawns simulated players that each open a connection, start a game and send guesses until the
+game is over. Guesses either replay transcripts (such as functional_tests/*.in) or are picked at
+random from a word list. The report lists throughput, turn latency percentiles, a latency
+histogram and error counts.
+
+Usage:
+    python3 wordle_loadgen.py [--players N] [--concurrency C] [--think SECONDS]
+                              [--replay GLOB | --words FILE] [--host HOST] [--port PORT]
+                              [--unix PATH]
+"""
+
+import argparse
+import asyncio
+import glob
+import random
+import time
+
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """
+    Collects turn latencies and summarizes them.
+
+    Instance Variables:
+        samples: A list of every latency recorded, in seconds.
+    """
+
+    def __init__(self):
+        self.samples = []
+
+    def record(self, seconds):
+        """Adds one latency sample."""
+        self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        """
+        Returns the latency below which the given fraction of samples fall.
+
+        pre: 0 <= fraction <= 1.
+        post: Returns a latency in seconds, or 0.0 without samples.
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+    def buckets(self):
+        """
+        Returns a list of (upper bound in ms, count) pairs, with None as the last open bound.
+        """
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for seconds in self.samples:
+            milliseconds = seconds * 1000
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if milliseconds <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return list(zip(LATENCY_BUCKETS_MS + (None,), counts))
+
+
+class LoadReport:
+    """
+    The results of a load test run.
+
+    Instance Variables:
+        latencies: A LatencyHistogram of GUESS round trips.
+        sessions: The number of games played to the end.
+        turns: The number of GUESS requests answered.
+        rejected: The number of guesses the server refused (for example invalid words).
+        errors: A dictionary mapping error kinds to counts.
+        elapsed: The wall clock duration of the run in seconds.
+    """
+
+    def __init__(self):
+        self.latencies = LatencyHistogram()
+        self.sessions = 0
+        self.turns = 0
+        self.rejected = 0
+        self.errors = {}
+        self.elapsed = 0.0
+
+    def add_error(self, kind):
+        """Counts one error of the given kind."""
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def __str__(self):
+        elapsed = self.elapsed or 1e-9
+        lines = [
+            f"sessions: {self.sessions} ({self.sessions / elapsed:.1f}/s)",
+            f"turns:    {self.turns} ({self.turns / elapsed:.1f}/s)",
+            f"rejected: {self.rejected}",
+            "latency:  "
+            + ", ".join(
+                f"p{int(fraction * 100)}={self.latencies.percentile(fraction) * 1000:.2f}ms"
+                for fraction in (0.5, 0.9, 0.99)
+            ),
+        ]
+        for bound, count in self.latencies.buckets():
+            label = f"<= {bound}ms" if bound is not None else f"> {LATENCY_BUCKETS_MS[-1]}ms"
+            lines.append(f"  {label:>10} {count}")
+        if self.errors:
+            lines.append(
+                "errors:   " + ", ".join(f"{kind}={count}" for kind, count in self.errors.items())
+            )
+        else:
+            lines.append("errors:   0")
+        return "\n".join(lines)
+
+
+def load_transcripts(pattern):
+    """
+    Loads every transcript matching a glob pattern as a list of guesses.
+
+    pre: pattern matches text files with one guess per line.
+    post: Returns a list of guess lists, in file name order.
+    """
+    transcripts = []
+    for file_name in sorted(glob.glob(pattern)):
+        with open(file_name, "r", encoding="ascii") as transcript:
+            transcripts.append(transcript.read().split())
+    return transcripts
+
+
+def random_guesses(words, rng, count=99):
+    """Returns count guesses picked at random from words."""
+    return [rng.choice(words) for _ in range(count)]
+
+
+async def request(reader, writer, line, report=None):
+    """
+    Sends one request line and waits for its response. With a report, the request is counted as
+    a turn and its latency is recorded.
+
+    post: Returns the response split into words.
+    """
+    start = time.perf_counter()
+    writer.write(line.encode("ascii") + b"\n")
+    await writer.drain()
+    response = await reader.readline()
+    if report is not None:
+        report.latencies.record(time.perf_counter() - start)
+        report.turns += 1
+    if not response:
+        raise ConnectionError("server closed the connection")
+    return response.decode("ascii").split()
+
+
+async def play(connect, guesses, think_time, report):
+    """
+    Plays one game with the given guesses over a new connection.
+
+    pre: connect is a coroutine function returning a (reader, writer) pair.
+    """
+    try:
+        reader, writer = await connect()
+    except OSError:
+        report.add_error("connect")
+        return
+    try:
+        response = await request(reader, writer, "NEW")
+        if response[0] != "OK":
+            report.add_error("new")
+            return
+        session_id = response[1]
+        finished = False
+        for guess in guesses:
+            if think_time:
+                await asyncio.sleep(think_time)
+            response = await request(reader, writer, f"GUESS {session_id} {guess}", report)
+            if response[0] == "ERR":
+                report.rejected += 1
+            elif response[0] != "FEEDBACK":
+                report.add_error("guess")
+                break
+            elif response[3] != "playing":
+                finished = True
+                break
+        if finished:
+            report.sessions += 1
+        else:
+            report.add_error("unfinished")
+        await request(reader, writer, f"END {session_id}")
+    except (ConnectionError, IndexError, UnicodeDecodeError):
+        report.add_error("protocol")
+    finally:
+        writer.close()
+
+
+async def run_load(connect, guess_lists, players, concurrency, think_time):
+    """
+    Runs players games with at most concurrency of them connected at once.
+
+    pre: guess_lists is a non-empty list of guess lists, used round robin.
+    post: Returns a LoadReport.
+    """
+    report = LoadReport()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def player(number):
+        async with semaphore:
+            await play(connect, guess_lists[number % len(guess_lists)], think_time, report)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player(number) for number in range(players)))
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    """Parses the command line, runs the load test and prints the report."""
+    parser = argparse.ArgumentParser(description="Load generator for the evil wordle server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", default=None)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--think", type=float, default=0.0)
+    parser.add_argument("--replay", default=None, help="glob of transcripts to replay")
+    parser.add_argument("--words", default="valid_guesses.txt")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        guess_lists = load_transcripts(args.replay)
+        if not guess_lists:
+            parser.error(f"no transcripts match {args.replay!r}")
+    else:
+        with open(args.words, "r", encoding="ascii") as words_file:
+            words = words_file.read().split()
+        rng = random.Random(args.seed)
+        guess_lists = [random_guesses(words, rng) for _ in range(args.players)]
+
+    if args.unix_path is not None:
+
+        def connect():
+            return asyncio.open_unix_connection(args.unix_path)
+
+    else:
+
+        def connect():
+            return asyncio.open_connection(args.host, args.port)
+
+    report = asyncio.run(
+        run_load(connect, guess_lists, args.players, args.concurrency, args.think)
+    )
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
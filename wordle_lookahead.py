@@ -0,0 +1,200 @@
+"""
+A lookahead adversary for evil wordle.
+
+get_feedback's adversary is greedy: it keeps the largest family for the current guess only.
+LookaheadAdversary instead scores each family by how many more guesses it can force from a
+player who answers with their best next guess, searching a few turns deep:
+
+    resist(F) = 1                                   if F holds a single word
+    resist(F) = min over guesses g of
+                1 + max over families F' of F for g
+                    (0 if F' is g itself, else resist(F'))
+
+Beyond the depth limit resist() falls back to an estimate that only depends on the family size.
+The search prunes with alpha-beta style bounds and memoizes exact results keyed by (family,
+depth), so a family reached through different guesses is only searched once. Ties keep the
+greedy order, and with depth 0 the choice is exactly get_feedback's.
+
+Decisions are anytime: the greedy family is known before any searching starts, then the search
+is repeated one level deeper at a time. When the deadline (or node budget) runs out in the middle
+of a level, that level is abandoned and the answer of the deepest finished level is returned.
+How deep a decision gets depends on the clock and on what the memo already holds, so the same
+guess against the same pool can be answered differently, and the adversary is not deterministic.
+
+Usage:
+    feedback_colors, words = get_feedback(words, guess, adversary=LookaheadAdversary())
+"""
+
+import math
+import time
+from collections import Counter
+
+from evil_wordle import family_rank_key, partition_by_pattern, pattern_code_to_colors
+from wordle_session import FeedbackCache
+
+ALL_CORRECT = 0
+
+
+class DeadlineExceeded(Exception):
+    """Raised inside the search when the deadline or node budget of a decision runs out."""
+
+
+def estimate_guesses(size):
+    """
+    Estimates how many more guesses a family of the given size can force without searching it.
+
+    post: Returns 1 for a single word and grows with the logarithm of size otherwise.
+    """
+    if size == 1:
+        return 1
+    return 2 + math.log2(size) / 4
+
+
+class LookaheadAdversary:
+    """
+    An adversary for get_feedback that searches a few turns ahead.
+
+    Instance Variables:
+        depth: The number of player guesses searched below the current one.
+        branching: The number of player guesses tried at each search node.
+        max_families: The number of hardest greedy families considered at the top level.
+        node_budget: The number of partitions one decision may compute.
+        time_budget: The number of seconds one decision may take.
+        memo: A FeedbackCache mapping (family, depth) to exact resist values.
+        nodes: The total number of partitions computed.
+        decisions: The number of decisions made.
+        deadline_hits: The number of decisions cut short by the deadline or node budget.
+        depths_reached: A Counter mapping the deepest finished level to its number of decisions.
+    """
+
+    # Answers depend on the deadline and the memo, so callers must not cache them by history
+    deterministic = False
+
+    def __init__(self, depth=2, branching=6, max_families=6, node_budget=5_000,
+                 time_budget=0.08, memo_size=200_000):
+        """
+        pre: depth >= 0, branching >= 1 and max_families >= 1.
+        """
+        self.depth = depth
+        self.branching = branching
+        self.max_families = max_families
+        self.node_budget = node_budget
+        self.time_budget = time_budget
+        self.memo = FeedbackCache(memo_size)
+        self.nodes = 0
+        self.decisions = 0
+        self.deadline_hits = 0
+        self.depths_reached = Counter()
+        self._nodes_left = 0
+        self._deadline = 0.0
+
+    def __call__(self, remaining_secret_words, guessed_word, deadline=None):
+        """
+        Picks the family of remaining_secret_words for guessed_word that resists the longest.
+
+        pre: remaining_secret_words is a non-empty list of strings. deadline is None or a
+             time.perf_counter() value.
+        post: Returns a tuple (feedback_colors, new_remaining_secret_words) like get_feedback,
+              using the deepest level finished before the deadline or the time budget, whichever
+              comes first.
+        """
+        self.decisions += 1
+        self._nodes_left = self.node_budget
+        self._deadline = time.perf_counter() + self.time_budget
+        if deadline is not None:
+            self._deadline = min(self._deadline, deadline)
+
+        families = partition_by_pattern(remaining_secret_words, guessed_word)
+        ranked = sorted(families.items(), key=lambda item: family_rank_key(*item))
+
+        # The greedy answer is always available, deeper levels only replace it once finished
+        best_code, best_words = ranked[0]
+        depth_reached = 0
+        contenders = ranked[: self.max_families]
+        for depth in range(1, self.depth + 1):
+            if len(contenders) == 1:
+                break
+            try:
+                best_code, best_words = self._pick(contenders, depth)
+            except DeadlineExceeded:
+                self.deadline_hits += 1
+                break
+            depth_reached = depth
+        self.depths_reached[depth_reached] += 1
+
+        return pattern_code_to_colors(best_code, len(guessed_word)), best_words
+
+    def _pick(self, contenders, depth):
+        """
+        Returns the (code, words) pair of contenders that resists the longest at depth.
+        """
+        best_code, best_words = contenders[0]
+        best_value = None
+        for code, words in contenders:
+            value = 0 if code == ALL_CORRECT else self._resist(words, depth, 0)[0]
+            if best_value is None or value > best_value:
+                best_code, best_words, best_value = code, words, value
+        return best_code, best_words
+
+    def _player_guesses(self, words):
+        """
+        Returns the guesses tried against a family: its words with the most common letters.
+        """
+        if len(words) <= self.branching:
+            return words
+        letter_counts = Counter()
+        for word in words:
+            letter_counts.update(set(word))
+        return sorted(
+            words, key=lambda word: -sum(letter_counts[letter] for letter in set(word))
+        )[: self.branching]
+
+    def _resist(self, words, depth, alpha):
+        """
+        Returns a tuple (value, exact) with the number of guesses the family can force.
+
+        Once a value of at most alpha is certain the parent no longer cares, so the search stops
+        and reports a bound. Only exact values are memoized.
+
+        Raises:
+            DeadlineExceeded if the deadline or node budget runs out.
+        """
+        size = len(words)
+        if size == 1:
+            return 1, True
+        if depth == 0:
+            return estimate_guesses(size), True
+
+        key = (tuple(words), depth)
+        cached = self.memo.get(key)
+        if cached is not None:
+            return cached, True
+        if self._nodes_left <= 0 or time.perf_counter() > self._deadline:
+            raise DeadlineExceeded()
+
+        best = math.inf
+        exact = True
+        for guess in self._player_guesses(words):
+            self._nodes_left -= 1
+            self.nodes += 1
+            split = sorted(
+                partition_by_pattern(words, guess).items(), key=lambda item: -len(item[1])
+            )
+            worst = 0
+            for code, family in split:
+                if code == ALL_CORRECT:
+                    continue
+                value, family_exact = self._resist(family, depth - 1, worst)
+                exact = exact and family_exact
+                if value > worst:
+                    worst = value
+                if 1 + worst >= best:
+                    break
+            best = min(best, 1 + worst)
+            if best <= alpha:
+                exact = False
+                break
+
+        if exact:
+            self.memo.put(key, best)
+        return best, exact
@@ -0,0 +1,220 @@
+"""
+Multi-board evil wordle: every guess is played on several boards at once, like Quordle.
+
+Each board has its own pool of secret words and its own greedy adversary, and the game is won
+once every board has been solved. The boards start from interleaved slices of the dictionary, so
+no two boards can ever end on the same secret word.
+
+The boards never need separate feedback passes. get_board_feedback() computes the pattern codes
+of a guess once against the union of the pools of the unsolved boards, then splits the codes by
+board and keeps the hardest family of each, the same family get_feedback() would keep. Four boards
+cost one get_feedback_codes() call over the dictionary, about what a single board costs on its
+first guess.
+
+One combined keyboard shows the best color each letter has had on any board.
+
+Usage:
+    python3 wordle_multiboard.py [--boards N] [--attempts N] [--words FILE]
+"""
+
+import argparse
+import itertools
+import random
+import sys
+
+from evil_wordle import (
+    CORRECT_COLOR,
+    INVALID_INPUT,
+    NO_COLOR,
+    Keyboard,
+    encode_words,
+    family_rank_key,
+    fast_sort,
+    get_attempt_label,
+    get_feedback_codes,
+    pattern_code_to_colors,
+    render_feedback,
+)
+from wordle_session import LOST, PLAYING, WON, load_words
+
+DEFAULT_BOARDS = 4
+DEFAULT_BOARD_ATTEMPTS = 9
+
+
+def split_pools(words, num_boards):
+    """
+    Splits a dictionary into the starting pools of num_boards boards.
+
+    pre: 1 <= num_boards <= len(words).
+    post: Returns num_boards disjoint lists, word i going to board i % num_boards.
+    """
+    return [words[board::num_boards] for board in range(num_boards)]
+
+
+def get_board_feedback(pools, guessed_word):
+    """
+    Plays one guess on several boards with a single feedback computation.
+
+    pre: pools is a list of non-empty lists of words of the length of guessed_word.
+    post: Returns a list with one tuple (feedback_colors, new_remaining_secret_words) per pool,
+          each equal to get_feedback(pool, guessed_word).
+    """
+    # A word shared by several pools only needs its code once
+    union = list(dict.fromkeys(itertools.chain.from_iterable(pools)))
+    code_of = dict(zip(union, get_feedback_codes(union, guessed_word)))
+
+    num_letters = len(guessed_word)
+    results = []
+    for pool in pools:
+        groups = {}
+        for word in pool:
+            code = code_of[word]
+            group = groups.get(code)
+            if group is None:
+                groups[code] = [word]
+            else:
+                group.append(word)
+        code, words = min(groups.items(), key=lambda item: family_rank_key(*item))
+        results.append((pattern_code_to_colors(code, num_letters), words))
+    return results
+
+
+class MultiBoardGame:
+    """
+    The state of one multi-board game.
+
+    Instance Variables:
+        valid_guesses: A dictionary mapping each valid guess to its canonical encoding.
+        attempts: The number of guesses allowed.
+        attempt: The number of the next guess, starting at 1.
+        pools: The remaining secret words of each board.
+        solved: The attempt each board was solved on, or None while it is unsolved.
+        keyboard: The Keyboard combining the feedback of every board.
+        status: PLAYING, WON or LOST.
+    """
+
+    def __init__(self, valid_guesses, num_boards=DEFAULT_BOARDS,
+                 attempts=DEFAULT_BOARD_ATTEMPTS):
+        """
+        Raises:
+            A ValueError if there are fewer words than boards or attempts is out of range.
+
+        pre: valid_guesses is a non-empty list of words of the same length.
+        post: Every board is unsolved with its slice of valid_guesses as its pool.
+        """
+        if not 1 <= num_boards <= len(valid_guesses):
+            raise ValueError(f"boards must be between 1 and {len(valid_guesses)}")
+        if not 1 < attempts < 100:
+            raise ValueError(f"attempts must be between 2 and 99, got {attempts}")
+        self.valid_guesses = encode_words(valid_guesses)
+        self.attempts = attempts
+        self.attempt = 1
+        self.pools = split_pools(valid_guesses, num_boards)
+        self.solved = [None] * num_boards
+        self.keyboard = Keyboard()
+        self.status = PLAYING
+
+    def guess(self, word):
+        """
+        Plays one guess on every unsolved board.
+
+        Raises:
+            A ValueError if the game is over or word is not a valid guess.
+
+        post: Returns a list with the feedback colors of each board, None for the boards that
+              were already solved. The pools, keyboard, attempt and status are updated.
+        """
+        if self.status != PLAYING:
+            raise ValueError("The game is over.")
+        if word not in self.valid_guesses:
+            raise ValueError(INVALID_INPUT)
+
+        boards = [board for board, solved in enumerate(self.solved) if solved is None]
+        results = get_board_feedback([self.pools[board] for board in boards], word)
+        feedback = [None] * len(self.pools)
+        for board, (feedback_colors, words) in zip(boards, results):
+            feedback[board] = feedback_colors
+            self.pools[board] = words
+            self.keyboard.update(feedback_colors, word)
+            if len(words) == 1 and words[0] == word:
+                self.solved[board] = self.attempt
+
+        if all(solved is not None for solved in self.solved):
+            self.status = WON
+        else:
+            self.attempt += 1
+            if self.attempt > self.attempts:
+                self.status = LOST
+        return feedback
+
+    def secret_words(self):
+        """
+        Returns the secret word of every board, picked like main() does for unsolved boards.
+        """
+        return [
+            pool[0] if solved is not None else random.Random(0).choice(fast_sort(pool))
+            for pool, solved in zip(self.pools, self.solved)
+        ]
+
+
+def render_boards(prompt, guessed_word, feedback):
+    """
+    Returns the feedback of one guess, one line per board lined up under the guess.
+
+    pre: feedback is a list as returned by MultiBoardGame.guess().
+    post: Solved boards get a blank line so every board keeps its row.
+    """
+    lines = []
+    for board, feedback_colors in enumerate(feedback, 1):
+        label = f"Board {board}:"
+        if feedback_colors is None:
+            lines.append(label)
+        else:
+            padding = " " * (len(prompt) - len(label))
+            lines.append(f"{label}{padding}{render_feedback(feedback_colors, guessed_word)}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Plays a multi-board game on the terminal, reading guesses like evil_wordle.main()."""
+    parser = argparse.ArgumentParser(description="Multi-board evil wordle")
+    parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    parser.add_argument("--attempts", type=int, default=DEFAULT_BOARD_ATTEMPTS)
+    parser.add_argument("--words", default="valid_guesses.txt")
+    args = parser.parse_args()
+
+    try:
+        game = MultiBoardGame(load_words(args.words), args.boards, args.attempts)
+    except ValueError as error:
+        parser.error(str(error))
+
+    print(f"Solve {args.boards} evil boards in {args.attempts} tries.")
+    print()
+    while game.status == PLAYING:
+        prompt = f"Enter your {get_attempt_label(game.attempt)} guess: "
+        try:
+            guess = input(prompt)
+        except EOFError:
+            return
+        if not sys.stdin.isatty():
+            print(guess)
+        try:
+            feedback = game.guess(guess)
+        except ValueError:
+            print(INVALID_INPUT)
+            continue
+        sys.stdout.write(f"{render_boards(prompt, guess, feedback)}{game.keyboard}\n\n")
+
+    if game.status == WON:
+        print(f"Congratulations! You solved every board in {game.attempt} guesses.")
+    else:
+        secret_words = [
+            "'" + "".join([CORRECT_COLOR + letter + NO_COLOR for letter in word]) + "'"
+            for word in game.secret_words()
+        ]
+        print("Sorry, you've run out of attempts. The correct words were ", end="")
+        print(", ".join(secret_words) + ".")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+A sampling adversary for evil wordle on huge dictionaries.
+
+get_feedback computes the pattern code of every remaining secret word, which is a Python loop
+over the whole pool on every guess. For a synthetic or multi-language dictionary of millions of
+words that takes seconds per turn. SamplingAdversary estimates the family sizes instead:
+
+    1. Draw a random sample of the pool and partition only the sample.
+    2. Keep the pattern the sample says is the hardest, ranked like get_feedback ranks families.
+    3. Materialize that family exactly with one regular expression over the pool joined into a
+       single string, which runs in C and never builds the other families.
+
+The family returned is always exactly the words of the pool that give the kept pattern, so the
+game stays consistent. Only which pattern is kept is approximate. The sample size comes from the
+normal approximation of a proportion: with confidence c and margin m, the share of the pool each
+estimated family holds is within m of its true share with probability c. Pools smaller than
+min_pool_factor samples are partitioned exactly, so the end game is always played like
+get_feedback plays it.
+
+The sample is seeded by the seed, the guess and the pool size, so the same guess against the
+same pool always gets the same answer and answers can be cached like the greedy ones.
+
+Usage:
+    feedback_colors, words = get_feedback(words, guess, adversary=SamplingAdversary())
+    python3 wordle_sampling.py [--words FILE | --synthetic N] [--guesses N] [--confidence C]
+                               [--margin M] [--seed S]
+"""
+
+import argparse
+import math
+import random
+import re
+import statistics
+import time
+from collections import Counter
+
+from evil_wordle import (
+    CORRECT_COLOR,
+    WRONG_SPOT_COLOR,
+    family_rank_key,
+    get_feedback,
+    get_feedback_codes,
+    pattern_code_to_colors,
+)
+from wordle_session import load_words
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MARGIN = 0.02
+# Pools smaller than this many samples are cheap enough to partition exactly
+DEFAULT_MIN_POOL_FACTOR = 4
+
+
+def sample_size(confidence, margin):
+    """
+    Returns the number of samples that estimate a proportion within margin with the given
+    confidence, for the worst case proportion of one half.
+
+    pre: 0 < confidence < 1 and 0 < margin < 1.
+    """
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    return math.ceil((z / (2 * margin)) ** 2)
+
+
+def pattern_regex(guessed_word, code):
+    """
+    Returns a compiled regular expression matching, one per line, the words for which
+    guessed_word gets the feedback of the pattern code.
+
+    The constraints are those of wordle_index.WordIndex.matching(): green letters are fixed,
+    other guess letters are excluded from their position, green and yellow copies of a letter are
+    a minimum count, and a gray copy caps the count at that minimum.
+
+    pre: 0 <= code < 3 ** len(guessed_word).
+    post: The expression is meant for re.MULTILINE searches over words joined by newlines.
+    """
+    positions = []
+    found = Counter()
+    capped = set()
+    for letter, color in zip(guessed_word, pattern_code_to_colors(code, len(guessed_word))):
+        if color == CORRECT_COLOR:
+            positions.append(letter)
+            found[letter] += 1
+        else:
+            positions.append(f"[^{letter}\\n]")
+            if color == WRONG_SPOT_COLOR:
+                found[letter] += 1
+            else:
+                capped.add(letter)
+
+    # A letter that is only gray is excluded by every character class instead of a lookahead
+    absent = "".join(sorted(letter for letter in capped if not found[letter]))
+    positions = [
+        position if len(position) == 1 else position[:-3] + absent + position[-3:]
+        for position in positions
+    ]
+    lookaheads = [f"(?=(?:[^{letter}\\n]*{letter}){{{count}}})" for letter, count in found.items()]
+    lookaheads += [
+        f"(?!(?:[^{letter}\\n]*{letter}){{{found[letter] + 1}}})"
+        for letter in sorted(capped)
+        if found[letter]
+    ]
+    return re.compile("^" + "".join(lookaheads) + "".join(positions) + "$", re.MULTILINE)
+
+
+class SamplingAdversary:
+    """
+    An adversary for get_feedback that picks the hardest family from a random sample of the pool.
+
+    Instance Variables:
+        confidence: The probability that every estimated family share is within margin.
+        margin: The largest error of an estimated family share, as a fraction of the pool.
+        samples: The number of words sampled per decision.
+        min_pool: Pools smaller than this are partitioned exactly.
+        seed: The seed the samples are drawn with.
+        decisions: The number of decisions made.
+        sampled: The number of decisions made from a sample.
+    """
+
+    def __init__(self, confidence=DEFAULT_CONFIDENCE, margin=DEFAULT_MARGIN, seed=0,
+                 min_pool_factor=DEFAULT_MIN_POOL_FACTOR):
+        """
+        Raises:
+            A ValueError if confidence or margin is not between 0 and 1.
+
+        pre: min_pool_factor >= 1.
+        """
+        if not (0 < confidence < 1 and 0 < margin < 1):
+            raise ValueError("confidence and margin must be between 0 and 1")
+        self.confidence = confidence
+        self.margin = margin
+        self.samples = sample_size(confidence, margin)
+        self.min_pool = min_pool_factor * self.samples
+        self.seed = seed
+        self.decisions = 0
+        self.sampled = 0
+
+    def __call__(self, remaining_secret_words, guessed_word, deadline=None):
+        """
+        Keeps the family of remaining_secret_words a sample says is the hardest.
+
+        pre: remaining_secret_words is a non-empty list of strings, or a wordle_store pool.
+        post: Returns a tuple (feedback_colors, new_remaining_secret_words) like get_feedback,
+              where the new words are exactly the words of the pool that give feedback_colors.
+              A WordStore or WordView pool is answered with a WordView.
+        """
+        self.decisions += 1
+        pool_size = len(remaining_secret_words)
+        if pool_size < self.min_pool:
+            return get_feedback(remaining_secret_words, guessed_word)
+
+        self.sampled += 1
+        rng = random.Random(f"{self.seed}:{guessed_word}:{pool_size}")
+        sample = [remaining_secret_words[i] for i in rng.sample(range(pool_size), self.samples)]
+        counts = Counter(get_feedback_codes(sample, guessed_word))
+        code = min(counts, key=lambda code: family_rank_key(code, range(counts[code])))
+
+        # Every word of the joined pool takes len(guessed_word) + 1 characters
+        stride = len(guessed_word) + 1
+        text = "\n".join(remaining_secret_words)
+        positions = [
+            match.start() // stride for match in pattern_regex(guessed_word, code).finditer(text)
+        ]
+        take = getattr(remaining_secret_words, "take", None)
+        if take is not None:
+            words = take(positions)
+        else:
+            words = [remaining_secret_words[position] for position in positions]
+        return pattern_code_to_colors(code, len(guessed_word)), words
+
+
+def synthetic_words(count, num_letters=5, seed=0):
+    """
+    Returns count distinct random lowercase words, with letters drawn by English frequency so
+    the families look like those of a real dictionary.
+    """
+    rng = random.Random(seed)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    weights = [1 / (rank + 3) for rank in range(len(letters))]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(letters, weights, k=num_letters)))
+    return sorted(words)
+
+
+def benchmark(words, guesses, adversary):
+    """
+    Plays every guess against words with the exact rule and with the adversary.
+
+    post: Returns a dictionary with the exact and sampled seconds per guess, the share of
+          guesses that kept the exact family and the mean ratio of the sampled family size to
+          the exact one.
+    """
+    exact_seconds = sampled_seconds = 0.0
+    same = 0
+    ratios = []
+    for guess in guesses:
+        start = time.perf_counter()
+        exact_colors, exact_words = get_feedback(words, guess)
+        exact_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        colors, sampled_words = get_feedback(words, guess, adversary)
+        sampled_seconds += time.perf_counter() - start
+        same += tuple(colors) == tuple(exact_colors)
+        ratios.append(len(sampled_words) / len(exact_words))
+    return {
+        "exact_seconds": exact_seconds / len(guesses),
+        "sampled_seconds": sampled_seconds / len(guesses),
+        "same_family": same / len(guesses),
+        "size_ratio": statistics.fmean(ratios),
+    }
+
+
+def main():
+    """Parses the command line, runs the benchmark and prints the report."""
+    parser = argparse.ArgumentParser(description="Compare sampled and exact get_feedback")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--words", default="valid_guesses.txt")
+    source.add_argument("--synthetic", type=int, default=None, help="use N random words")
+    parser.add_argument("--guesses", type=int, default=20)
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic is not None:
+        words = synthetic_words(args.synthetic, seed=args.seed)
+    else:
+        words = load_words(args.words)
+    try:
+        adversary = SamplingAdversary(args.confidence, args.margin, args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    guesses = random.Random(args.seed).sample(words, min(args.guesses, len(words)))
+
+    result = benchmark(words, guesses, adversary)
+    print(f"words:        {len(words)}")
+    print(f"samples:      {adversary.samples} ({adversary.sampled} of "
+          f"{adversary.decisions} decisions sampled)")
+    print(f"exact:        {result['exact_seconds'] * 1000:.1f} ms per guess")
+    print(f"sampled:      {result['sampled_seconds'] * 1000:.1f} ms per guess")
+    print(f"same family:  {result['same_family']:.0%}")
+    print(f"family size:  {result['size_ratio']:.1%} of the exact family on average")
+
+
+if __name__ == "__main__":
+    main()
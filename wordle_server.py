@@ -0,0 +1,293 @@
+"""
+An asyncio server hosting many evil wordle games over a line protocol.
+
+Every request is one line of space separated words and gets exactly one line back:
+
+    NEW [attempts] [HARD] [LETTERS=<n>]
+                          -> OK <id> <attempts>
+    GUESS <id> <word>     -> FEEDBACK <id> <colors> <status> [<secret word>]
+    STATE <id>            -> STATE <id> <attempt> <attempts> <status> <remaining> <keyboard>
+    HINT <id>             -> HINT <id> <word>
+    END <id>              -> OK <id>
+    QUIT                  -> BYE, then the connection is closed
+
+<colors> and <keyboard> use the codes of evil_wordle.KEY_CODES: G (correct), Y (wrong spot),
+B (not in word) and . (not guessed yet). <keyboard> lists the letters a to z in order.
+The secret word is only sent along with the "lost" status. HARD starts a hard mode game, where
+guesses ignoring a revealed hint are answered with an error and HINT only suggests guesses that
+respect them. LETTERS=<n> plays words of n letters instead of the default dictionary's, if the
+server has a dictionary of that length. Errors are answered with ERR <message>.
+
+HINT requests, and GUESS requests against a non-default adversary, take a large part of a
+second, so they are answered on a worker thread and the other clients keep being served.
+
+Usage:
+    python3 wordle_server.py [--host HOST] [--port PORT] [--unix PATH] [--words FILE]
+                             [--adversary greedy|lookahead|sampled] [--letters N=FILE ...]
+                             [--packed-min-pool N]
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import evil_wordle
+from wordle_hints import HintEngine
+from wordle_lookahead import LookaheadAdversary
+from wordle_sampling import SamplingAdversary
+from wordle_session import (
+    DEFAULT_ATTEMPTS,
+    LOST,
+    GameContext,
+    GameContexts,
+    SessionManager,
+    encode_colors,
+)
+
+# The --adversary choices, mapped to a factory of the get_feedback adversary (None is greedy)
+ADVERSARIES = {
+    "greedy": lambda: None,
+    "lookahead": LookaheadAdversary,
+    "sampled": SamplingAdversary,
+}
+
+
+class ProtocolError(Exception):
+    """Raised when a request line cannot be answered."""
+
+
+def parse_session_id(token):
+    """
+    Converts a session id token to an int.
+
+    Raises:
+        A ProtocolError if token is not a number.
+    """
+    if not token.isdigit():
+        raise ProtocolError(f"bad session id {token!r}")
+    return int(token)
+
+
+class GameServer:
+    """
+    Answers protocol lines for a SessionManager.
+
+    Instance Variables:
+        manager: The SessionManager holding every game of the server.
+        hints: The HintEngine answering HINT requests for the default word length.
+        worker: The single thread answering the requests that would stall the event loop.
+    """
+
+    def __init__(self, manager, hints=None):
+        """
+        pre: manager is a SessionManager.
+        """
+        self.manager = manager
+        self.hints = hints if hints is not None else HintEngine(manager.context.valid_guesses)
+        # One thread keeps the slow requests in order, so they never run alongside each other
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordle-worker")
+        self._length_hints = {}
+
+    def hints_for(self, context):
+        """
+        Returns the HintEngine of a context, building it the first time another word length
+        asks for a hint.
+        """
+        if context is self.manager.context:
+            return self.hints
+        hints = self._length_hints.get(context.num_letters)
+        if hints is None:
+            hints = self._length_hints[context.num_letters] = HintEngine(context.valid_guesses)
+        return hints
+
+    def is_slow(self, line):
+        """
+        Returns whether answering line may take long enough to hold up other clients.
+        """
+        parts = line.split(maxsplit=1)
+        command = parts[0].upper() if parts else ""
+        if command == "HINT":
+            return True
+        return command == "GUESS" and self.manager.context.adversary is not None
+
+    def handle_line(self, line):
+        """
+        Answers one request line without the trailing newline.
+
+        pre: line is a string.
+        post: Returns the response line without the trailing newline.
+        """
+        if not line.isascii():
+            return "ERR requests must be ascii"
+        parts = line.split()
+        if not parts:
+            return "ERR empty request"
+        command, args = parts[0].upper(), parts[1:]
+        handler = getattr(self, f"_do_{command.lower()}", None)
+        if handler is None:
+            return f"ERR unknown command {parts[0]!r}"
+        try:
+            return handler(args)
+        except ProtocolError as error:
+            return f"ERR {error}"
+        except KeyError:
+            return "ERR no such session"
+        except ValueError as error:
+            return f"ERR {error}"
+
+    def _do_new(self, args):
+        num_letters = None
+        if args and args[-1].upper().startswith("LETTERS="):
+            letters = args[-1][len("LETTERS="):]
+            if not letters.isdigit():
+                raise ProtocolError(f"bad letters {letters!r}")
+            num_letters = int(letters)
+            args = args[:-1]
+        hard_mode = bool(args) and args[-1].upper() == "HARD"
+        if hard_mode:
+            args = args[:-1]
+        if len(args) > 1:
+            raise ProtocolError("usage: NEW [attempts] [HARD] [LETTERS=<n>]")
+        attempts = DEFAULT_ATTEMPTS
+        if args:
+            if not args[0].isdigit():
+                raise ProtocolError(f"bad attempts {args[0]!r}")
+            attempts = int(args[0])
+        session_id = self.manager.new(attempts, hard_mode, num_letters)
+        return f"OK {session_id} {attempts}"
+
+    def _do_guess(self, args):
+        if len(args) != 2:
+            raise ProtocolError("usage: GUESS <id> <word>")
+        session_id = parse_session_id(args[0])
+        session = self.manager.get(session_id)
+        feedback_colors = session.guess(args[1])
+        response = f"FEEDBACK {session_id} {encode_colors(feedback_colors)} {session.status}"
+        if session.status == LOST:
+            response += f" {session.secret_word()}"
+        return response
+
+    def _do_state(self, args):
+        if len(args) != 1:
+            raise ProtocolError("usage: STATE <id>")
+        session_id = parse_session_id(args[0])
+        session = self.manager.get(session_id)
+        return (
+            f"STATE {session_id} {session.attempt} {session.attempts} {session.status} "
+            f"{len(session.secret_words)} {session.keyboard_codes()}"
+        )
+
+    def _do_hint(self, args):
+        if len(args) != 1:
+            raise ProtocolError("usage: HINT <id>")
+        session_id = parse_session_id(args[0])
+        session = self.manager.get(session_id)
+        legal_guesses = None
+        if session.constraints is not None:
+            legal_guesses = session.context.hard_mode_validator.legal_guesses(session.constraints)
+        guess, _, _ = self.hints_for(session.context).hint(session.secret_words, legal_guesses)
+        return f"HINT {session_id} {guess}"
+
+    def _do_end(self, args):
+        if len(args) != 1:
+            raise ProtocolError("usage: END <id>")
+        session_id = parse_session_id(args[0])
+        self.manager.close(session_id)
+        return f"OK {session_id}"
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one connection until the client sends QUIT or disconnects.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                raw_line = await reader.readline()
+                if not raw_line:
+                    break
+                line = raw_line.decode("ascii", errors="replace").strip()
+                if line.upper() == "QUIT":
+                    writer.write(b"BYE\n")
+                    await writer.drain()
+                    break
+                try:
+                    if self.is_slow(line):
+                        response = await loop.run_in_executor(self.worker, self.handle_line, line)
+                    else:
+                        response = self.handle_line(line)
+                except Exception as error:
+                    # A bug answering one request must not cost the client its connection
+                    response = f"ERR internal error ({type(error).__name__})"
+                writer.write(response.encode("ascii", errors="replace") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """
+        Starts listening on a TCP port, or on a Unix socket if unix_path is given.
+
+        post: Returns the asyncio.Server.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def serve(host, port, unix_path, words_file, adversary=None, length_files=None):
+    """
+    Loads the default dictionary once and serves forever. length_files maps other word lengths
+    to their word lists, which are loaded by the first game of that length.
+    """
+    context = GameContext.from_file(words_file, adversary=adversary)
+    contexts = GameContexts(length_files or {}, adversary)
+    server = GameServer(SessionManager(context, contexts))
+    listener = await server.start(host, port, unix_path)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    """Parses the command line and runs the server."""
+    parser = argparse.ArgumentParser(description="Evil wordle game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", default=None)
+    parser.add_argument("--words", default="valid_guesses.txt")
+    parser.add_argument("--adversary", choices=ADVERSARIES, default="greedy")
+    parser.add_argument(
+        "--letters",
+        action="append",
+        default=[],
+        metavar="N=FILE",
+        help="serve N letter games from FILE, loaded on first use",
+    )
+    parser.add_argument(
+        "--packed-min-pool",
+        type=int,
+        default=None,
+        metavar="N",
+        help="smallest pool for the packed feedback engine instead of calibrating it",
+    )
+    args = parser.parse_args()
+    if args.packed_min_pool is not None:
+        evil_wordle.PACKED_MIN_POOL = args.packed_min_pool
+    length_files = {}
+    for option in args.letters:
+        letters, _, file_name = option.partition("=")
+        if not letters.isdigit() or not file_name:
+            parser.error(f"--letters expects N=FILE, got {option!r}")
+        length_files[int(letters)] = file_name
+    adversary = ADVERSARIES[args.adversary]()
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.unix_path, args.words, adversary, length_files)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
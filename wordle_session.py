@@ -0,0 +1,568 @@
+"""
+Per-player game state for hosting many evil wordle games in one process.
+
+main() keeps the state of its single game in local variables. GameSession holds the same state
+(attempt number, remaining secret words and keyboard) as an object so that one process can run
+any number of games side by side. Everything that does not change during a game lives in a
+GameContext that is shared by every session: the dictionary, its lookup set and a bounded cache
+of get_feedback results.
+
+Because the greedy adversary is deterministic, the remaining secret words of a game only depend
+on the guesses played so far. The cache is therefore keyed by the guess history, and sessions
+that play the same guesses share both the computation and the resulting word list. An adversary
+whose answers can change from one call to the next (one with a time budget, say) sets its
+deterministic attribute to False, and its answers are never cached.
+"""
+
+import itertools
+import random
+import struct
+from collections import OrderedDict
+
+from evil_wordle import (
+    KEY_CODES,
+    KEY_RANKS,
+    LOST,
+    MAX_LETTERS,
+    MIN_LETTERS,
+    PLAYING,
+    STATUSES,
+    WON,
+    Keyboard,
+    fast_sort,
+    get_feedback,
+    get_feedback_colors,
+    encode_words,
+    packed_min_pool,
+)
+from wordle_hardmode import HardModeConstraints, HardModeValidator
+
+DEFAULT_ATTEMPTS = 6
+
+SNAPSHOT_VERSION = 1
+
+# Set in the status byte of a snapshot when the session plays hard mode.
+HARD_MODE_FLAG = 0x80
+
+# Encodings of the remaining secret words inside a snapshot.
+POOL_FULL = 0
+POOL_BITSET = 1
+POOL_DELTAS = 2
+
+
+def load_words(file_name="valid_guesses.txt"):
+    """
+    Loads a word list with one word per line.
+
+    pre: file_name is the path of an ascii file with one word per line.
+    post: Returns the list of words in file order.
+    """
+    with open(file_name, "r", encoding="ascii") as words_file:
+        return [word.rstrip() for word in words_file.readlines()]
+
+
+def _write_varint(out, value):
+    """Appends value to the bytearray out as an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    """Reads an unsigned LEB128 varint. Returns a tuple (value, next offset)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_colors(colors):
+    """
+    Converts a list of color constants into its compact string form, e.g. "GYBBB".
+
+    pre: colors is an iterable of CORRECT_COLOR, WRONG_SPOT_COLOR, NOT_IN_WORD_COLOR or
+         NO_COLOR.
+    post: Returns a string with one character per color.
+    """
+    return "".join([KEY_CODES[KEY_RANKS[color]] for color in colors])
+
+
+class FeedbackCache:
+    """
+    A bounded least-recently-used cache of get_feedback results.
+
+    Instance Variables:
+        maxsize: The maximum number of entries kept before the oldest ones are evicted.
+        hits: The number of successful lookups.
+        misses: The number of lookups that found nothing.
+    """
+
+    def __init__(self, maxsize=100_000):
+        """
+        Creates an empty cache.
+
+        pre: maxsize is a positive integer.
+        post: The cache is empty and both counters are 0.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Returns the cached value for key, or None if it is not cached.
+
+        pre: key is hashable.
+        post: A found entry becomes the most recently used one.
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Stores value under key, evicting the least recently used entry when full.
+
+        pre: key is hashable and value is not None.
+        post: key maps to value and the cache holds at most maxsize entries.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class GameContext:
+    """
+    The read-only data shared by every GameSession of one word length.
+
+    Instance Variables:
+        num_letters: The length of every word of the dictionary.
+        valid_guesses: The list of valid guesses, which is also the initial secret word pool.
+        valid_set: A frozenset of valid_guesses for constant time validation.
+        index: A dictionary mapping each valid guess to its position in valid_guesses.
+        cache: The FeedbackCache mapping guess histories to get_feedback results.
+        adversary: The adversary passed to get_feedback, or None for the greedy one.
+        hard_mode_validator: The HardModeValidator of valid_guesses, built on first use.
+    """
+
+    def __init__(self, valid_guesses, cache=None, adversary=None):
+        """
+        Raises:
+            A ValueError if the words do not all have the same supported length.
+
+        pre: valid_guesses is a non-empty list of words.
+        post: The context is ready to create sessions, with the feedback engines calibrated for
+              its word length.
+        """
+        self.num_letters = len(valid_guesses[0])
+        if not MIN_LETTERS <= self.num_letters <= MAX_LETTERS:
+            raise ValueError(f"words must have {MIN_LETTERS} to {MAX_LETTERS} letters")
+        if any(len(word) != self.num_letters for word in valid_guesses):
+            raise ValueError(f"every word must have {self.num_letters} letters")
+        self.valid_guesses = valid_guesses
+        self.valid_set = frozenset(valid_guesses)
+        self.index = {word: i for i, word in enumerate(valid_guesses)}
+        encode_words(valid_guesses)
+        packed_min_pool(self.num_letters)
+        self.cache = cache if cache is not None else FeedbackCache()
+        self.adversary = adversary
+        self._hard_mode_validator = None
+
+    @property
+    def hard_mode_validator(self):
+        if self._hard_mode_validator is None:
+            self._hard_mode_validator = HardModeValidator(self.valid_guesses)
+        return self._hard_mode_validator
+
+    @classmethod
+    def from_file(cls, file_name="valid_guesses.txt", cache=None, adversary=None):
+        """
+        Creates a context from a word list file.
+
+        pre: file_name is a word list readable by load_words.
+        post: Returns a new GameContext.
+        """
+        return cls(load_words(file_name), cache, adversary)
+
+    def feedback(self, history, secret_words, guess):
+        """
+        Returns get_feedback(secret_words, guess), using the cache entry of history + (guess,)
+        when the adversary is deterministic.
+
+        pre: secret_words is the remaining pool reached by playing history.
+        post: Returns a tuple (feedback_colors, new_remaining_secret_words).
+        """
+        if not getattr(self.adversary, "deterministic", True):
+            return get_feedback(secret_words, guess, self.adversary)
+        key = history + (guess,)
+        result = self.cache.get(key)
+        if result is None:
+            result = get_feedback(secret_words, guess, self.adversary)
+            self.cache.put(key, result)
+        return result
+
+
+class GameContexts:
+    """
+    The GameContexts of every word length a process serves, each built on first use.
+
+    A context holds a dictionary, its encodings, its feedback cache and later its hard mode
+    index, so a host configured for several lengths only loads the ones that are played.
+
+    Instance Variables:
+        word_files: A dictionary mapping word lengths to word list files.
+        adversary: The adversary every context passes to get_feedback, or None.
+        cache_size: The maxsize of the FeedbackCache of each context.
+    """
+
+    def __init__(self, word_files, adversary=None, cache_size=100_000):
+        """
+        pre: word_files maps each length to a file readable by load_words holding words of
+             that length.
+        post: No context is loaded yet.
+        """
+        self.word_files = dict(word_files)
+        self.adversary = adversary
+        self.cache_size = cache_size
+        self._contexts = {}
+
+    @property
+    def lengths(self):
+        """The word lengths that can be played, in increasing order."""
+        return sorted(self.word_files)
+
+    def loaded(self):
+        """Returns the word lengths whose context has been built so far."""
+        return sorted(self._contexts)
+
+    def add(self, context):
+        """
+        Serves an already built context for its word length.
+
+        post: get(context.num_letters) returns context.
+        """
+        self.word_files.setdefault(context.num_letters, None)
+        self._contexts[context.num_letters] = context
+
+    def get(self, num_letters):
+        """
+        Returns the context of a word length, loading its dictionary the first time.
+
+        Raises:
+            A ValueError if no dictionary of that length is configured, or the file holds
+            words of another length.
+        """
+        context = self._contexts.get(num_letters)
+        if context is None:
+            if num_letters not in self.word_files:
+                raise ValueError(f"no dictionary of {num_letters} letter words")
+            context = GameContext.from_file(
+                self.word_files[num_letters], FeedbackCache(self.cache_size), self.adversary
+            )
+            if context.num_letters != num_letters:
+                file_name = self.word_files[num_letters]
+                raise ValueError(f"{file_name} does not hold {num_letters} letter words")
+            self._contexts[num_letters] = context
+        return context
+
+
+class GameSession:
+    """
+    The state of one evil wordle game.
+
+    Instance Variables:
+        context: The shared GameContext.
+        attempts: The number of guesses allowed.
+        attempt: The number of the next guess, starting at 1.
+        history: A tuple of the valid guesses played so far.
+        secret_words: The remaining pool of secret words.
+        keyboard: The Keyboard of the player.
+        status: PLAYING, WON or LOST.
+        constraints: The HardModeConstraints of a hard mode game, or None.
+    """
+
+    __slots__ = (
+        "context",
+        "attempts",
+        "attempt",
+        "history",
+        "secret_words",
+        "keyboard",
+        "status",
+        "constraints",
+    )
+
+    def __init__(self, context, attempts=DEFAULT_ATTEMPTS, hard_mode=False):
+        """
+        Starts a new game. In hard mode every guess must use the hints revealed so far.
+
+        pre: context is a GameContext and 1 < attempts < 100.
+        post: The session is PLAYING its 1st attempt with the full secret word pool.
+        """
+        if not 1 < attempts < 100:
+            raise ValueError(f"attempts must be between 2 and 99, got {attempts}")
+        self.context = context
+        self.attempts = attempts
+        self.attempt = 1
+        self.history = ()
+        self.secret_words = context.valid_guesses
+        self.keyboard = Keyboard()
+        self.status = PLAYING
+        self.constraints = (
+            HardModeConstraints(context.num_letters) if hard_mode else None
+        )
+
+    def guess(self, word):
+        """
+        Plays one guess, the same way one iteration of main()'s loop does.
+
+        Raises:
+            A ValueError if the game is over, word is not a valid guess or word breaks hard
+            mode.
+
+        pre: word is a string.
+        post: Returns the feedback colors of the guess. The attempt number, remaining secret
+              words, keyboard and status are updated.
+        """
+        if self.status != PLAYING:
+            raise ValueError("The game is over.")
+        if word not in self.context.valid_set:
+            raise ValueError("Invalid guess.")
+        constraints = self.constraints
+        if constraints is not None and not self.context.hard_mode_validator.allows(
+            word, constraints
+        ):
+            raise ValueError(constraints.violation(word))
+
+        feedback_colors, self.secret_words = self.context.feedback(
+            self.history, self.secret_words, word
+        )
+        self.history += (word,)
+        self.keyboard.update(feedback_colors, word)
+        if constraints is not None:
+            constraints.update(word, feedback_colors)
+
+        if len(self.secret_words) == 1 and word == self.secret_words[0]:
+            self.status = WON
+        else:
+            self.attempt += 1
+            if self.attempt > self.attempts:
+                self.status = LOST
+        return feedback_colors
+
+    def secret_word(self):
+        """
+        Returns the secret word revealed when the game is lost, picked like main() does.
+
+        pre: The secret word pool is not empty.
+        post: Returns one word of the remaining secret words.
+        """
+        return random.Random(0).choice(fast_sort(list(self.secret_words)))
+
+    def snapshot(self):
+        """
+        Serializes the session into a compact binary blob that restore() accepts.
+
+        The blob holds the attempt counters and status (with HARD_MODE_FLAG), the keyboard as 26
+        two bit codes, the guess history as dictionary indices and the remaining secret words as
+        whichever is smaller of a bitset over the dictionary or a delta encoded list of indices.
+
+        pre: Every word in history and secret_words is in the context's dictionary.
+        post: Returns a bytes object.
+        """
+        index = self.context.index
+        out = bytearray(
+            struct.pack(
+                "<BBBB",
+                SNAPSHOT_VERSION,
+                self.attempts,
+                self.attempt,
+                STATUSES.index(self.status)
+                | (HARD_MODE_FLAG if self.constraints is not None else 0),
+            )
+        )
+
+        out += self.keyboard.pack().to_bytes(7, "little")
+
+        _write_varint(out, len(self.history))
+        for word in self.history:
+            _write_varint(out, index[word])
+
+        num_words = len(self.context.valid_guesses)
+        if self.secret_words is self.context.valid_guesses:
+            out.append(POOL_FULL)
+            return bytes(out)
+
+        deltas = bytearray()
+        previous = -1
+        for position in sorted(index[word] for word in self.secret_words):
+            _write_varint(deltas, position - previous)
+            previous = position
+        bitset_size = (num_words + 7) // 8
+        if len(deltas) < bitset_size:
+            out.append(POOL_DELTAS)
+            _write_varint(out, len(self.secret_words))
+            out += deltas
+        else:
+            bits = 0
+            for word in self.secret_words:
+                bits |= 1 << index[word]
+            out.append(POOL_BITSET)
+            out += bits.to_bytes(bitset_size, "little")
+        return bytes(out)
+
+    @classmethod
+    def restore(cls, context, blob):
+        """
+        Rebuilds a session from a blob made by snapshot().
+
+        Raises:
+            A ValueError if the blob has an unknown version or encoding.
+
+        pre: context holds the same dictionary as the context the snapshot was taken with.
+        post: Returns a GameSession equal in state to the snapshotted one. The remaining secret
+              words are in dictionary order.
+        """
+        version, attempts, attempt, status = struct.unpack_from("<BBBB", blob)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+
+        session = cls.__new__(cls)
+        session.context = context
+        session.attempts = attempts
+        session.attempt = attempt
+        session.status = STATUSES[status & ~HARD_MODE_FLAG]
+
+        packed_keyboard = int.from_bytes(blob[4:11], "little")
+        session.keyboard = Keyboard()
+        ranks = session.keyboard.ranks
+        for i in range(26):
+            ranks[i] = (packed_keyboard >> (2 * i)) & 3
+
+        words = context.valid_guesses
+        num_guesses, offset = _read_varint(blob, 11)
+        history = []
+        for _ in range(num_guesses):
+            position, offset = _read_varint(blob, offset)
+            history.append(words[position])
+        session.history = tuple(history)
+
+        encoding = blob[offset]
+        offset += 1
+        cached = context.cache.get(session.history) if history else None
+        if encoding == POOL_FULL:
+            session.secret_words = words
+        elif cached is not None:
+            session.secret_words = cached[1]
+        elif encoding == POOL_DELTAS:
+            count, offset = _read_varint(blob, offset)
+            secret_words = [None] * count
+            position = -1
+            for i in range(count):
+                delta, offset = _read_varint(blob, offset)
+                position += delta
+                secret_words[i] = words[position]
+            session.secret_words = secret_words
+        elif encoding == POOL_BITSET:
+            bitset = blob[offset:]
+            secret_words = []
+            for byte_number, byte in enumerate(bitset):
+                if byte:
+                    base = byte_number * 8
+                    for bit in range(8):
+                        if byte >> bit & 1:
+                            secret_words.append(words[base + bit])
+            session.secret_words = secret_words
+        else:
+            raise ValueError(f"unknown secret word encoding {encoding}")
+
+        session.constraints = None
+        if status & HARD_MODE_FLAG:
+            # The hints are not stored, but every remaining secret word gives each guess of the
+            # history the feedback the player was shown, without asking the adversary again
+            secret_word = session.secret_words[0]
+            session.constraints = HardModeConstraints.from_history(
+                [(word, get_feedback_colors(secret_word, word)) for word in session.history],
+                len(words[0]),
+            )
+        return session
+
+    def keyboard_codes(self):
+        """
+        Returns the keyboard colors as a 26 character string in alphabetical order.
+
+        post: Each character is one of the KEY_CODES of evil_wordle.
+        """
+        return self.keyboard.codes()
+
+
+class SessionManager:
+    """
+    Creates, finds and closes the sessions of one server.
+
+    Instance Variables:
+        context: The GameContext of the default word length.
+        contexts: The GameContexts of every word length, including the default one.
+        sessions: A dictionary mapping session ids to GameSession objects.
+    """
+
+    def __init__(self, context, contexts=None):
+        """
+        pre: context is a GameContext and contexts is None or a GameContexts.
+        post: No sessions exist.
+        """
+        self.context = context
+        self.contexts = contexts if contexts is not None else GameContexts({})
+        self.contexts.add(context)
+        self.sessions = {}
+        self._ids = itertools.count(1)
+
+    def new(self, attempts=DEFAULT_ATTEMPTS, hard_mode=False, num_letters=None):
+        """
+        Starts a new session and returns its id. Without num_letters the session plays the
+        default word length.
+
+        Raises:
+            A ValueError if attempts is out of range or no dictionary has num_letters letters.
+        """
+        context = self.context if num_letters is None else self.contexts.get(num_letters)
+        session = GameSession(context, attempts, hard_mode)
+        session_id = next(self._ids)
+        self.sessions[session_id] = session
+        return session_id
+
+    def get(self, session_id):
+        """
+        Returns the session with the given id.
+
+        Raises:
+            A KeyError if there is no such session.
+        """
+        return self.sessions[session_id]
+
+    def close(self, session_id):
+        """
+        Forgets the session with the given id.
+
+        Raises:
+            A KeyError if there is no such session.
+        """
+        del self.sessions[session_id]
@@ -0,0 +1,178 @@
+"""
+Simulates automated players against the evil adversary of get_feedback.
+
+For every starting guess (or the first --starts of them), one game is played where the player
+opens with that guess and then follows a strategy:
+
+    fixed   plays the words given with --fixed in order, then the first remaining secret word
+    greedy  plays the remaining secret word whose hardest family is the smallest
+    random  plays a random remaining secret word
+
+Games are spread over a process pool. Each worker loads the dictionary and builds its encodings
+and lookup structures once, when it starts, and keeps its own cache of get_feedback results
+keyed by guess history. Games from different starts share no history, so a cache shared between
+the workers would rarely be hit and is not worth the locking. The report gives the distribution
+of game lengths and the throughput in games per second.
+
+Usage:
+    python3 wordle_simulate.py [--strategy fixed|greedy|random] [--fixed WORD,...]
+                               [--starts N] [--processes P] [--words FILE]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from evil_wordle import get_feedback_colors
+from wordle_session import GameContext, FeedbackCache, load_words
+
+MAX_TURNS = 100
+GREEDY_CANDIDATES = 50
+DEFAULT_CACHE_SIZE = 1_000_000
+
+_worker_context = None
+
+
+def fixed_strategy(words):
+    """
+    Returns a strategy that plays words in order, then the first remaining secret word.
+    """
+
+    def strategy(secret_words, history, rng):
+        turn = len(history) - 1
+        if turn < len(words):
+            return words[turn]
+        return secret_words[0]
+
+    return strategy
+
+
+def worst_family_size(secret_words, guess):
+    """Returns the size of the largest family guess splits secret_words into."""
+    sizes = Counter(tuple(get_feedback_colors(secret_word, guess)) for secret_word in secret_words)
+    return max(sizes.values())
+
+
+def greedy_strategy(secret_words, history, rng):
+    """
+    Plays the remaining secret word that leaves the adversary the smallest largest family.
+    Only the first GREEDY_CANDIDATES remaining words are considered as guesses.
+    """
+    if len(secret_words) <= 2:
+        return secret_words[0]
+    candidates = secret_words[:GREEDY_CANDIDATES]
+    return min(candidates, key=lambda guess: worst_family_size(secret_words, guess))
+
+
+def random_strategy(secret_words, history, rng):
+    """Plays a random remaining secret word."""
+    return rng.choice(secret_words)
+
+
+def play_game(context, first_guess, strategy, rng):
+    """
+    Plays one game against get_feedback until the player wins or MAX_TURNS is reached.
+
+    pre: first_guess is a valid guess and strategy(secret_words, history, rng) returns a
+         valid guess.
+    post: Returns the number of guesses played, or None if the game was not won.
+    """
+    secret_words = context.valid_guesses
+    history = ()
+    guess = first_guess
+    for turn in range(1, MAX_TURNS + 1):
+        _, secret_words = context.feedback(history, secret_words, guess)
+        history += (guess,)
+        if len(secret_words) == 1 and guess == secret_words[0]:
+            return turn
+        guess = strategy(secret_words, history, rng)
+    return None
+
+
+def make_strategy(name, fixed_words):
+    """Returns the strategy function called name."""
+    if name == "fixed":
+        return fixed_strategy(fixed_words)
+    if name == "greedy":
+        return greedy_strategy
+    return random_strategy
+
+
+def _init_worker(words_file, cache_size):
+    global _worker_context
+    _worker_context = GameContext.from_file(words_file, FeedbackCache(maxsize=cache_size))
+
+
+def _simulate_start(job):
+    first_guess, name, fixed_words, seed = job
+    rng = random.Random(f"{seed}:{first_guess}")
+    strategy = make_strategy(name, fixed_words)
+    return first_guess, play_game(_worker_context, first_guess, strategy, rng)
+
+
+def simulate(first_guesses, words_file="valid_guesses.txt", name="greedy", fixed_words=(),
+             processes=1, seed=0, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Plays one game per starting guess, in this process or over a process pool.
+
+    pre: every word of first_guesses is a valid guess of words_file.
+    post: Returns a dictionary mapping each starting guess to its game length (None when the
+          game was not won within MAX_TURNS).
+    """
+    jobs = [(first_guess, name, tuple(fixed_words), seed) for first_guess in first_guesses]
+    if processes == 1:
+        _init_worker(words_file, cache_size)
+        return dict(map(_simulate_start, jobs))
+    with Pool(processes, initializer=_init_worker, initargs=(words_file, cache_size)) as pool:
+        chunksize = max(1, len(jobs) // (processes * 8))
+        return dict(pool.imap_unordered(_simulate_start, jobs, chunksize))
+
+
+def format_report(results, elapsed):
+    """Returns the length distribution and throughput of a simulate() run as text."""
+    lengths = Counter(results.values())
+    games = len(results)
+    lines = [f"games: {games} in {elapsed:.2f}s ({games / (elapsed or 1e-9):.1f} games/s)"]
+    for length in sorted(length for length in lengths if length is not None):
+        lines.append(f"  {length:>3} guesses: {lengths[length]}")
+    if None in lengths:
+        lines.append(f"  not won in {MAX_TURNS}: {lengths[None]}")
+    won = [length for length in results.values() if length is not None]
+    if won:
+        worst = max(won)
+        lines.append(f"mean: {sum(won) / len(won):.3f}, worst: {worst}")
+        worst_starts = sorted(start for start, length in results.items() if length == worst)
+        lines.append("worst starts: " + " ".join(worst_starts[:20]))
+    return "\n".join(lines)
+
+
+def main():
+    """Parses the command line, runs the simulation and prints the report."""
+    parser = argparse.ArgumentParser(description="Simulate players against evil wordle")
+    parser.add_argument("--strategy", choices=("fixed", "greedy", "random"), default="greedy")
+    parser.add_argument("--fixed", default="", help="comma separated guesses for 'fixed'")
+    parser.add_argument("--starts", type=int, default=None, help="only use the first N starts")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--words", default="valid_guesses.txt")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    valid_guesses = load_words(args.words)
+    valid_set = frozenset(valid_guesses)
+    fixed_words = [word for word in args.fixed.split(",") if word]
+    for word in fixed_words:
+        if word not in valid_set:
+            parser.error(f"{word!r} is not a valid guess")
+    first_guesses = valid_guesses[: args.starts]
+
+    start = time.perf_counter()
+    results = simulate(
+        first_guesses, args.words, args.strategy, fixed_words, args.processes, args.seed
+    )
+    print(format_report(results, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
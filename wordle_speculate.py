@@ -0,0 +1,128 @@
+"""
+Speculative feedback for interactive games.
+
+A human player takes seconds to type a guess, and main() spends them blocked in input().
+SpeculativeFeedback uses that time. After every turn, a background thread computes get_feedback
+for the guesses the player is most likely to type next against the new remaining secret words:
+popular openers on the first turn, then the candidates HintEngine would score first. The results
+go into a bounded cache, and when the guess arrives it is usually a cache hit.
+
+The thread checks for a new guess between two get_feedback calls, so it stops within one call
+once the player answers, and input() releases the GIL while it waits, so speculating does not
+slow down typing. Results are keyed by turn, since the pool a guess was computed against is
+only valid for one turn.
+
+Usage:
+    speculator = SpeculativeFeedback(valid_guesses)
+    speculator.speculate(secret_words)
+    feedback_colors, secret_words = speculator.feedback(secret_words, guess)
+"""
+
+import threading
+
+from evil_wordle import get_feedback
+from wordle_hints import HintEngine
+from wordle_session import FeedbackCache
+
+# Openers players often start with, tried first while the player types their first guess.
+POPULAR_OPENERS = (
+    "crane", "slate", "adieu", "stare", "raise", "arise", "audio", "trace", "crate", "salet",
+    "roate", "soare",
+)
+
+DEFAULT_SPECULATIONS = 24
+
+
+class SpeculativeFeedback:
+    """
+    Computes get_feedback for likely guesses in the background while the player types.
+
+    Instance Variables:
+        openers: The valid popular openers, tried first on the first turn.
+        max_guesses: The number of guesses precomputed per turn.
+        cache: A FeedbackCache mapping (turn, guess) to get_feedback results.
+        hits: The number of guesses answered from the cache.
+        misses: The number of guesses computed after they were typed.
+    """
+
+    def __init__(self, valid_guesses, openers=POPULAR_OPENERS, max_guesses=DEFAULT_SPECULATIONS,
+                 cache_size=4 * DEFAULT_SPECULATIONS):
+        """
+        pre: valid_guesses is the dictionary, a non-empty list of words of equal length.
+        post: Nothing is being precomputed yet.
+        """
+        valid_set = frozenset(valid_guesses)
+        self.openers = [word for word in openers if word in valid_set]
+        self.max_guesses = max_guesses
+        self.cache = FeedbackCache(cache_size)
+        self.hits = 0
+        self.misses = 0
+        self._candidates = HintEngine(valid_guesses, max_candidates=max_guesses)
+        self._turn = 0
+        self._pool = None
+        self._stop = threading.Event()
+        self._worker = None
+
+    def speculate(self, secret_words):
+        """
+        Starts precomputing the next turn's likely guesses against secret_words.
+
+        pre: secret_words is the pool the next guess will be played against.
+        post: A background thread fills the cache until feedback() or close() is called.
+        """
+        self._join()
+        self._turn += 1
+        self._pool = secret_words
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run, args=(self._turn, secret_words), daemon=True
+        )
+        self._worker.start()
+
+    def feedback(self, secret_words, guessed_word):
+        """
+        Returns get_feedback(secret_words, guessed_word), from the cache when it was precomputed.
+
+        post: The background thread is stopped.
+        """
+        self._join()
+        # Precomputed results only hold for the pool given to the last speculate() call
+        result = None
+        if secret_words is self._pool:
+            result = self.cache.get((self._turn, guessed_word))
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        return get_feedback(secret_words, guessed_word)
+
+    def wait(self):
+        """Waits until the background thread has precomputed every guess of the turn."""
+        if self._worker is not None:
+            self._worker.join()
+
+    def close(self):
+        """Stops the background thread."""
+        self._join()
+
+    def _join(self):
+        if self._worker is not None:
+            self._stop.set()
+            self._worker.join()
+            self._worker = None
+
+    def _guesses(self, turn, secret_words):
+        """Yields the guesses to precompute, most likely first."""
+        if turn == 1:
+            yield from self.openers
+        yield from self._candidates.candidates(secret_words)
+
+    def _run(self, turn, secret_words):
+        done = 0
+        for guess in self._guesses(turn, secret_words):
+            if self._stop.is_set() or done >= self.max_guesses:
+                return
+            key = (turn, guess)
+            if key not in self.cache:
+                self.cache.put(key, get_feedback(secret_words, guess))
+                done += 1
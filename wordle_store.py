@@ -0,0 +1,185 @@
+"""
+Compact storage for the dictionary.
+
+A list of ten thousand str objects spends more memory on object headers and list pointers than
+on letters. WordStore keeps the whole dictionary in one bytes buffer, word i at offset
+i * num_letters, next to arrays of the packed words and letter masks of the canonical encoding.
+Pools of secret words are WordViews: an array of dictionary indices into a store, so narrowing a
+pool only allocates a new index array and no strings at all.
+
+get_feedback() accepts a WordStore or WordView as its pool and then answers with a WordView,
+through their partition_by_pattern() method.
+Both behave like read-only lists of strings, and a view compares equal to a list holding the same
+words.
+
+The store is opt-in: GameContext and main() keep their pools as lists, and a program that wants
+the compact pools builds a store itself and passes it to get_feedback().
+
+Usage:
+    store = WordStore.from_file("valid_guesses.txt")
+    feedback_colors, secret_words = get_feedback(store, guess)
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from evil_wordle import encode_word, get_packed_feedback_codes
+
+
+class WordStore(Sequence):
+    """
+    A dictionary of equal length words in one contiguous buffer.
+
+    Instance Variables:
+        num_letters: The length of every word, which is the stride of the buffer.
+        buffer: The ascii letters of every word, concatenated.
+        packed: An array with the packed encoding of each word.
+        masks: An array with the letter mask of each word.
+    """
+
+    def __init__(self, words):
+        """
+        pre: words is a non-empty list of distinct lowercase words of equal length.
+        """
+        self.num_letters = len(words[0])
+        self.buffer = "".join(words).encode("ascii")
+        self.packed = array("Q")
+        self.masks = array("I")
+        for word in words:
+            packed, mask, _, _ = encode_word(word)
+            self.packed.append(packed)
+            self.masks.append(mask)
+        self._positions = None
+
+    @classmethod
+    def from_file(cls, file_name="valid_guesses.txt"):
+        """Loads a word list with one word per line into a store."""
+        with open(file_name, "r", encoding="ascii") as words_file:
+            return cls([word.rstrip() for word in words_file.readlines()])
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            # A range stands in for the indices without allocating an array
+            return WordView(self, range(len(self))[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("word index out of range")
+        start = i * self.num_letters
+        return self.buffer[start : start + self.num_letters].decode("ascii")
+
+    def __iter__(self):
+        buffer = self.buffer
+        num_letters = self.num_letters
+        for start in range(0, len(buffer), num_letters):
+            yield buffer[start : start + num_letters].decode("ascii")
+
+    def word_bytes(self, start, stop=None):
+        """
+        Returns a zero-copy memoryview of the letters of words start to stop (exclusive).
+
+        post: Without stop, the view holds word start only.
+        """
+        if stop is None:
+            stop = start + 1
+        return memoryview(self.buffer)[start * self.num_letters : stop * self.num_letters]
+
+    def position(self, word):
+        """
+        Returns the index of word in the store, or None if it is not there.
+        """
+        if self._positions is None:
+            self._positions = {packed: i for i, packed in enumerate(self.packed)}
+        if len(word) != self.num_letters or not (
+            word.isascii() and word.isalpha() and word.islower()
+        ):
+            return None
+        return self._positions.get(encode_word(word)[0])
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self.position(word) is not None
+
+    def take(self, indices):
+        """Returns a WordView of the words at the given indices, in that order."""
+        return WordView(self, memoryview(array("I", indices)))
+
+    def partition_by_pattern(self, guessed_word):
+        """See WordView.partition_by_pattern()."""
+        return _partition(self, range(len(self)), guessed_word)
+
+
+class WordView(Sequence):
+    """
+    A read-only list of words of a WordStore, held as an array of indices.
+
+    Instance Variables:
+        store: The WordStore the words are in.
+        indices: A memoryview or range of the indices of the words in store.
+    """
+
+    def __init__(self, store, indices):
+        """
+        pre: indices is a memoryview of an unsigned array, or a range, of valid indices of store.
+        """
+        self.store = store
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            # Slicing the memoryview or range shares the indices instead of copying them
+            return WordView(self.store, self.indices[i])
+        return self.store[self.indices[i]]
+
+    def __iter__(self):
+        store = self.store
+        for index in self.indices:
+            yield store[index]
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"WordView({list(self)!r})"
+
+    def take(self, indices):
+        """Returns a WordView of the words at the given positions of this view."""
+        return WordView(self.store, memoryview(array("I", [self.indices[i] for i in indices])))
+
+    def partition_by_pattern(self, guessed_word):
+        """
+        Groups the words of the view by the pattern code guessed_word gives them.
+
+        post: Returns a dictionary mapping pattern codes to WordViews, each in the order of
+              this view.
+        """
+        return _partition(self.store, self.indices, guessed_word)
+
+
+def _codes(store, indices, guessed_word):
+    """
+    Returns the pattern codes of guessed_word against the words at indices of store, reading
+    the packed words and letter masks from the store's arrays.
+    """
+    packed = store.packed
+    masks = store.masks
+    return get_packed_feedback_codes(
+        ((packed[index], masks[index]) for index in indices), guessed_word
+    )
+
+
+def _partition(store, indices, guessed_word):
+    groups = {}
+    for index, code in zip(indices, _codes(store, indices, guessed_word)):
+        group = groups.get(code)
+        if group is None:
+            groups[code] = group = array("I")
+        group.append(index)
+    return {code: WordView(store, memoryview(group)) for code, group in groups.items()}